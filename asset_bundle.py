@@ -0,0 +1,291 @@
+"""
+Paquete de recursos precocinado.
+
+Un paso de construcción guarda cada sprite ya escalado a su tamaño en el juego
+(y los caracteres pre-renderizados de la barra de información) como píxeles
+crudos en un solo archivo con índice. Al arrancar, el juego mapea el archivo en
+memoria y envuelve cada imagen con pygame.image.frombuffer, sin decodificar
+PNG ni escalar nada:
+
+    cabecera   b"RMAB", versión (u16), largo del índice (u32)
+    índice     JSON (utf-8): versión de pygame, tamaño y fecha de cada archivo
+               de origen, y desplazamiento (desde el inicio de los datos) y
+               tamaño de cada imagen y carácter
+    datos      píxeles en orden BGRA (4 bytes por píxel, filas sin relleno),
+               alineados a 64 bytes
+
+BGRA es el orden en memoria del formato de pantalla habitual (XRGB8888 en
+little-endian), así que convert()/convert_alpha() se reducen a copiar.
+
+Si un archivo de origen cambió desde la construcción (o el paquete se hizo con
+otra versión de pygame), sus imágenes no se usan y el juego vuelve a cargar el
+PNG como siempre.
+
+Uso:
+    python asset_bundle.py build     # construye data/assets.bundle
+    python asset_bundle.py info      # contenido y entradas desactualizadas
+"""
+import argparse
+import json
+import mmap
+import os
+import struct
+import time
+
+import pygame
+
+MAGIC = b"RMAB"
+VERSION = 1
+HEADER = struct.Struct("<4sHI")
+ALIGN = 64
+PIXEL_FORMAT = "BGRA"
+
+BUNDLE_PATH = os.path.join("data", "assets.bundle")
+
+# Caracteres que se pre-renderizan para cada fuente de la barra de información
+GLYPH_CHARS = "".join(chr(c) for c in range(32, 127)) + "áéíóúüñÁÉÍÓÚÜÑ¡¿"
+
+
+def _source_key(path):
+    """Normaliza la ruta para que "./assets/x.png" y "assets/x.png" coincidan."""
+    return os.path.normpath(path)
+
+
+def _source_stamp(path):
+    """
+    Retorna:
+    - list: [tamaño en bytes, fecha de modificación en ns] del archivo, o None si no existe.
+    """
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return [st.st_size, st.st_mtime_ns]
+
+
+def _data_start(index_len):
+    """Posición donde empiezan los píxeles: tras la cabecera y el índice, alineada a ALIGN."""
+    end = HEADER.size + index_len
+    return end + (-end % ALIGN)
+
+
+def build(path=BUNDLE_PATH, sprites=None, glyphs=None):
+    """
+    Construye el paquete: escala cada sprite igual que AssetCache.image() y
+    renderiza cada carácter de GLYPH_CHARS con cada fuente y color pedidos.
+
+    Parámetros:
+    - path (str): Archivo de salida.
+    - sprites (list): Tuplas (ruta, tamaño, alpha) (por defecto: SPRITES del juego).
+    - glyphs (list): Tuplas (ruta de la fuente, tamaño, color) (por defecto: HUD_GLYPHS del juego).
+
+    Retorna:
+    - dict: Índice escrito (ver la cabecera del módulo).
+    """
+    if sprites is None or glyphs is None:
+        import recolector_mutante_v2 as rm
+        sprites = rm.SPRITES if sprites is None else sprites
+        glyphs = rm.HUD_GLYPHS if glyphs is None else glyphs
+    pygame.font.init()
+
+    blobs = []
+    offset = 0
+
+    def add(surface):
+        nonlocal offset
+        data = pygame.image.tobytes(surface, PIXEL_FORMAT)
+        start = offset
+        blobs.append(data)
+        offset += len(data)
+        padding = -offset % ALIGN
+        if padding:
+            blobs.append(bytes(padding))
+            offset += padding
+        return start
+
+    sources = {}
+    images = []
+    originals = {}
+    for source, size, alpha in sprites:
+        original = originals.get(source)
+        if original is None:
+            original = originals[source] = pygame.image.load(source)
+        scaled = pygame.transform.scale(original, size)
+        sources[_source_key(source)] = _source_stamp(source)
+        images.append([_source_key(source), size[0], size[1], alpha, add(scaled)])
+
+    glyph_entries = []
+    for font_path, size, color in glyphs:
+        font = pygame.font.Font(font_path, size)
+        if font_path is not None:
+            sources[_source_key(font_path)] = _source_stamp(font_path)
+        for char in GLYPH_CHARS:
+            surface = font.render(char, True, color)
+            glyph_entries.append([_source_key(font_path) if font_path else None, size, list(color[:3]),
+                                  char, surface.get_width(), surface.get_height(), add(surface)])
+
+    index = {
+        "pygame": pygame.version.ver,
+        "sources": sources,
+        "images": images,
+        "glyphs": glyph_entries,
+    }
+    raw_index = json.dumps(index, ensure_ascii=False).encode("utf-8")
+    data_start = _data_start(len(raw_index))
+
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(HEADER.pack(MAGIC, VERSION, len(raw_index)))
+        f.write(raw_index)
+        f.write(bytes(data_start - HEADER.size - len(raw_index)))
+        for blob in blobs:
+            f.write(blob)
+    # Reemplazo atómico: un juego que ya lo tiene mapeado sigue leyendo el archivo anterior
+    os.replace(tmp_path, path)
+    return index
+
+
+class AssetBundle:
+    """
+    Paquete de recursos mapeado en memoria (solo lectura).
+    Las superficies que entrega apuntan directamente al archivo mapeado; la
+    caché de recursos las convierte al formato de pantalla (una copia) si ya
+    hay ventana.
+    """
+    def __init__(self, path):
+        """
+        Parámetros:
+        - path (str): Archivo del paquete.
+
+        Lanza ValueError si el archivo no es un paquete de esta versión.
+        """
+        self.path = path
+        with open(path, "rb") as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, index_len = HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC or version != VERSION:
+            self._map.close()
+            raise ValueError(f"{path}: no es un paquete de recursos (versión {VERSION})")
+        index = json.loads(self._map[HEADER.size:HEADER.size + index_len].decode("utf-8"))
+        # Los desplazamientos del índice son relativos al inicio de los datos
+        self._view = memoryview(self._map)[_data_start(index_len):]
+
+        # Archivos de origen que cambiaron desde la construcción: sus entradas no se usan
+        if index["pygame"] != pygame.version.ver:
+            self.stale = set(index["sources"])
+        else:
+            self.stale = {source for source, stamp in index["sources"].items()
+                          if _source_stamp(source) != stamp}
+        self._images = {}
+        for source, w, h, alpha, offset in index["images"]:
+            if source not in self.stale:
+                self._images[(source, (w, h), alpha)] = offset
+        self._glyphs = {}
+        for font_path, size, color, char, w, h, offset in index["glyphs"]:
+            if font_path not in self.stale:
+                self._glyphs[(font_path, size, tuple(color), char)] = (w, h, offset)
+
+    @classmethod
+    def open(cls, path=BUNDLE_PATH):
+        """
+        Abre el paquete si existe y es válido.
+
+        Parámetros:
+        - path (str): Archivo del paquete.
+
+        Retorna:
+        - AssetBundle o None: None si el archivo no existe o no es un paquete válido.
+        """
+        try:
+            return cls(path)
+        except (OSError, ValueError, KeyError, struct.error):
+            return None
+
+    def _surface(self, offset, size):
+        """Envuelve los píxeles del archivo mapeado como superficie, sin copiarlos."""
+        w, h = size
+        return pygame.image.frombuffer(self._view[offset:offset + w * h * 4], size, PIXEL_FORMAT)
+
+    def has(self, path, size, alpha=True):
+        """
+        Retorna:
+        - bool: True si el paquete tiene la imagen vigente con ese tamaño.
+        """
+        return (_source_key(path), tuple(size), alpha) in self._images
+
+    def image(self, path, size, alpha=True):
+        """
+        Parámetros:
+        - path (str): Ruta del PNG original.
+        - size (tuple): Tamaño (ancho, alto) en el juego.
+        - alpha (bool): Indica si la imagen tiene transparencia.
+
+        Retorna:
+        - pygame.Surface o None: La imagen ya escalada, o None si no está o está desactualizada.
+        """
+        offset = self._images.get((_source_key(path), tuple(size), alpha))
+        if offset is None:
+            return None
+        return self._surface(offset, size)
+
+    def glyph(self, font_path, size, color, char):
+        """
+        Parámetros:
+        - font_path (str): Ruta de la fuente (None para la de pygame).
+        - size (int): Tamaño en puntos.
+        - color (tuple): Color RGB del texto.
+        - char (str): Un carácter.
+
+        Retorna:
+        - pygame.Surface o None: El carácter renderizado (con antialias y transparencia),
+          o None si no está en el paquete.
+        """
+        key = (_source_key(font_path) if font_path else None, size, tuple(color[:3]), char)
+        entry = self._glyphs.get(key)
+        if entry is None:
+            return None
+        w, h, offset = entry
+        return self._surface(offset, (w, h))
+
+    def info(self):
+        """
+        Retorna:
+        - dict: Imágenes y caracteres vigentes, archivos desactualizados y tamaño del archivo.
+        """
+        return {
+            "images": len(self._images),
+            "glyphs": len(self._glyphs),
+            "stale": sorted(self.stale),
+            "bytes": len(self._map),
+        }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Paquete de recursos precocinado")
+    parser.add_argument("command", choices=["build", "info"], help="Construir el paquete o mostrar su contenido")
+    parser.add_argument("--path", default=BUNDLE_PATH, help=f"Archivo del paquete (por defecto: {BUNDLE_PATH})")
+    args = parser.parse_args()
+
+    if args.command == "build":
+        start = time.perf_counter()
+        index = build(args.path)
+        print(f"{args.path}: {len(index['images'])} imágenes y {len(index['glyphs'])} caracteres, "
+              f"{os.path.getsize(args.path) / 1024:.0f} KiB en {time.perf_counter() - start:.2f} s")
+        return
+
+    bundle = AssetBundle.open(args.path)
+    if bundle is None:
+        print(f"{args.path}: no existe o no es un paquete válido (python asset_bundle.py build)")
+        return
+    info = bundle.info()
+    print(f"{args.path}: {info['bytes'] / 1024:.0f} KiB, {info['images']} imágenes y "
+          f"{info['glyphs']} caracteres vigentes")
+    for source in info["stale"]:
+        print(f"  desactualizado: {source}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,224 @@
+import threading
+import time
+from concurrent.futures import Future
+
+import pygame
+
+
+class AssetCache:
+    """
+    Caché central de imágenes (y fuentes) del juego.
+    Cada archivo se decodifica una sola vez y cada variante escalada se guarda
+    con la clave (ruta, tamaño), de modo que todas las entidades comparten la
+    misma superficie en lugar de cargar el PNG desde disco en cada aparición.
+    """
+    def __init__(self):
+        """Inicializa los diccionarios de imágenes originales y escaladas."""
+        self._originals = {}
+        self._scaled = {}
+        # Precarga por (ruta, tamaño, alpha): un Future con la imagen decodificada y
+        # escalada por el hilo de precarga, sin convertir. Solo el hilo principal
+        # agrega y quita claves; el hilo de precarga solo completa los Future.
+        self._prefetched = {}
+        # Máscaras de colisión por (ruta, tamaño), junto a las superficies de las que salen
+        self._masks = {}
+        self._fonts = {}
+        # Caracteres renderizados por (fuente, tamaño, color, carácter)
+        self._glyphs = {}
+        # Paquete precocinado (asset_bundle.py); si es None, todo sale de los PNG
+        self.bundle = None
+
+    def use_bundle(self, bundle):
+        """
+        Toma las imágenes y los caracteres del paquete precocinado cuando estén
+        en él y vigentes; lo demás se sigue cargando desde los archivos originales.
+
+        Parámetros:
+        - bundle (AssetBundle): Paquete abierto, o None para dejar de usarlo.
+        """
+        self.bundle = bundle
+
+    def _prepare(self, surface, alpha):
+        """
+        Convierte la superficie al formato de la pantalla si ya existe una ventana.
+
+        Parámetros:
+        - surface (pygame.Surface): Imagen recién cargada o escalada.
+        - alpha (bool): True para conservar transparencia (convert_alpha), False para convert.
+
+        Retorna:
+        - pygame.Surface: La superficie convertida, o la original si no hay pantalla.
+        """
+        if pygame.display.get_init() and pygame.display.get_surface() is not None:
+            return surface.convert_alpha() if alpha else surface.convert()
+        return surface
+
+    def load(self, path, alpha=True):
+        """
+        Carga una imagen desde disco solo la primera vez que se solicita.
+
+        Parámetros:
+        - path (str): Ruta del archivo de imagen.
+        - alpha (bool): Indica si la imagen tiene transparencia.
+
+        Retorna:
+        - pygame.Surface: La imagen original compartida.
+        """
+        key = (path, alpha)
+        surface = self._originals.get(key)
+        if surface is None:
+            surface = self._prepare(pygame.image.load(path), alpha)
+            self._originals[key] = surface
+        return surface
+
+    def image(self, path, size, alpha=True):
+        """
+        Devuelve la imagen escalada al tamaño pedido, creándola una única vez.
+
+        Parámetros:
+        - path (str): Ruta del archivo de imagen.
+        - size (tuple): Tamaño (ancho, alto) deseado.
+        - alpha (bool): Indica si la imagen tiene transparencia.
+
+        Retorna:
+        - pygame.Surface: Superficie escalada compartida por todas las entidades.
+        """
+        key = (path, size, alpha)
+        surface = self._scaled.get(key)
+        if surface is None:
+            scaled = None
+            pending = self._prefetched.pop(key, None)
+            # Si el hilo aún no la empezó, se cancela y se carga aquí; si ya la está
+            # escalando, se espera su resultado en lugar de decodificarla dos veces
+            if pending is not None and not pending.cancel():
+                try:
+                    scaled = pending.result()
+                except Exception:
+                    scaled = None  # Se reintenta aquí para que el error salga en este hilo
+            if scaled is None and self.bundle is not None:
+                scaled = self.bundle.image(path, size, alpha)
+            if scaled is None:
+                scaled = pygame.transform.scale(self.load(path, alpha), size)
+            surface = self._prepare(scaled, alpha)
+            self._scaled[key] = surface
+        return surface
+
+    def mask(self, path, size):
+        """
+        Devuelve la máscara de píxeles opacos de la imagen escalada, creándola una única vez.
+
+        Parámetros:
+        - path (str): Ruta del archivo de imagen.
+        - size (tuple): Tamaño (ancho, alto) al que se dibuja.
+
+        Retorna:
+        - pygame.mask.Mask: Máscara compartida por todas las entidades con esa imagen.
+        """
+        key = (path, size)
+        mask = self._masks.get(key)
+        if mask is None:
+            mask = self._masks[key] = pygame.mask.from_surface(self.image(path, size))
+        return mask
+
+    def font(self, path, size):
+        """
+        Devuelve la fuente pedida, cargándola una única vez.
+
+        Parámetros:
+        - path (str): Ruta del archivo de fuente (None para la fuente por defecto de pygame).
+        - size (int): Tamaño en puntos.
+
+        Retorna:
+        - pygame.font.Font: Fuente compartida.
+        """
+        key = (path, size)
+        font = self._fonts.get(key)
+        if font is None:
+            font = self._fonts[key] = pygame.font.Font(path, size)
+        return font
+
+    def glyph(self, path, size, char, color):
+        """
+        Devuelve un carácter renderizado con antialias, creándolo una única vez.
+
+        Parámetros:
+        - path (str): Ruta del archivo de fuente (None para la fuente por defecto de pygame).
+        - size (int): Tamaño en puntos.
+        - char (str): Un carácter.
+        - color (tuple): Color RGB del texto.
+
+        Retorna:
+        - pygame.Surface: Superficie con transparencia compartida.
+        """
+        key = (path, size, char, color)
+        surface = self._glyphs.get(key)
+        if surface is None:
+            rendered = None
+            if self.bundle is not None:
+                rendered = self.bundle.glyph(path, size, color, char)
+            if rendered is None:
+                rendered = self.font(path, size).render(char, True, color)
+            surface = self._glyphs[key] = self._prepare(rendered, True)
+        return surface
+
+    def prefetch(self, items, on_done=None):
+        """
+        Decodifica y escala imágenes en un hilo aparte mientras el programa sigue
+        respondiendo. La conversión al formato de pantalla se hace después, en el
+        hilo principal, la primera vez que se pide cada imagen. Se llama desde el
+        hilo principal: las imágenes pendientes se registran antes de lanzar el hilo.
+
+        Parámetros:
+        - items (list): Tuplas (ruta, tamaño, alpha) a precargar.
+        - on_done (callable): Función opcional que recibe la duración en segundos.
+
+        Retorna:
+        - threading.Thread: Hilo de precarga ya iniciado.
+        """
+        jobs = []
+        for path, size, alpha in items:
+            key = (path, size, alpha)
+            if key in self._scaled or key in self._prefetched:
+                continue
+            if self.bundle is not None and self.bundle.has(path, size, alpha):
+                continue
+            future = self._prefetched[key] = Future()
+            jobs.append((path, size, future))
+
+        def run():
+            start = time.perf_counter()
+            originals = {}
+            for path, size, future in jobs:
+                # False si el hilo principal ya la pidió y la cargó por su cuenta
+                if not future.set_running_or_notify_cancel():
+                    continue
+                try:
+                    original = originals.get(path)
+                    if original is None:
+                        original = originals[path] = pygame.image.load(path)
+                    future.set_result(pygame.transform.scale(original, size))
+                except Exception as e:
+                    future.set_exception(e)
+            if on_done is not None:
+                on_done(time.perf_counter() - start)
+
+        thread = threading.Thread(target=run, name="precarga-recursos", daemon=True)
+        thread.start()
+        return thread
+
+    def clear_masks(self):
+        """Descarta las máscaras de colisión; se vuelven a crear al pedirlas."""
+        self._masks.clear()
+
+    def clear(self):
+        """Vacía la caché (por ejemplo, si cambia el modo de video)."""
+        self._originals.clear()
+        self._scaled.clear()
+        self._prefetched.clear()
+        self._masks.clear()
+        self._fonts.clear()
+        self._glyphs.clear()
+
+
+# Instancia compartida por todo el juego
+assets = AssetCache()
@@ -0,0 +1,308 @@
+"""
+Simulación Monte Carlo para balancear las mutaciones de reglas.
+
+Juega miles de partidas completas sin gráficos con un bot scripted, repartidas
+entre procesos con ProcessPoolExecutor, y resume cómo evoluciona la dificultad
+en los 5 niveles: tasa de partidas completadas, distribución de puntajes, vidas
+perdidas y tiempo para completar cada nivel, y las mismas cifras para cada
+conjunto de reglas (la secuencia de mutaciones aplicada hasta ese nivel), de
+modo que se vean las secuencias que resultan casi imposibles.
+
+Cada partida usa la semilla `--seed + índice`, así que el resultado es el mismo
+sin importar cuántos procesos se usen.
+
+Uso:
+    python balance.py --games 100000
+    python balance.py --games 20000 --workers 8 --out balance.json
+"""
+import os
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import argparse
+import json
+import math
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from recolector_mutante_v2 import (Game, TickClock, TICK_RATE, KEY_LEFT, KEY_RIGHT,
+                                   KEY_UP, KEY_DOWN)
+from headless import run_level_headless
+
+BASE_RULES = "base"
+
+
+class GreedyBot:
+    """
+    Política scripted: va hacia la estrella más cercana y se aparta de los
+    obstáculos que estén a menos de `avoid` píxeles. Si los controles están
+    invertidos, invierte también las teclas, como haría un jugador atento.
+    """
+    def __init__(self, avoid=90, deadzone=0.2):
+        """
+        Parámetros:
+        - avoid (float): Distancia (entre centros) a la que empieza a esquivar.
+        - deadzone (float): Componente mínima de la dirección para presionar una tecla.
+        """
+        self.avoid = avoid
+        self.deadzone = deadzone
+
+    def __call__(self, game):
+        player = game.player
+        half = player.size / 2
+        cx, cy = player.pos[0] + half, player.pos[1] + half
+
+        vx = vy = 0.0
+        best = None
+        for star in game.stars:
+            dx = star.x + star.size / 2 - cx
+            dy = star.y + star.size / 2 - cy
+            d2 = dx * dx + dy * dy
+            if best is None or d2 < best[0]:
+                best = (d2, dx, dy)
+        if best is not None:
+            d = math.sqrt(best[0]) or 1.0
+            vx, vy = best[1] / d, best[2] / d
+
+        avoid = self.avoid
+        for obs in game.obstacles:
+            dx = obs.x + obs.size / 2 - cx
+            dy = obs.y + obs.size / 2 - cy
+            d2 = dx * dx + dy * dy
+            if d2 < avoid * avoid:
+                d = math.sqrt(d2) or 1.0
+                push = 2 * (avoid - d) / avoid
+                vx -= dx / d * push
+                vy -= dy / d * push
+
+        mask = 0
+        if vx < -self.deadzone: mask |= KEY_LEFT
+        if vx > self.deadzone: mask |= KEY_RIGHT
+        if vy < -self.deadzone: mask |= KEY_UP
+        if vy > self.deadzone: mask |= KEY_DOWN
+        if game.rules["invert_controls"]:
+            mask = ((mask & KEY_LEFT) << 1 | (mask & KEY_RIGHT) >> 1 |
+                    (mask & KEY_UP) << 1 | (mask & KEY_DOWN) >> 1)
+        return mask
+
+
+class BalanceStats:
+    """
+    Conteos de una tanda de partidas. Se pueden combinar con merge(), así que
+    cada proceso devuelve solo sus totales y no un registro por partida.
+    """
+    def __init__(self):
+        self.games = 0
+        self.completed = 0
+        self.scores = Counter()
+        # nivel → [intentos, completados, vidas perdidas, ticks hasta completar]
+        self.levels = {}
+        # (nivel, mutaciones previas) → mismos campos que levels
+        self.rule_sets = {}
+        # nivel → Counter de segundos hasta completar
+        self.clear_times = {}
+
+    def record_level(self, level, mutations, completed, lives_lost, ticks):
+        """
+        Registra un intento de nivel.
+
+        Parámetros:
+        - level (int): Nivel jugado.
+        - mutations (tuple): Mutaciones aplicadas antes de este nivel.
+        - completed (bool): Si se completó.
+        - lives_lost (int): Vidas perdidas en el intento.
+        - ticks (int): Ticks que duró el intento.
+        """
+        for table, key in ((self.levels, level), (self.rule_sets, (level, mutations))):
+            row = table.setdefault(key, [0, 0, 0, 0])
+            row[0] += 1
+            row[2] += lives_lost
+            if completed:
+                row[1] += 1
+                row[3] += ticks
+        if completed:
+            self.clear_times.setdefault(level, Counter())[ticks // TICK_RATE] += 1
+
+    def record_game(self, game):
+        """Registra el resultado final de una partida."""
+        self.games += 1
+        self.completed += game.level > game.max_levels and game.player.lives > 0
+        self.scores[game.score] += 1
+
+    def merge(self, other):
+        """Suma los conteos de otra tanda a esta."""
+        self.games += other.games
+        self.completed += other.completed
+        self.scores.update(other.scores)
+        for mine, theirs in ((self.levels, other.levels), (self.rule_sets, other.rule_sets)):
+            for key, row in theirs.items():
+                acc = mine.setdefault(key, [0, 0, 0, 0])
+                for i, value in enumerate(row):
+                    acc[i] += value
+        for level, times in other.clear_times.items():
+            self.clear_times.setdefault(level, Counter()).update(times)
+
+
+def _percentile(counter, p):
+    """Percentil p de una distribución guardada como Counter(valor → frecuencia)."""
+    total = sum(counter.values())
+    if not total:
+        return None
+    rank = max(1, math.ceil(total * p / 100))
+    seen = 0
+    for value in sorted(counter):
+        seen += counter[value]
+        if seen >= rank:
+            return value
+
+
+def _mutation(before, after):
+    """Nombre de la regla que cambió entre dos copias de las reglas."""
+    for key, value in after.items():
+        if before[key] != value:
+            return key
+    return None
+
+
+def play_game(seed, stats, bot=None):
+    """
+    Juega una partida completa con el bot y la registra en stats.
+
+    Parámetros:
+    - seed (int): Semilla de la partida.
+    - stats (BalanceStats): Acumulador de resultados.
+    - bot (callable): Política de entrada (por defecto: GreedyBot()).
+    """
+    bot = bot or GreedyBot()
+    game = Game(clock=TickClock(), seed=seed)
+    game.save_score = False
+    mutations = ()
+    while not game.is_over():
+        level, lives = game.level, game.player.lives
+        completed, ticks = run_level_headless(game, bot)
+        stats.record_level(level, mutations, completed, lives - game.player.lives, ticks)
+        before = dict(game.rules)
+        game.end_level(completed)
+        if completed:
+            mutations += (_mutation(before, game.rules),)
+    stats.record_game(game)
+
+
+def run_chunk(first, count, seed):
+    """
+    Juega las partidas first..first+count-1 (se ejecuta en un proceso del pool).
+
+    Retorna:
+    - BalanceStats: Totales de la tanda.
+    """
+    stats = BalanceStats()
+    bot = GreedyBot()
+    for i in range(first, first + count):
+        play_game(seed + i, stats, bot)
+    return stats
+
+
+def run_balance(games, seed=0, workers=None, chunk=200):
+    """
+    Reparte las partidas en tandas entre varios procesos y combina los resultados.
+
+    Parámetros:
+    - games (int): Partidas a jugar.
+    - seed (int): Semilla base.
+    - workers (int): Procesos (por defecto: uno por núcleo).
+    - chunk (int): Partidas por tanda.
+
+    Retorna:
+    - BalanceStats: Totales de todas las partidas.
+    """
+    total = BalanceStats()
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(run_chunk, first, min(chunk, games - first), seed)
+                   for first in range(0, games, chunk)]
+        for future in as_completed(futures):
+            total.merge(future.result())
+    return total
+
+
+def rule_set_name(mutations):
+    """Nombre legible de una secuencia de mutaciones."""
+    return " > ".join(mutations) if mutations else BASE_RULES
+
+
+def _row_summary(row):
+    attempts, clears, lives_lost, clear_ticks = row
+    return {
+        "attempts": attempts,
+        "clear_rate": clears / attempts,
+        "lives_lost_per_attempt": lives_lost / attempts,
+        "mean_clear_s": clear_ticks / clears / TICK_RATE if clears else None,
+    }
+
+
+def summarize(stats):
+    """
+    Retorna:
+    - dict: Resumen listo para JSON.
+    """
+    return {
+        "games": stats.games,
+        "completion_rate": stats.completed / stats.games if stats.games else 0.0,
+        "score": {f"p{p}": _percentile(stats.scores, p) for p in (10, 50, 90, 99)},
+        "score_histogram": {str(k): v for k, v in sorted(stats.scores.items())},
+        "levels": {str(level): dict(_row_summary(row),
+                                    clear_s_p50=_percentile(stats.clear_times.get(level, Counter()), 50),
+                                    clear_s_p90=_percentile(stats.clear_times.get(level, Counter()), 90))
+                   for level, row in sorted(stats.levels.items())},
+        "rule_sets": [dict(_row_summary(row), level=level, mutations=list(mutations))
+                      for (level, mutations), row in sorted(stats.rule_sets.items())],
+    }
+
+
+def print_report(stats, worst=10, min_attempts=50):
+    """Imprime el resumen general, la tabla por nivel y los conjuntos de reglas más difíciles."""
+    summary = summarize(stats)
+    score = summary["score"]
+    print(f"Partidas: {stats.games}  completadas: {summary['completion_rate']:.1%}  "
+          f"puntaje p10/p50/p90: {score['p10']}/{score['p50']}/{score['p90']}")
+    print(f"\n{'nivel':>5} {'intentos':>9} {'completado':>11} {'vidas perd.':>12} {'t. medio':>9} {'t. p90':>7}")
+    for level, row in summary["levels"].items():
+        mean = f"{row['mean_clear_s']:.1f}s" if row["mean_clear_s"] is not None else "-"
+        p90 = f"{row['clear_s_p90']}s" if row["clear_s_p90"] is not None else "-"
+        print(f"{level:>5} {row['attempts']:>9} {row['clear_rate']:>11.1%} "
+              f"{row['lives_lost_per_attempt']:>12.2f} {mean:>9} {p90:>7}")
+
+    hardest = sorted((r for r in summary["rule_sets"] if r["attempts"] >= min_attempts),
+                     key=lambda r: r["clear_rate"])[:worst]
+    if hardest:
+        print(f"\nConjuntos de reglas más difíciles (mínimo {min_attempts} intentos):")
+        for r in hardest:
+            print(f"  nivel {r['level']}  {r['clear_rate']:6.1%}  "
+                  f"{r['lives_lost_per_attempt']:.2f} vidas/intento  {rule_set_name(r['mutations'])}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Balance de mutaciones por simulación Monte Carlo")
+    parser.add_argument("--games", type=int, default=10000, help="Partidas a simular")
+    parser.add_argument("--seed", type=int, default=0, help="Semilla base")
+    parser.add_argument("--workers", type=int, help="Procesos (por defecto: uno por núcleo)")
+    parser.add_argument("--chunk", type=int, default=200, help="Partidas por tanda enviada a cada proceso")
+    parser.add_argument("--worst", type=int, default=10, help="Conjuntos de reglas difíciles a mostrar")
+    parser.add_argument("--min-attempts", type=int, default=50,
+                        help="Intentos mínimos para listar un conjunto de reglas")
+    parser.add_argument("--out", help="Archivo JSON donde guardar el resumen completo")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    stats = run_balance(args.games, args.seed, args.workers, args.chunk)
+    elapsed = time.perf_counter() - start
+    print_report(stats, args.worst, args.min_attempts)
+    print(f"\n{stats.games} partidas en {elapsed:.1f}s ({stats.games / elapsed:.0f} partidas/s)")
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(summarize(stats), f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1 @@
+"""Benchmarks del Recolector Mutante. Ejecutar desde la raíz del proyecto con `python -m benchmarks.<modulo>`."""
@@ -0,0 +1,84 @@
+"""
+Costo de las pruebas de colisión según el modo (aabb, circle, mask) y el
+número de obstáculos.
+
+Para cada combinación simula frames de lógica (mover obstáculos y revisar
+colisiones) con el jugador quieto en el centro del área de juego, y reporta
+el tiempo de preparar el nivel (que en modo mask incluye crear las máscaras
+desde cero), el de check_collisions y el del frame de lógica completo, qué
+parte del presupuesto de 60 FPS consume, cuántas parejas candidatas entregó
+el broadphase y cuántas confirmó la prueba fina.
+
+Uso:
+    python -m benchmarks.collision_modes --frames 300
+"""
+import argparse
+import time
+
+from recolector_mutante_v2 import Game, TickClock, assets
+from collision import COLLISION_MODES
+
+COUNTS = [3, 30, 100, 300, 1000, 3000]
+FRAME_BUDGET_MS = 1000 / 60
+
+
+def frame_cost(mode, num_obstacles, frames, seed=0):
+    """
+    Mide la preparación del nivel, check_collisions y move_obstacles + check_collisions
+    por frame en un modo de colisión.
+
+    Parámetros:
+    - mode (str): Modo de colisión.
+    - num_obstacles (int): Obstáculos en el nivel.
+    - frames (int): Frames a simular.
+    - seed (int): Semilla (la misma para todos los modos).
+
+    Retorna:
+    - tuple: (ms de preparación del nivel, ms de colisiones por frame, ms por frame,
+      candidatos del broadphase, colisiones confirmadas).
+    """
+    clock = TickClock()
+    game = Game(clock=clock, seed=seed)
+    game.collision_mode = mode
+    game.rules["num_obstacles"] = num_obstacles
+    game.immunity_duration = -1  # Probar obstáculos en cada frame
+    timer = time.perf_counter
+    # Sin máscaras en caché, para que el modo mask pague su creación como al empezar a jugar
+    assets.clear_masks()
+    t = timer()
+    game.start_level()
+    setup = timer() - t
+    px, py = game.player.pos
+    size = game.player.size
+    collisions = 0.0
+    start = timer()
+    for _ in range(frames):
+        game.player.lives = 10 ** 9
+        game.move_obstacles()
+        t = timer()
+        game.check_collisions()
+        collisions += timer() - t
+        clock.advance()
+    elapsed = timer() - start
+    # Conteo aparte, fuera de la medición: parejas del broadphase y confirmadas en el último estado
+    found = game.obstacle_grid.query(px, py, size, size)
+    candidates, hits = len(found), len(game.narrow_phase(found))
+    return setup * 1000, collisions * 1000 / frames, elapsed * 1000 / frames, candidates, hits
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Costo de los modos de colisión")
+    parser.add_argument("--frames", type=int, default=300, help="Frames por medición")
+    args = parser.parse_args()
+
+    print(f"{'obstáculos':>10} {'modo':>7} {'preparar ms':>12} {'colis. ms':>10} {'frame ms':>9} {'% presup.':>10} "
+          f"{'candidatos':>11} {'choques':>8}")
+    for n in COUNTS:
+        for mode in COLLISION_MODES:
+            setup_ms, collide_ms, ms, candidates, hits = frame_cost(mode, n, args.frames)
+            print(f"{n:>10} {mode:>7} {setup_ms:>12.3f} {collide_ms:>10.4f} {ms:>9.3f} {ms / FRAME_BUDGET_MS:>10.1%} "
+                  f"{candidates:>11} {hits:>8}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,152 @@
+"""
+Modo infinito con miles de obstáculos: tiempo por tick y memoria estable.
+
+1. Escalada: juega el modo infinito sin gráficos con etapas cortas (las vidas
+   se reponen en cada tick, así la partida no termina) y, al final de cada
+   etapa, muestra los obstáculos en juego y el tiempo medio, p99 y máximo de
+   los ticks de esa etapa, para ver cómo crece el costo con la cantidad.
+2. Régimen estable: con la dificultad fija (un solo nivel de `--obstacles`
+   obstáculos) los obstáculos y estrellas se siguen renovando todo el tiempo;
+   se mide con tracemalloc la memoria viva cada OBSTACLE_TTL segundos de juego
+   y las entidades creadas por los pools. Ninguna de las dos debería crecer.
+
+Ambas mediciones se hacen con el motor de objetos (Game) y, si hay NumPy, con
+el de arreglos (ArrayGame).
+
+Uso:
+    python -m benchmarks.endless --stages 30
+    python -m benchmarks.endless --obstacles 3000 --seconds 60
+"""
+import argparse
+import gc
+import time
+import tracemalloc
+
+from recolector_mutante_v2 import Game, TickClock, TICK_RATE, OBSTACLE_TTL
+from entity_arrays import ArrayGame, HAVE_NUMPY
+from entity_pool import gc_paused
+from headless import RandomInput
+
+ENGINES = [("objects", Game)]
+if HAVE_NUMPY:
+    ENGINES.append(("arrays", ArrayGame))
+
+
+def endless_game(factory, seed, stage_seconds):
+    """
+    Retorna:
+    - Game: Partida del modo infinito con el primer nivel ya iniciado.
+    """
+    game = factory(clock=TickClock(), seed=seed)
+    game.save_score = False
+    game.endless = True
+    game.level_time_limit = stage_seconds
+    game.start_level()
+    return game
+
+
+def created(game):
+    """
+    Retorna:
+    - int: Entidades creadas por los pools (el motor de arreglos no usa pools de obstáculos ni estrellas).
+    """
+    return game.star_pool.created + game.power_up_pool.created + game.obstacle_pool.created
+
+
+def escalation(factory, stages, stage_seconds, seed=0):
+    """
+    Juega `stages` etapas del modo infinito y mide cada tick.
+
+    Parámetros:
+    - factory (type): Game o ArrayGame.
+    - stages (int): Etapas a jugar.
+    - stage_seconds (float): Duración de cada etapa en segundos de juego.
+    - seed (int): Semilla de la partida.
+
+    Retorna:
+    - list: Un dict por etapa con obstáculos en juego y tiempos de tick (ms).
+    """
+    game = endless_game(factory, seed, stage_seconds)
+    bot = RandomInput(seed)
+    clock = time.perf_counter
+    rows = []
+    with gc_paused(game.pause_gc):
+        while len(rows) < stages:
+            level = game.level
+            ticks = []
+            while game.level == level:
+                # Las vidas se reponen para que la partida no termine
+                game.player.lives = 10 ** 6
+                mask = bot(game)
+                start = clock()
+                game.step(mask)
+                ticks.append(clock() - start)
+            ticks.sort()
+            n = len(ticks)
+            rows.append({
+                "stage": level,
+                "obstacles": game.obstacle_count(),
+                "tick_mean_ms": sum(ticks) / n * 1000,
+                "tick_p99_ms": ticks[min(n - 1, n * 99 // 100)] * 1000,
+                "tick_max_ms": ticks[-1] * 1000,
+            })
+    return rows
+
+
+def steady_state(factory, obstacles, seconds, seed=0):
+    """
+    Mantiene `obstacles` obstáculos renovándose durante `seconds` segundos de
+    juego y toma la memoria viva (tracemalloc) cada OBSTACLE_TTL segundos, a
+    partir del primer recambio completo.
+
+    Retorna:
+    - dict: Muestras de memoria (KiB), entidades creadas al inicio y al final.
+    """
+    game = endless_game(factory, seed, 10 ** 9)
+    game.rules["num_obstacles"] = obstacles
+    game.start_level()
+    bot = RandomInput(seed)
+    gc.collect()
+    tracemalloc.start()
+    samples = []
+    first_created = None
+    try:
+        with gc_paused(game.pause_gc):
+            for tick in range(int(seconds * TICK_RATE) + 1):
+                if tick and tick % (OBSTACLE_TTL * TICK_RATE) == 0:
+                    samples.append(tracemalloc.get_traced_memory()[0] / 1024)
+                    if first_created is None:
+                        first_created = created(game)
+                game.player.lives = 10 ** 6
+                game.step(bot(game))
+    finally:
+        tracemalloc.stop()
+    return {"memory_kib": samples, "created_start": first_created, "created_end": created(game)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Modo infinito: tiempo por tick y memoria estable")
+    parser.add_argument("--stages", type=int, default=30, help="Etapas de la escalada")
+    parser.add_argument("--stage-seconds", type=float, default=2.0, help="Duración de cada etapa")
+    parser.add_argument("--obstacles", type=int, default=2000, help="Obstáculos del régimen estable")
+    parser.add_argument("--seconds", type=float, default=60.0, help="Segundos de juego del régimen estable")
+    parser.add_argument("--seed", type=int, default=0, help="Semilla")
+    args = parser.parse_args()
+
+    for name, factory in ENGINES:
+        print(f"\nEscalada ({name}):")
+        print(f"{'etapa':>6} {'obstáculos':>11} {'media ms':>9} {'p99 ms':>8} {'máx ms':>8}")
+        for row in escalation(factory, args.stages, args.stage_seconds, args.seed):
+            print(f"{row['stage']:>6} {row['obstacles']:>11} {row['tick_mean_ms']:>9.3f} "
+                  f"{row['tick_p99_ms']:>8.3f} {row['tick_max_ms']:>8.2f}")
+
+    for name, factory in ENGINES:
+        r = steady_state(factory, args.obstacles, args.seconds, args.seed)
+        memory = " ".join(f"{kib:.0f}" for kib in r["memory_kib"])
+        print(f"\nRégimen estable ({name}, {args.obstacles} obstáculos, {args.seconds:.0f}s):")
+        print(f"  memoria KiB cada {OBSTACLE_TTL}s: {memory}")
+        print(f"  entidades creadas: {r['created_start']} al inicio, {r['created_end']} al final")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,163 @@
+"""
+Memoria por entidad y pausas del recolector de basura en sesiones largas.
+
+1. Memoria: crea muchas estrellas, PowerUps y obstáculos y mide con tracemalloc
+   los bytes por instancia, con __slots__ (las clases del juego) y con la
+   variante equivalente basada en __dict__.
+2. Pausas: juega cientos de niveles seguidos sin gráficos (el nivel y las
+   reglas vuelven al inicio cada `max_levels` niveles y las vidas se reponen,
+   así la sesión no termina) y toma el tiempo de cada tick y de cada recolección
+   del GC, en dos configuraciones:
+
+       sin_pool_gc   entidades nuevas en cada nivel y GC activo (comportamiento anterior)
+       pool_gc_pausa entidades reutilizadas y GC detenido durante los niveles
+
+Uso:
+    python -m benchmarks.entity_churn --levels 300
+"""
+import argparse
+import gc
+import time
+import tracemalloc
+
+from recolector_mutante_v2 import Game, TickClock, Star, PowerUp, Obstacle
+from entity_pool import EntityPool, gc_paused
+from headless import RandomInput, run_level_headless
+
+
+def dict_variant(cls):
+    """
+    Retorna:
+    - type: Copia de la clase sin __slots__ (atributos en un __dict__ por instancia).
+    """
+    namespace = {k: v for k, v in cls.__dict__.items()
+                 if k not in cls.__slots__ and k not in ("__slots__", "__dict__", "__weakref__")}
+    return type(cls.__name__ + "Dict", (), namespace)
+
+
+def bytes_per_entity(cls, args, count=10000):
+    """
+    Mide la memoria que ocupa cada instancia recién creada.
+
+    Parámetros:
+    - cls (type): Clase de entidad.
+    - args (tuple): Argumentos del constructor.
+    - count (int): Instancias a crear.
+
+    Retorna:
+    - float: Bytes por instancia.
+    """
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    items = [cls(*args) for _ in range(count)]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del items
+    # Se descuenta el puntero de la lista que las guarda
+    return (after - before) / count - 8
+
+
+class _GCTimer:
+    """Toma el tiempo de las recolecciones del GC (vía gc.callbacks) mientras active sea True."""
+    def __init__(self):
+        self.active = False
+        self.pauses = []
+        self._start = 0.0
+
+    def __call__(self, phase, info):
+        if not self.active:
+            return
+        if phase == "start":
+            self._start = time.perf_counter()
+        else:
+            self.pauses.append(time.perf_counter() - self._start)
+
+
+def endless_session(levels, pooled, seed=0):
+    """
+    Juega `levels` niveles seguidos y mide cada tick.
+
+    Parámetros:
+    - levels (int): Niveles a jugar.
+    - pooled (bool): True = pools y GC detenido en los niveles; False = sin reutilizar y GC activo.
+    - seed (int): Semilla de la partida.
+
+    Retorna:
+    - dict: Tiempos de tick (ms), pausas del GC dentro de los niveles y entidades creadas.
+    """
+    game = Game(clock=TickClock(), seed=seed)
+    game.save_score = False
+    game.level_time_limit = 5
+    if not pooled:
+        game.star_pool = EntityPool(Star, max_free=0)
+        game.power_up_pool = EntityPool(PowerUp, max_free=0)
+        game.obstacle_pool = EntityPool(Obstacle, max_free=0)
+    base_rules = dict(game.rules)
+    bot = RandomInput(seed)
+    ticks = []
+    timer = _GCTimer()
+    clock = time.perf_counter
+
+    def timed_input(g):
+        # Se mide de una entrada a la siguiente: un tick completo de step()
+        now = clock()
+        if timed_input.last is not None:
+            ticks.append(now - timed_input.last)
+        timed_input.last = now
+        return bot(g)
+
+    gc.callbacks.append(timer)
+    try:
+        for i in range(levels):
+            timed_input.last = None
+            with gc_paused(pooled):
+                timer.active = True
+                completed, _ = run_level_headless(game, timed_input)
+                timer.active = False
+            game.end_level(completed)
+            game.player.lives = 3
+            if game.level > game.max_levels:
+                game.level = 1
+                game.rules = dict(base_rules)
+    finally:
+        gc.callbacks.remove(timer)
+
+    ticks.sort()
+    n = len(ticks)
+    return {
+        "ticks": n,
+        "tick_p50_ms": ticks[n // 2] * 1000,
+        "tick_p99_ms": ticks[min(n - 1, n * 99 // 100)] * 1000,
+        "tick_max_ms": ticks[-1] * 1000,
+        "gc_in_level": len(timer.pauses),
+        "gc_in_level_max_ms": max(timer.pauses, default=0.0) * 1000,
+        "created": game.star_pool.created + game.power_up_pool.created + game.obstacle_pool.created,
+        "reused": game.star_pool.reused + game.power_up_pool.reused + game.obstacle_pool.reused,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Memoria por entidad y pausas del GC")
+    parser.add_argument("--levels", type=int, default=300, help="Niveles de la sesión larga")
+    parser.add_argument("--seed", type=int, default=0, help="Semilla")
+    args = parser.parse_args()
+
+    print(f"{'entidad':<10} {'__slots__ B':>12} {'__dict__ B':>11}")
+    for cls, ctor in ((Star, (0.0,)), (PowerUp, ()), (Obstacle, (3,))):
+        slotted = bytes_per_entity(cls, ctor)
+        plain = bytes_per_entity(dict_variant(cls), ctor)
+        print(f"{cls.__name__:<10} {slotted:>12.0f} {plain:>11.0f}")
+
+    print(f"\nSesión de {args.levels} niveles:")
+    print(f"{'modo':<14} {'ticks':>8} {'p50 ms':>8} {'p99 ms':>8} {'máx ms':>8} "
+          f"{'GC en nivel':>12} {'GC máx ms':>10} {'creadas':>8} {'reusadas':>9}")
+    for name, pooled in (("sin_pool_gc", False), ("pool_gc_pausa", True)):
+        r = endless_session(args.levels, pooled, args.seed)
+        print(f"{name:<14} {r['ticks']:>8} {r['tick_p50_ms']:>8.3f} {r['tick_p99_ms']:>8.3f} "
+              f"{r['tick_max_ms']:>8.2f} {r['gc_in_level']:>12} {r['gc_in_level_max_ms']:>10.3f} "
+              f"{r['created']:>8} {r['reused']:>9}")
+
+
+if __name__ == "__main__":
+    main()
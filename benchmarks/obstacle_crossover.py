@@ -0,0 +1,70 @@
+"""
+Compara el costo por frame de mover obstáculos y revisar colisiones entre la
+ruta de objetos (Game) y la ruta de arreglos de NumPy (ArrayGame), para
+distintos números de obstáculos, e indica a partir de cuántos conviene cada una.
+
+Uso:
+    python -m benchmarks.obstacle_crossover --frames 200
+"""
+import argparse
+import time
+
+from recolector_mutante_v2 import Game, TickClock
+from entity_arrays import ArrayGame, HAVE_NUMPY
+
+COUNTS = [1, 3, 10, 30, 100, 300, 1000, 3000, 5000, 10000]
+FRAME_BUDGET_MS = 1000 / 60
+
+
+def frame_cost(game_cls, num_obstacles, frames, seed=0):
+    """
+    Mide el tiempo promedio de move_obstacles + check_collisions por frame.
+
+    Parámetros:
+    - game_cls (type): Game o ArrayGame.
+    - num_obstacles (int): Obstáculos en el nivel.
+    - frames (int): Frames a simular.
+    - seed (int): Semilla para que ambas rutas vean el mismo nivel.
+
+    Retorna:
+    - float: Milisegundos por frame.
+    """
+    clock = TickClock()
+    game = game_cls(clock=clock, seed=seed)
+    game.rules["num_obstacles"] = num_obstacles
+    game.player.lives = 10 ** 9  # Que las colisiones nunca terminen el nivel
+    game.start_level()
+    start = time.perf_counter()
+    for _ in range(frames):
+        game.move_obstacles()
+        game.check_collisions()
+        clock.advance()
+    return (time.perf_counter() - start) * 1000 / frames
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Cruce objetos vs arreglos para obstáculos")
+    parser.add_argument("--frames", type=int, default=200, help="Frames por medición")
+    args = parser.parse_args()
+    if not HAVE_NUMPY:
+        print("NumPy no está instalado; solo existe la ruta de objetos.")
+        return
+
+    print(f"{'obstáculos':>10} {'objetos ms':>11} {'arreglos ms':>12} {'más rápido':>11}")
+    crossover = None
+    for n in COUNTS:
+        obj_ms = frame_cost(Game, n, args.frames)
+        arr_ms = frame_cost(ArrayGame, n, args.frames)
+        winner = "arreglos" if arr_ms < obj_ms else "objetos"
+        if crossover is None and arr_ms < obj_ms:
+            crossover = n
+        flag = "" if arr_ms < FRAME_BUDGET_MS else "  (fuera de presupuesto)"
+        print(f"{n:>10} {obj_ms:>11.3f} {arr_ms:>12.3f} {winner:>11}{flag}")
+    if crossover is None:
+        print("Los arreglos no superaron a los objetos en este rango.")
+    else:
+        print(f"Los arreglos son más rápidos desde ~{crossover} obstáculos.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,351 @@
+"""
+Suite de benchmarks de las rutas que se ejecutan en cada frame.
+
+Mide, para varios escenarios (número de obstáculos y estrellas, escudo o
+ralentizador activos, controles invertidos, modo de colisión, motor de objetos
+o de arreglos):
+
+    obstacle_move     Obstacle.move sobre todos los obstáculos (solo motor de objetos)
+    move_obstacles    Game.move_obstacles (movimiento + actualización del broadphase)
+    check_collisions  Game.check_collisions
+    draw_info         Game.draw_info
+    draw_entities     Los draw() de todas las entidades
+    particles_update  ParticleSystem.update (solo escenarios con partículas)
+    particles_draw    ParticleSystem.draw (solo escenarios con partículas)
+    frame             Un frame completo de run_level (eventos, lógica, dibujo, pantalla)
+
+con el controlador de video "dummy". La calidad gráfica queda fija (ver
+quality.py) para que todas las muestras midan el mismo trabajo. Los resultados
+se dan en percentiles (microsegundos), se guardan en JSON y se pueden comparar
+con una corrida anterior (tomada con el mismo nivel de calidad) usando un
+umbral de regresión.
+
+Uso:
+    python -m benchmarks.suite --out base.json
+    python -m benchmarks.suite --out nuevo.json --compare base.json --threshold 0.10
+    python -m benchmarks.suite --quality mínima --out base_minima.json
+"""
+import os
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import argparse
+import json
+import platform
+import sys
+import time
+from datetime import datetime
+
+import pygame
+
+import recolector_mutante_v2 as rm
+from entity_arrays import ArrayGame, HAVE_NUMPY
+from headless import ConstantInput
+from particles import ParticleSystem, Effect
+from quality import QualityGovernor, TIER_NAMES
+
+# Ráfaga de los escenarios con partículas: de vida muy larga, para que el número
+# de partículas vivas no baje durante la medición
+BENCH_EFFECT = Effect(((255, 255, 0), (255, 60, 60), (80, 160, 255)), 1000, 200, 10 ** 6)
+
+PERCENTILES = (50, 90, 99)
+
+
+class Scenario:
+    """
+    Estado de juego a medir.
+    """
+    def __init__(self, name, obstacles=3, stars=5, shield=False, slow=False,
+                 inverted=False, engine="objects", collision="aabb", particles=0):
+        """
+        Parámetros:
+        - name (str): Nombre del escenario en los resultados.
+        - obstacles (int): Número de obstáculos.
+        - stars (int): Número de estrellas.
+        - shield (bool): Escudo activo.
+        - slow (bool): Ralentizador activo.
+        - inverted (bool): Controles invertidos.
+        - engine (str): "objects" (Game) o "arrays" (ArrayGame).
+        - collision (str): Modo de colisión ("aabb", "circle" o "mask").
+        - particles (int): Partículas vivas durante la medición (requiere NumPy).
+        """
+        self.name = name
+        self.obstacles = obstacles
+        self.stars = stars
+        self.shield = shield
+        self.slow = slow
+        self.inverted = inverted
+        self.engine = engine
+        self.collision = collision
+        self.particles = particles
+
+    def build(self, quality=TIER_NAMES[0]):
+        """
+        Crea un juego en el estado del escenario, con el nivel ya iniciado.
+
+        Parámetros:
+        - quality (str): Nivel de calidad gráfica, fijo durante toda la medición.
+
+        Retorna:
+        - Game: Juego listo para medir.
+        """
+        cls = ArrayGame if self.engine == "arrays" else rm.Game
+        game = cls(seed=1)
+        # Sin calidad adaptativa: si bajara de nivel a mitad de la medición, los
+        # percentiles mezclarían el trabajo de varios niveles
+        game.quality = QualityGovernor(TIER_NAMES.index(quality), adaptive=False)
+        game.collision_mode = self.collision
+        game.rules["num_obstacles"] = self.obstacles
+        game.rules["invert_controls"] = self.inverted
+        # Que el nivel no termine durante la medición (las vidas se reponen en cada muestra)
+        game.level_time_limit = 10 ** 9
+        game.score_to_advance = 0
+        game.start_level()
+        for _ in range(self.stars):
+            game.spawn_star()
+        game.player.has_shield = self.shield
+        if self.slow:
+            game.slow_obstacles = True
+            game.slow_timer = 10 ** 9
+        if self.particles:
+            game.particles = ParticleSystem(self.particles, seed=1)
+            # Ráfagas repartidas por el área de juego
+            for i in range(-(-self.particles // BENCH_EFFECT.count)):
+                game.particles.burst(BENCH_EFFECT, 100 + (i * 137) % (rm.WIDTH - 200),
+                                     rm.UI_HEIGHT + 80 + (i * 89) % (rm.HEIGHT - rm.UI_HEIGHT - 160))
+        # Jugador en movimiento constante, rebotando contra el borde
+        game.input_source = ConstantInput(rm.KEY_RIGHT | rm.KEY_DOWN)
+        return game
+
+
+SCENARIOS = [
+    Scenario("base"),
+    Scenario("obst_100", obstacles=100),
+    Scenario("obst_1000", obstacles=1000),
+    Scenario("stars_200", stars=200),
+    Scenario("shield_slow_100", obstacles=100, shield=True, slow=True),
+    Scenario("inverted_100", obstacles=100, inverted=True),
+    Scenario("circle_1000", obstacles=1000, collision="circle"),
+    Scenario("mask_1000", obstacles=1000, collision="mask"),
+]
+if HAVE_NUMPY:
+    SCENARIOS += [
+        Scenario("arrays_1000", obstacles=1000, engine="arrays"),
+        Scenario("arrays_5000", obstacles=5000, stars=200, engine="arrays"),
+        Scenario("particles_10k", obstacles=100, particles=10000),
+    ]
+
+
+def measure(fn, iterations, warmup=10):
+    """
+    Ejecuta una función muchas veces y toma el tiempo de cada llamada.
+
+    Parámetros:
+    - fn (callable): Función sin argumentos.
+    - iterations (int): Muestras a tomar.
+    - warmup (int): Llamadas previas que no se cuentan.
+
+    Retorna:
+    - list: Duraciones en microsegundos.
+    """
+    for _ in range(warmup):
+        fn()
+    samples = []
+    clock = time.perf_counter_ns
+    for _ in range(iterations):
+        start = clock()
+        fn()
+        samples.append((clock() - start) / 1000)
+    return samples
+
+
+def summarize(samples):
+    """
+    Resume una lista de duraciones.
+
+    Retorna:
+    - dict: Percentiles p50/p90/p99, media, mínimo y máximo en microsegundos.
+    """
+    ordered = sorted(samples)
+    n = len(ordered)
+    summary = {f"p{p}": ordered[min(n - 1, max(0, -(-p * n // 100) - 1))] for p in PERCENTILES}
+    summary["mean"] = sum(ordered) / n
+    summary["min"] = ordered[0]
+    summary["max"] = ordered[-1]
+    summary["n"] = n
+    return summary
+
+
+def benches_for(game):
+    """
+    Retorna:
+    - dict: Nombre del benchmark → función sin argumentos a medir sobre ese juego.
+    """
+    clock = pygame.time.Clock()
+    renderer = game.make_renderer()
+    lives = game.player.lives
+
+    def keep_alive(fn):
+        # Repone las vidas para que los choques no cambien lo que se dibuja
+        def run():
+            game.player.lives = lives
+            fn()
+        return run
+
+    benches = {}
+    if game.obstacles:
+        speed_mod = 0.5 if game.slow_obstacles else 1
+
+        def obstacle_move():
+            for obs in game.obstacles:
+                obs.move(speed_mod)
+        benches["obstacle_move"] = obstacle_move
+    benches["move_obstacles"] = game.move_obstacles
+    benches["check_collisions"] = keep_alive(game.check_collisions)
+    benches["draw_info"] = game.draw_info
+    benches["draw_entities"] = game.draw_entities
+    if game.particles is not None:
+        benches["particles_update"] = lambda: game.particles.update(1 / rm.TICK_RATE)
+        benches["particles_draw"] = game.draw_particles
+    benches["frame"] = keep_alive(lambda: game.run_frame(renderer, clock))
+    return benches
+
+
+def run_suite(scenarios, iterations, quality=TIER_NAMES[0]):
+    """
+    Ejecuta todos los benchmarks de los escenarios dados con un nivel de calidad fijo.
+
+    Retorna:
+    - dict: Resultados con metadatos, listos para guardar en JSON.
+    """
+    rm.init_display()
+    results = {}
+    for scenario in scenarios:
+        game = scenario.build(quality)
+        game.fps = 0
+        results[scenario.name] = {name: summarize(measure(fn, iterations))
+                                  for name, fn in benches_for(game).items()}
+    return {
+        "meta": {
+            "date": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "pygame": pygame.version.ver,
+            "numpy": __import__("numpy").__version__ if HAVE_NUMPY else None,
+            "platform": platform.platform(),
+            "iterations": iterations,
+            "quality": quality,
+        },
+        "results": results,
+    }
+
+
+def coverage(current, baseline):
+    """
+    Busca los benchmarks que no aparecen en las dos corridas.
+
+    Retorna:
+    - tuple: (lista de "escenario/benchmark" de la referencia que faltan en la
+      corrida nueva, lista de los nuevos que la referencia no tiene).
+    """
+    def names(data):
+        return {f"{scenario}/{name}" for scenario, benches in data["results"].items() for name in benches}
+    now, before = names(current), names(baseline)
+    return sorted(before - now), sorted(now - before)
+
+
+def compare(current, baseline, threshold, metric="p50"):
+    """
+    Compara dos corridas y lista los benchmarks que empeoraron más que el umbral.
+    Los que no están en ambas se informan aparte (ver coverage()).
+
+    Parámetros:
+    - current (dict): Resultados nuevos.
+    - baseline (dict): Resultados de referencia.
+    - threshold (float): Aumento relativo permitido (0.10 = 10 %).
+    - metric (str): Estadística a comparar.
+
+    Retorna:
+    - list: Tuplas (escenario, benchmark, antes, después, cambio relativo) de las regresiones.
+    """
+    regressions = []
+    for scenario, benches in current["results"].items():
+        for name, stats in benches.items():
+            before = baseline["results"].get(scenario, {}).get(name)
+            if not before or not before[metric]:
+                continue
+            change = stats[metric] / before[metric] - 1
+            if change > threshold:
+                regressions.append((scenario, name, before[metric], stats[metric], change))
+    return regressions
+
+
+def print_results(data):
+    """Imprime una tabla con los percentiles de cada benchmark."""
+    header = f"{'escenario':<18} {'benchmark':<17}" + "".join(f"{f'p{p} us':>11}" for p in PERCENTILES)
+    print(header)
+    for scenario, benches in data["results"].items():
+        for name, stats in benches.items():
+            row = "".join(f"{stats[f'p{p}']:>11.1f}" for p in PERCENTILES)
+            print(f"{scenario:<18} {name:<17}{row}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmarks de las rutas por frame")
+    parser.add_argument("--iterations", type=int, default=300, help="Muestras por benchmark")
+    parser.add_argument("--scenario", action="append", help="Escenarios a ejecutar (por defecto todos)")
+    parser.add_argument("--out", help="Archivo JSON donde guardar los resultados")
+    parser.add_argument("--compare", help="JSON de referencia con el que comparar")
+    parser.add_argument("--threshold", type=float, default=0.10,
+                        help="Regresión relativa permitida al comparar (por defecto 0.10)")
+    parser.add_argument("--metric", default="p50", help="Estadística a comparar (p50, p90, p99, mean)")
+    parser.add_argument("--quality", choices=TIER_NAMES, default=TIER_NAMES[0],
+                        help="Nivel de calidad gráfica fijo durante la medición (por defecto: alta)")
+    args = parser.parse_args()
+
+    known = {s.name for s in SCENARIOS}
+    unknown = [name for name in args.scenario or [] if name not in known]
+    if unknown:
+        sys.exit(f"Escenarios desconocidos: {', '.join(unknown)} (disponibles: {', '.join(sorted(known))})")
+    scenarios = [s for s in SCENARIOS if not args.scenario or s.name in args.scenario]
+    baseline = None
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        # Antes de medir: comparar corridas de distinto nivel de calidad no tiene sentido
+        base_quality = baseline["meta"].get("quality")
+        if base_quality != args.quality:
+            sys.exit(f"{args.compare} se midió con calidad {base_quality or 'adaptativa (sin registrar)'} "
+                     f"y esta corrida usa {args.quality}; no se pueden comparar")
+    data = run_suite(scenarios, args.iterations, args.quality)
+    print_results(data)
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(data, f, indent=2)
+    if baseline is not None:
+        if args.scenario:
+            # Solo se corrió una parte: lo que falta de la referencia es lo que no se pidió
+            baseline = dict(baseline, results={name: benches for name, benches in baseline["results"].items()
+                                               if name in args.scenario})
+        missing, new = coverage(data, baseline)
+        if new:
+            print(f"\nSin referencia (no se comparan): {', '.join(new)}")
+        if missing:
+            print(f"\nEn la referencia pero no medidos en esta corrida: {', '.join(missing)}")
+        compared = sum(len(benches) for benches in data["results"].values()) - len(new)
+        if not compared:
+            sys.exit("Ningún benchmark de esta corrida está en la referencia; no hay nada que comparar")
+        regressions = compare(data, baseline, args.threshold, args.metric)
+        if regressions:
+            print(f"\nRegresiones (> {args.threshold:.0%} en {args.metric}):")
+            for scenario, name, before, after, change in regressions:
+                print(f"  {scenario}/{name}: {before:.1f} -> {after:.1f} us ({change:+.0%})")
+            sys.exit(1)
+        if missing:
+            sys.exit(f"Faltan {len(missing)} benchmarks de la referencia; la comparación está incompleta")
+        print(f"\nSin regresiones mayores a {args.threshold:.0%} en {args.metric} "
+              f"({compared} benchmarks comparados).")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+"""
+Pruebas finas de colisión (narrow phase).
+
+El broadphase (SpatialHash o EntityArrays.overlapping) ya entrega solo las
+entidades cuyo rectángulo toca al jugador; aquí se decide si esas parejas se
+tocan de verdad según el modo de colisión:
+
+    aabb    rectángulos completos (comportamiento original, el más barato)
+    circle  círculos inscritos en cada sprite
+    mask    píxeles opacos de los sprites, con máscaras de pygame precalculadas
+            por (imagen, tamaño) en la caché de recursos
+"""
+COLLISION_AABB = "aabb"
+COLLISION_CIRCLE = "circle"
+COLLISION_MASK = "mask"
+COLLISION_MODES = (COLLISION_AABB, COLLISION_CIRCLE, COLLISION_MASK)
+
+
+def circles_overlap(ax, ay, a_size, bx, by, b_size):
+    """
+    Indica si los círculos inscritos en dos cuadrados se superponen.
+
+    Parámetros:
+    - ax, ay, a_size: Esquina superior izquierda y lado del primer cuadrado.
+    - bx, by, b_size: Lo mismo para el segundo.
+
+    Retorna:
+    - bool: True si los círculos se tocan.
+    """
+    dx = (bx + b_size / 2) - (ax + a_size / 2)
+    dy = (by + b_size / 2) - (ay + a_size / 2)
+    reach = (a_size + b_size) / 2
+    return dx * dx + dy * dy < reach * reach
+
+
+def masks_overlap(a_mask, ax, ay, b_mask, bx, by):
+    """
+    Indica si dos sprites comparten algún píxel opaco en sus posiciones de pantalla.
+    Las posiciones se truncan a enteros igual que al dibujarlos con blit.
+
+    Parámetros:
+    - a_mask (pygame.mask.Mask): Máscara del primer sprite.
+    - ax, ay (float): Posición del primer sprite.
+    - b_mask (pygame.mask.Mask): Máscara del segundo sprite.
+    - bx, by (float): Posición del segundo sprite.
+
+    Retorna:
+    - bool: True si las máscaras se superponen.
+    """
+    return a_mask.overlap(b_mask, (int(bx) - int(ax), int(by) - int(ay))) is not None
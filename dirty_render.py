@@ -0,0 +1,100 @@
+"""
+Renderizado por rectángulos sucios (dirty rects).
+
+En vez de redibujar el fondo completo y hacer flip() de toda la pantalla en cada
+frame, se restaura desde una capa estática (fondo + marco del HUD) solo la zona
+que ocupaban los sprites en el frame anterior, se dibujan los sprites en su nueva
+posición y se envían a la pantalla únicamente esos rectángulos con display.update().
+"""
+import pygame
+
+# Con más rectángulos que esto, una sola actualización completa sale más barata
+MAX_DIRTY_RECTS = 256
+
+
+class DirtyRenderer:
+    """
+    Lleva la cuenta de las zonas modificadas entre frames y las restaura
+    desde una capa estática precompuesta.
+    """
+    def __init__(self, surface, static_layer, max_rects=MAX_DIRTY_RECTS):
+        """
+        Parámetros:
+        - surface (pygame.Surface): Superficie de la pantalla.
+        - static_layer (pygame.Surface): Fondo precompuesto del mismo tamaño que la pantalla.
+        - max_rects (int): Límite de rectángulos antes de pasar a una actualización completa.
+        """
+        self.surface = surface
+        self.static_layer = static_layer
+        self.max_rects = max_rects
+        self._previous = []   # Sprites del frame anterior (se borran este frame)
+        self._current = []    # Sprites dibujados en este frame
+        self._overlay = []    # Zonas que solo se actualizan, sin borrarse después
+        self._full_update = True
+
+    def reset(self):
+        """Redibuja la capa estática completa y fuerza una actualización total."""
+        self.surface.blit(self.static_layer, (0, 0))
+        self._previous = []
+        self._current = []
+        self._overlay = []
+        self._full_update = True
+
+    def restore(self, rect=None):
+        """
+        Restaura desde la capa estática un rectángulo dado o, sin argumentos,
+        todos los rectángulos dibujados en el frame anterior.
+
+        Parámetros:
+        - rect (pygame.Rect): Zona a restaurar (opcional).
+        """
+        blit = self.surface.blit
+        layer = self.static_layer
+        if rect is not None:
+            blit(layer, rect, rect)
+            self._overlay.append(pygame.Rect(rect))
+            return
+        for r in self._previous:
+            blit(layer, r, r)
+
+    def add(self, rect):
+        """Marca el rectángulo de un sprite dibujado en este frame (se borrará en el siguiente)."""
+        if rect is not None:
+            self._current.append(rect)
+
+    def add_all(self, rects):
+        """Marca los rectángulos de varios sprites dibujados en este frame."""
+        self._current.extend(rects)
+
+    def add_overlay(self, rect):
+        """
+        Marca una zona que debe enviarse a pantalla pero no borrarse en el
+        siguiente frame (por ejemplo, el texto del HUD que solo cambia a veces).
+        """
+        self._overlay.append(rect)
+
+    def touches(self, rect):
+        """
+        Indica si algún rectángulo del frame anterior o del actual toca la zona dada.
+
+        Parámetros:
+        - rect (pygame.Rect): Zona a comprobar.
+
+        Retorna:
+        - bool: True si hay superposición.
+        """
+        return rect.collidelist(self._previous) != -1 or rect.collidelist(self._current) != -1
+
+    def present(self):
+        """
+        Envía a la pantalla las zonas del frame anterior (ya borradas) y las del actual.
+        """
+        dirty = self._previous + self._current + self._overlay
+        if self._full_update or len(dirty) > self.max_rects:
+            pygame.display.flip()
+            self._full_update = False
+        elif dirty:
+            pygame.display.update(dirty)
+        self._previous = self._current
+        self._current = []
+        self._overlay = []
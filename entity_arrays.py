@@ -0,0 +1,442 @@
+"""
+Motor opcional de entidades en arreglos de NumPy (estructura de arreglos).
+
+En lugar de un objeto Python por obstáculo o estrella, las posiciones,
+velocidades, tamaños y tipos se guardan en arreglos contiguos, y el movimiento
+con rebote y las pruebas AABB se hacen en una sola operación vectorizada.
+ArrayGame reproduce exactamente las reglas de Game usando este almacenamiento.
+
+Requiere NumPy; si no está instalado, HAVE_NUMPY es False y se usa Game normal.
+"""
+try:
+    import numpy as np
+    HAVE_NUMPY = True
+except ImportError:
+    np = None
+    HAVE_NUMPY = False
+
+import recolector_mutante_v2 as rm
+from asset_cache import assets
+from collision import COLLISION_AABB, COLLISION_CIRCLE, circles_overlap, masks_overlap
+from telemetry import EV_STAR, EV_HIT, EV_SHIELD_USED, EV_SHIELD_GAINED, EV_SLOW
+from particles import FX_STAR, FX_SHIELD_BREAK, FX_HIT, FX_SLOW
+
+KIND_STAR = 0
+KIND_OBSTACLE = 1
+KIND_SHIELD = 2
+KIND_SLOW = 3
+
+KIND_NAMES = {KIND_SHIELD: "shield", KIND_SLOW: "slow"}
+
+# Imagen de cada tipo de entidad (para las máscaras de colisión)
+KIND_PATHS = {
+    KIND_STAR: rm.STAR_PATH,
+    KIND_OBSTACLE: rm.OBSTACLE_PATH,
+    KIND_SHIELD: rm.POWER_UP_PATHS["shield"],
+    KIND_SLOW: rm.POWER_UP_PATHS["slow"],
+}
+
+
+class EntityArrays:
+    """
+    Almacén de entidades en arreglos paralelos con capacidad creciente.
+    Solo las primeras `n` posiciones de cada arreglo son válidas.
+    """
+    def __init__(self, capacity=64):
+        """
+        Parámetros:
+        - capacity (int): Capacidad inicial de los arreglos.
+        """
+        self.n = 0
+        self._allocate(capacity)
+
+    def _allocate(self, capacity):
+        """Crea (o agranda) los arreglos conservando los datos existentes."""
+        old = getattr(self, "x", None)
+        fields = {
+            "x": np.float64, "y": np.float64,
+            "prev_x": np.float64, "prev_y": np.float64,
+            "dx": np.float64, "dy": np.float64,
+            "size": np.float64, "spawn_time": np.float64,
+            "expires": np.float64, "kind": np.int8,
+        }
+        for name, dtype in fields.items():
+            arr = np.zeros(capacity, dtype=dtype)
+            if old is not None:
+                arr[:self.n] = getattr(self, name)[:self.n]
+            setattr(self, name, arr)
+        self.capacity = capacity
+
+    def __len__(self):
+        return self.n
+
+    def add(self, x, y, size, dx=0.0, dy=0.0, kind=KIND_OBSTACLE, spawn_time=0.0, expires=float("inf")):
+        """
+        Agrega una entidad al final de los arreglos. `expires` es el momento en
+        que se retira (solo lo usa el modo infinito).
+
+        Retorna:
+        - int: Índice de la nueva entidad.
+        """
+        if self.n == self.capacity:
+            self._allocate(self.capacity * 2)
+        i = self.n
+        self.x[i] = self.prev_x[i] = x
+        self.y[i] = self.prev_y[i] = y
+        self.dx[i] = dx
+        self.dy[i] = dy
+        self.size[i] = size
+        self.kind[i] = kind
+        self.spawn_time[i] = spawn_time
+        self.expires[i] = expires
+        self.n += 1
+        return i
+
+    def remove(self, i):
+        """
+        Elimina la entidad i moviendo la última a su lugar (swap-remove).
+        Al borrar varias, hacerlo en orden descendente de índice.
+        """
+        last = self.n - 1
+        if i != last:
+            for arr in (self.x, self.y, self.prev_x, self.prev_y, self.dx, self.dy, self.size, self.kind,
+                        self.spawn_time, self.expires):
+                arr[i] = arr[last]
+        self.n = last
+
+    def remove_where(self, mask):
+        """
+        Elimina de una vez las entidades marcadas, compactando las demás al
+        principio sin cambiar su orden.
+
+        Parámetros:
+        - mask (numpy.ndarray): Booleanos de largo n; True = eliminar.
+
+        Retorna:
+        - int: Entidades eliminadas.
+        """
+        n = self.n
+        keep = ~mask
+        k = int(np.count_nonzero(keep))
+        if k < n:
+            for arr in (self.x, self.y, self.prev_x, self.prev_y, self.dx, self.dy, self.size, self.kind,
+                        self.spawn_time, self.expires):
+                arr[:k] = arr[:n][keep]
+            self.n = k
+        return n - k
+
+    def clear(self):
+        """Elimina todas las entidades sin liberar memoria."""
+        self.n = 0
+
+    def move_bouncing(self, speed_mod, width, top, bottom):
+        """
+        Mueve todas las entidades y rebota en los bordes, igual que Obstacle.move.
+
+        Parámetros:
+        - speed_mod (float): Modificador de velocidad.
+        - width (int): Ancho del área de juego.
+        - top (int): Límite superior (alto de la barra de información).
+        - bottom (int): Límite inferior (alto de la pantalla).
+        """
+        n = self.n
+        x, y = self.x[:n], self.y[:n]
+        dx, dy = self.dx[:n], self.dy[:n]
+        size = self.size[:n]
+        self.prev_x[:n] = x
+        self.prev_y[:n] = y
+        x += dx * speed_mod
+        y += dy * speed_mod
+        flip_x = (x <= 0) | (x >= width - size)
+        flip_y = (y <= top) | (y >= bottom - size)
+        np.negative(dx, out=dx, where=flip_x)
+        np.negative(dy, out=dy, where=flip_y)
+
+    def overlapping(self, x, y, w, h):
+        """
+        Prueba AABB vectorizada contra un rectángulo.
+
+        Retorna:
+        - numpy.ndarray: Índices de las entidades que se superponen.
+        """
+        n = self.n
+        ex, ey, size = self.x[:n], self.y[:n], self.size[:n]
+        hit = (x < ex + size) & (x + w > ex) & (y < ey + size) & (y + h > ey)
+        return np.flatnonzero(hit)
+
+    def overlapping_pairs(self):
+        """
+        Busca parejas de entidades que se superponen con barrido ordenado por x,
+        sin comparar todas contra todas.
+
+        Retorna:
+        - list: Tuplas de índices (i, j) con i < j.
+        """
+        n = self.n
+        if n < 2:
+            return []
+        x, y, size = self.x[:n], self.y[:n], self.size[:n]
+        order = np.argsort(x, kind="stable")
+        xs = x[order]
+        # Para cada entidad, hasta dónde llegan (en el orden) las que empiezan antes de su borde derecho
+        ends = np.searchsorted(xs, xs + size[order], side="left")
+        pairs = []
+        for a in range(n):
+            i = order[a]
+            for b in range(a + 1, ends[a]):
+                j = order[b]
+                if (x[i] < x[j] + size[j] and x[i] + size[i] > x[j] and
+                        y[i] < y[j] + size[j] and y[i] + size[i] > y[j]):
+                    pairs.append((int(min(i, j)), int(max(i, j))))
+        return pairs
+
+
+class ArrayGame(rm.Game):
+    """
+    Variante de Game que guarda estrellas, PowerUps y obstáculos en EntityArrays.
+    Consume los números aleatorios en el mismo orden que Game, así que con la
+    misma semilla y entradas produce exactamente la misma partida.
+    """
+    def __init__(self, *args, **kwargs):
+        if not HAVE_NUMPY:
+            raise RuntimeError("ArrayGame requiere NumPy (pip install numpy)")
+        # Antes de Game.__init__, que llama a reset()
+        self.star_arrays = EntityArrays()
+        self.power_up_arrays = EntityArrays(8)
+        self.obstacle_arrays = EntityArrays()
+        super().__init__(*args, **kwargs)
+
+    def reset(self, seed=None):
+        """Vacía los arreglos y prepara una partida nueva (ver Game.reset)."""
+        self.star_arrays.clear()
+        self.power_up_arrays.clear()
+        self.obstacle_arrays.clear()
+        super().reset(seed)
+
+    def spawn_star(self):
+        """Agrega una nueva estrella a los arreglos."""
+        size = 30
+        x = self.rng.randint(0, rm.WIDTH - size)
+        y = self.rng.randint(rm.UI_HEIGHT, rm.HEIGHT - size)
+        self.star_arrays.add(x, y, size, kind=KIND_STAR, spawn_time=self.clock())
+
+    def spawn_power_up(self):
+        """Agrega aleatoriamente un PowerUp a los arreglos con probabilidad del 30%."""
+        if self.rng.random() < 0.3:
+            size = 30
+            x = self.rng.randint(0, rm.WIDTH - size)
+            y = self.rng.randint(rm.UI_HEIGHT, rm.HEIGHT - size)
+            kind = KIND_SHIELD if self.rng.choice(["shield", "slow"]) == "shield" else KIND_SLOW
+            self.power_up_arrays.add(x, y, size, kind=kind)
+
+    def spawn_obstacles(self):
+        """Genera los obstáculos del nivel directamente en los arreglos (ver Game.spawn_obstacles)."""
+        self.obstacle_arrays.clear()
+        count = self.rules["num_obstacles"]
+        now = self.clock()
+        for i in range(count):
+            self.spawn_obstacle(now + rm.OBSTACLE_TTL * (i + 1) / count)
+
+    def spawn_obstacle(self, expires, from_edge=False):
+        """Agrega un obstáculo a los arreglos (ver Game.spawn_obstacle)."""
+        speed = self.rules["obstacle_speed"]
+        size = 40
+        x = self.rng.randint(0, rm.WIDTH - size)
+        y = self.rng.randint(rm.UI_HEIGHT, rm.HEIGHT - size)
+        dx = self.rng.choice([-1, 1]) * speed
+        dy = self.rng.choice([-1, 1]) * speed
+        if from_edge:
+            x, dx = self.entry_point(y, size, dx)
+        self.obstacle_arrays.add(x, y, size, dx, dy, KIND_OBSTACLE, expires=expires)
+
+    def despawn_expired(self, now):
+        """Retira los obstáculos vencidos con una sola compactación vectorizada."""
+        arrays = self.obstacle_arrays
+        arrays.remove_where(arrays.expires[:arrays.n] <= now)
+
+    def expire_stars(self, now):
+        """Retira las estrellas que llevan STAR_TTL segundos sin recogerse."""
+        arrays = self.star_arrays
+        arrays.remove_where(now - arrays.spawn_time[:arrays.n] >= rm.STAR_TTL)
+
+    def obstacle_count(self):
+        """
+        Retorna:
+        - int: Obstáculos en juego (filas ocupadas del arreglo).
+        """
+        return self.obstacle_arrays.n
+
+    def start_level(self):
+        """Vacía los arreglos de estrellas y PowerUps y prepara el nivel."""
+        self.star_arrays.clear()
+        self.power_up_arrays.clear()
+        super().start_level()
+
+    def move_obstacles(self):
+        """Mueve todos los obstáculos en una sola operación vectorizada."""
+        speed_mod = 0.5 if self.slow_obstacles else 1
+        self.obstacle_arrays.move_bouncing(speed_mod, rm.WIDTH, rm.UI_HEIGHT, rm.HEIGHT)
+
+    def obstacle_contacts(self):
+        """
+        Retorna:
+        - list: Parejas de índices de obstáculos que se superponen.
+        """
+        return self.obstacle_arrays.overlapping_pairs()
+
+    def entities_touch(self, rect):
+        """
+        Misma prueba que Game.entities_touch, con los arreglos en vez de las rejillas.
+
+        Parámetros:
+        - rect (pygame.Rect): Zona a comprobar.
+
+        Retorna:
+        - bool: True si el jugador o alguna estrella, PowerUp u obstáculo la toca.
+        """
+        px, py = self.player.pos
+        size = self.player.size
+        if rect.colliderect((px, py, size, size)):
+            return True
+        area = (rect.x, rect.y, rect.w, rect.h)
+        return any(len(arrays.overlapping(*area))
+                   for arrays in (self.star_arrays, self.power_up_arrays, self.obstacle_arrays))
+
+    def obstacle_positions(self):
+        """Posiciones de los obstáculos como arreglos de NumPy (ver Game.obstacle_positions)."""
+        n = self.obstacle_arrays.n
+        return self.obstacle_arrays.x[:n], self.obstacle_arrays.y[:n]
+
+    def remaining_stars(self):
+        """
+        Retorna:
+        - int: Estrellas que quedan en el nivel.
+        """
+        return len(self.star_arrays)
+
+    def check_collisions(self):
+        """
+        Misma lógica que Game.check_collisions, con pruebas AABB vectorizadas.
+
+        Retorna:
+        - bool: Siempre False.
+        """
+        px, py = self.player.pos
+        size = self.player.size
+        now = self.clock()
+        immune = now - self.immunity_start_time < self.immunity_duration
+        telemetry = self.telemetry
+
+        stars = self.star_arrays
+        # Orden descendente para que el swap-remove no mueva índices pendientes
+        for i in self.narrow_phase(stars, stars.overlapping(px, py, size, size))[::-1]:
+            elapsed = now - stars.spawn_time[i]
+            points = 3 if elapsed <= 5 else 1
+            self.score += points
+            if telemetry is not None:
+                telemetry.event(EV_STAR, stars.x[i], stars.y[i], points, elapsed)
+            half = stars.size[i] / 2
+            self.emit_effect(FX_STAR, stars.x[i] + half, stars.y[i] + half)
+            stars.remove(i)
+
+        if not immune:
+            obstacles = self.obstacle_arrays
+            for i in self.narrow_phase(obstacles, obstacles.overlapping(px, py, size, size)):
+                if self.player.has_shield:
+                    self.player.has_shield = False
+                    if telemetry is not None:
+                        telemetry.event(EV_SHIELD_USED, obstacles.x[i], obstacles.y[i])
+                    self.emit_effect(FX_SHIELD_BREAK, px + size / 2, py + size / 2)
+                else:
+                    self.player.lives -= 1
+                    self.immunity_start_time = now
+                    if telemetry is not None:
+                        telemetry.event(EV_HIT, obstacles.x[i], obstacles.y[i], self.player.lives)
+                    self.emit_effect(FX_HIT, px + size / 2, py + size / 2)
+
+        power_ups = self.power_up_arrays
+        for i in self.narrow_phase(power_ups, power_ups.overlapping(px, py, size, size))[::-1]:
+            if power_ups.kind[i] == KIND_SHIELD:
+                self.player.has_shield = True
+                if telemetry is not None:
+                    telemetry.event(EV_SHIELD_GAINED, power_ups.x[i], power_ups.y[i])
+            else:
+                self.slow_obstacles = True
+                self.slow_timer = now
+                if telemetry is not None:
+                    telemetry.event(EV_SLOW, power_ups.x[i], power_ups.y[i])
+                half = power_ups.size[i] / 2
+                self.emit_effect(FX_SLOW, power_ups.x[i] + half, power_ups.y[i] + half)
+            power_ups.remove(i)
+        return False
+
+    def narrow_phase(self, arrays, candidates):
+        """
+        Igual que Game.narrow_phase, sobre los índices que devolvió overlapping().
+
+        Parámetros:
+        - arrays (EntityArrays): Almacén de las entidades.
+        - candidates (numpy.ndarray): Índices cuyo rectángulo toca al jugador.
+
+        Retorna:
+        - numpy.ndarray: Índices de las que colisionan con el jugador.
+        """
+        mode = self.collision_mode
+        if mode == COLLISION_AABB or not len(candidates):
+            return candidates
+        px, py = self.player.pos
+        size = self.player.size
+        xs, ys, sizes, kinds = arrays.x, arrays.y, arrays.size, arrays.kind
+        if mode == COLLISION_CIRCLE:
+            keep = [i for i in candidates
+                    if circles_overlap(px, py, size, float(xs[i]), float(ys[i]), float(sizes[i]))]
+        else:
+            player_mask = self.player.mask
+            keep = [i for i in candidates
+                    if masks_overlap(player_mask, px, py,
+                                     assets.mask(KIND_PATHS[int(kinds[i])], (int(sizes[i]),) * 2),
+                                     float(xs[i]), float(ys[i]))]
+        return np.array(keep, dtype=candidates.dtype)
+
+    def _blit_all(self, arrays, image_for, alpha=1.0):
+        """
+        Dibuja todas las entidades de un almacén con una sola llamada a blits,
+        interpolando entre la posición anterior y la actual.
+
+        Retorna:
+        - list: Rectángulos dibujados.
+        """
+        n = arrays.n
+        if not n:
+            return []
+        images = image_for(arrays)
+        x, y = arrays.x[:n], arrays.y[:n]
+        if alpha != 1.0:
+            px, py = arrays.prev_x[:n], arrays.prev_y[:n]
+            x = px + (x - px) * alpha
+            y = py + (y - py) * alpha
+        return rm.screen.blits(list(zip(images, zip(x.tolist(), y.tolist()))))
+
+    def draw_entities(self, alpha=1.0):
+        """
+        Dibuja al jugador y todas las entidades de los arreglos por lotes.
+
+        Parámetros:
+        - alpha (float): Fracción del tick transcurrida (0-1) para interpolar las posiciones.
+
+        Retorna:
+        - list: Rectángulos de pantalla modificados.
+        """
+        rects = []
+        player_rect = self.player.draw(self.blinking(), alpha)
+        if player_rect is not None:
+            rects.append(player_rect)
+        star_img = assets.image(rm.STAR_PATH, (30, 30))
+        rects += self._blit_all(self.star_arrays, lambda a: [star_img] * a.n)
+        images = {kind: assets.image(rm.POWER_UP_PATHS[name], (30, 30))
+                  for kind, name in KIND_NAMES.items()}
+        rects += self._blit_all(self.power_up_arrays,
+                                lambda a: [images[k] for k in a.kind[:a.n].tolist()])
+        obstacle_img = assets.image(rm.OBSTACLE_PATH, (40, 40))
+        rects += self._blit_all(self.obstacle_arrays, lambda a: [obstacle_img] * a.n, alpha)
+        return rects
@@ -0,0 +1,95 @@
+"""
+Reutilización de entidades y control del recolector de basura durante el juego.
+
+Las estrellas, los PowerUps y los obstáculos se crean y se descartan en cada
+nivel. EntityPool guarda las instancias descartadas en una lista libre y las
+reinicia con reset() en lugar de crear objetos nuevos, y gc_paused() detiene el
+recolector cíclico mientras se juega un nivel: la recolección se hace de una vez
+en la transición entre niveles, cuando una pausa no se nota.
+"""
+import gc
+from contextlib import contextmanager
+
+
+class EntityPool:
+    """
+    Lista libre de instancias de una clase de entidad. La clase debe tener un
+    método reset() que reciba los mismos argumentos que su constructor.
+    """
+    def __init__(self, cls, max_free=None):
+        """
+        Parámetros:
+        - cls (type): Clase de las entidades.
+        - max_free (int): Máximo de instancias libres que se guardan (None = sin límite,
+          0 = no reutilizar).
+        """
+        self.cls = cls
+        self.max_free = max_free
+        self._free = []
+        self.created = 0
+        self.reused = 0
+
+    def __len__(self):
+        """Instancias libres listas para reutilizar."""
+        return len(self._free)
+
+    def acquire(self, *args):
+        """
+        Entrega una entidad reiniciada, reutilizando una libre si la hay.
+
+        Parámetros:
+        - *args: Argumentos de reset() (los mismos del constructor).
+
+        Retorna:
+        - Entidad lista para usar.
+        """
+        if self._free:
+            item = self._free.pop()
+            item.reset(*args)
+            self.reused += 1
+            return item
+        self.created += 1
+        return self.cls(*args)
+
+    def release(self, item):
+        """
+        Devuelve una entidad que ya no está en juego.
+
+        Parámetros:
+        - item: Entidad a guardar para reutilizarla.
+        """
+        if self.max_free is None or len(self._free) < self.max_free:
+            self._free.append(item)
+
+    def release_all(self, items):
+        """
+        Devuelve todas las entidades de una lista y la vacía.
+
+        Parámetros:
+        - items (list): Entidades a devolver.
+        """
+        for item in items:
+            self.release(item)
+        items.clear()
+
+
+@contextmanager
+def gc_paused(enabled=True):
+    """
+    Ejecuta el bloque con el recolector cíclico detenido, tras una recolección
+    completa. Al salir lo deja como estaba.
+
+    Parámetros:
+    - enabled (bool): False ejecuta el bloque sin tocar el recolector.
+    """
+    if not enabled:
+        yield
+        return
+    was_enabled = gc.isenabled()
+    gc.collect()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if was_enabled:
+            gc.enable()
@@ -0,0 +1,129 @@
+"""
+Ejecución sin gráficos del Recolector Mutante.
+
+Permite correr partidas completas sin ventana ni audio, a la máxima velocidad
+posible, usando un reloj simulado que avanza un tick fijo por paso. Sirve para
+pruebas de balance, regresiones y pruebas de carga en servidores sin pantalla.
+
+Uso:
+    python headless.py --games 20 --seed 7
+"""
+import os
+
+# Controlador de video "dummy" por si algún módulo llegara a tocar pygame.display
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import argparse
+import random
+import time
+
+from recolector_mutante_v2 import (Game, TickClock, KEY_LEFT, KEY_RIGHT, KEY_UP, KEY_DOWN,
+                                   LEVEL_TIMEOUT, PLAYER_DEAD)
+
+
+class ConstantInput:
+    """Fuente de entrada que siempre presiona las mismas teclas."""
+    def __init__(self, mask=0):
+        self.mask = mask
+
+    def __call__(self, game):
+        return self.mask
+
+
+class RandomInput:
+    """
+    Fuente de entrada aleatoria: mantiene una dirección durante varios ticks
+    y luego elige otra, imitando a un jugador que se mueve por la pantalla.
+    """
+    DIRECTIONS = [0, KEY_LEFT, KEY_RIGHT, KEY_UP, KEY_DOWN,
+                  KEY_LEFT | KEY_UP, KEY_LEFT | KEY_DOWN,
+                  KEY_RIGHT | KEY_UP, KEY_RIGHT | KEY_DOWN]
+
+    def __init__(self, seed=None, hold=15):
+        """
+        Parámetros:
+        - seed (int): Semilla del generador propio de esta fuente.
+        - hold (int): Ticks que se mantiene cada dirección.
+        """
+        self.rng = random.Random(seed)
+        self.hold = hold
+        self.remaining = 0
+        self.mask = 0
+
+    def __call__(self, game):
+        if self.remaining <= 0:
+            self.mask = self.rng.choice(self.DIRECTIONS)
+            self.remaining = self.hold
+        self.remaining -= 1
+        return self.mask
+
+
+def run_level_headless(game, input_source, max_ticks=None):
+    """
+    Ejecuta un nivel completo sin dibujar, con la misma lógica que Game.run_level.
+    El reloj simulado del juego avanza un tick en cada step().
+
+    Parámetros:
+    - game (Game): Juego a simular.
+    - input_source (callable): Recibe el juego y retorna la máscara de teclas del tick.
+    - max_ticks (int): Límite opcional de ticks para el nivel.
+
+    Retorna:
+    - tuple: (completado (bool), ticks simulados (int)).
+    """
+    game.start_level()
+    ticks = 0
+    while max_ticks is None or ticks < max_ticks:
+        result = game.step(input_source(game))
+        ticks += 1
+        if result == LEVEL_TIMEOUT:
+            return game.player.lives > 0, ticks
+        if result is not None:
+            return result != PLAYER_DEAD, ticks
+    return False, ticks
+
+
+def run_game_headless(input_source, seed=None, max_ticks=None, game_factory=Game, game=None):
+    """
+    Juega una partida completa (todos los niveles) sin gráficos.
+
+    Parámetros:
+    - input_source (callable): Fuente de entrada por tick.
+    - seed (int): Semilla de la partida (por defecto: una al azar).
+    - max_ticks (int): Límite opcional de ticks por nivel.
+    - game_factory (callable): Clase de juego a usar (Game o una subclase como ArrayGame).
+    - game (Game): Juego ya creado a usar en lugar de game_factory (opcional).
+
+    Retorna:
+    - tuple: (juego terminado (Game), ticks totales simulados (int)).
+    """
+    if game is None:
+        game = game_factory(clock=TickClock(), seed=seed)
+    total = 0
+    while not game.is_over():
+        completed, ticks = run_level_headless(game, input_source, max_ticks)
+        total += ticks
+        game.end_level(completed)
+    return game, total
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Simulación sin gráficos del Recolector Mutante")
+    parser.add_argument("--games", type=int, default=10, help="Número de partidas a simular")
+    parser.add_argument("--seed", type=int, default=0, help="Semilla base")
+    args = parser.parse_args()
+
+    total_ticks = 0
+    start = time.perf_counter()
+    for i in range(args.games):
+        game, ticks = run_game_headless(RandomInput(args.seed + i), seed=args.seed + i)
+        total_ticks += ticks
+        print(f"Partida {i + 1}: nivel {min(game.level, game.max_levels)}, "
+              f"{game.score} pts, {game.player.lives} vidas, {ticks} ticks")
+    elapsed = time.perf_counter() - start
+    print(f"{total_ticks} ticks en {elapsed:.2f}s ({total_ticks / elapsed:.0f} ticks/s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,516 @@
+"""
+Tabla de puntajes compartida entre varias máquinas.
+
+El servidor (asyncio) guarda los puntajes en un AlmacenPuntajes de SQLite y
+atiende dos operaciones con un protocolo de una línea JSON por mensaje:
+
+    {"op": "submit", "scores": [{"uid", "nombre", "puntos", "fecha", "modo"}, ...]}  → {"ok": true, "saved": n}
+    {"op": "top", "n": 10, "modo": "normal"}                                   → {"ok": true, "top": [[nombre, puntos, fecha], ...]}
+
+"modo" es el modo de juego ("normal" o "infinito", ver puntajes.MODOS): cada
+uno tiene su propia tabla de mejores. Si falta, se toma "normal".
+
+El cliente corre su propio bucle asyncio en un hilo aparte, así que el juego
+nunca espera a la red: submit() solo encola, una tarea en segundo plano agrupa
+los puntajes en lotes y los reenvía con espera exponencial si el servidor no
+responde (cada puntaje lleva un uid, así que un reenvío no lo duplica), y top()
+responde desde una caché con tiempo de vida mientras la refresca por detrás.
+Si el servidor rechaza un lote ({"ok": false}), no se reintenta igual: se divide
+en mitades hasta aislar los puntajes rechazados, que se descartan y se registran
+en el log, para que uno inválido no bloquee a los que vienen detrás.
+
+Uso:
+    python leaderboard.py --port 8765            # servidor
+    python main.py --leaderboard localhost:8765  # juego conectado
+"""
+import argparse
+import asyncio
+import concurrent.futures
+import json
+import logging
+import sqlite3
+import threading
+import time
+import uuid
+from datetime import datetime
+
+import puntajes
+
+DEFAULT_PORT = 8765
+DB_FILE = "data/leaderboard.db"
+MAX_TOP = 100
+MAX_LINE = 1 << 20
+
+log = logging.getLogger(__name__)
+
+
+class LeaderboardServer:
+    """
+    Servidor asyncio de la tabla de puntajes.
+    Se puede iniciar dentro de un bucle existente (await start()) o en un hilo
+    propio (start_in_thread()), por ejemplo para probar el cliente en el mismo proceso.
+    """
+    def __init__(self, host="127.0.0.1", port=DEFAULT_PORT, ruta=DB_FILE):
+        """
+        Parámetros:
+        - host (str): Dirección donde escuchar.
+        - port (int): Puerto (0 elige uno libre; ver self.port después de start()).
+        - ruta (str): Base de datos SQLite (":memory:" para pruebas).
+        """
+        self.host = host
+        self.port = port
+        self.ruta = ruta
+        self.almacen = None
+        self._server = None
+        self._conexiones = {}  # tarea → writer de cada conexión abierta
+        self._loop = None
+        self._thread = None
+
+    async def start(self):
+        """Abre la base de datos y empieza a aceptar conexiones."""
+        # SQLite exige usar la conexión en el hilo que la creó: el del bucle del servidor
+        self.almacen = puntajes.AlmacenPuntajes(self.ruta, importar_de=None)
+        self._server = await asyncio.start_server(self._atender, self.host, self.port, limit=MAX_LINE)
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    async def stop(self):
+        """Deja de aceptar conexiones y cierra la base de datos."""
+        if self._server is not None:
+            self._server.close()
+            # Las conexiones abiertas siguen vivas tras close(): se cierran y se espera a sus tareas
+            for writer in self._conexiones.values():
+                writer.close()
+            await asyncio.gather(*self._conexiones, return_exceptions=True)
+            await self._server.wait_closed()
+            self._server = None
+        if self.almacen is not None:
+            self.almacen.cerrar()
+            self.almacen = None
+
+    def start_in_thread(self):
+        """
+        Inicia el servidor con su propio bucle en un hilo de fondo.
+
+        Retorna:
+        - int: Puerto en el que escucha.
+        """
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, name="leaderboard-servidor",
+                                        daemon=True)
+        self._thread.start()
+        asyncio.run_coroutine_threadsafe(self.start(), self._loop).result()
+        return self.port
+
+    def stop_thread(self):
+        """Detiene un servidor iniciado con start_in_thread()."""
+        asyncio.run_coroutine_threadsafe(self.stop(), self._loop).result()
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop.close()
+
+    async def _atender(self, reader, writer):
+        """Atiende una conexión: una respuesta por cada línea recibida."""
+        tarea = asyncio.current_task()
+        self._conexiones[tarea] = writer
+        try:
+            while True:
+                linea = await reader.readline()
+                if not linea:
+                    break
+                try:
+                    respuesta = self.procesar(json.loads(linea))
+                except (ValueError, KeyError, TypeError, sqlite3.Error) as e:
+                    # La transacción se deshace entera: el lote se rechaza completo
+                    respuesta = {"ok": False, "error": str(e)}
+                writer.write(json.dumps(respuesta).encode() + b"\n")
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError, asyncio.LimitOverrunError):
+            pass
+        finally:
+            self._conexiones.pop(tarea, None)
+            writer.close()
+
+    def procesar(self, mensaje):
+        """
+        Ejecuta una operación del protocolo.
+
+        Parámetros:
+        - mensaje (dict): Petición ya decodificada.
+
+        Retorna:
+        - dict: Respuesta.
+        """
+        op = mensaje["op"]
+        if op == "submit":
+            registros = [(int(p["puntos"]), p.get("nombre"), p.get("fecha"), p.get("uid"),
+                          p.get("modo", puntajes.MODO_NORMAL))
+                         for p in mensaje["scores"]]
+            return {"ok": True, "saved": self.almacen.guardar_varios(registros)}
+        if op == "top":
+            n = max(1, min(int(mensaje.get("n", 10)), MAX_TOP))
+            filas = self.almacen.top(n, mensaje.get("modo", puntajes.MODO_NORMAL))
+            return {"ok": True, "top": [list(fila) for fila in filas]}
+        raise ValueError(f"operación desconocida: {op}")
+
+
+class RechazoServidor(Exception):
+    """
+    El servidor respondió, pero no aceptó la petición (respuesta con "ok": false
+    o que no se puede interpretar). Reintentarla igual daría el mismo resultado.
+    """
+
+
+class _Conexion:
+    """Conexión persistente al servidor: una petición y una respuesta por línea."""
+    def __init__(self, reader, writer):
+        self.reader = reader
+        self.writer = writer
+
+    async def pedir(self, mensaje, timeout):
+        self.writer.write(json.dumps(mensaje).encode() + b"\n")
+        await asyncio.wait_for(self.writer.drain(), timeout)
+        linea = await asyncio.wait_for(self.reader.readline(), timeout)
+        if not linea:
+            raise ConnectionError("el servidor cerró la conexión")
+        try:
+            respuesta = json.loads(linea)
+        except ValueError:
+            raise RechazoServidor(f"respuesta inválida: {linea[:80]!r}") from None
+        if not isinstance(respuesta, dict) or not respuesta.get("ok"):
+            error = respuesta.get("error") if isinstance(respuesta, dict) else None
+            raise RechazoServidor(error or "respuesta inválida")
+        return respuesta
+
+    def cerrar(self):
+        self.writer.close()
+
+
+class _Pool:
+    """
+    Conexiones reutilizables al servidor. Se abren bajo demanda (hasta `size`)
+    y se descartan si fallan, para reconectar en la siguiente petición.
+    """
+    def __init__(self, host, port, size=2, timeout=3.0):
+        self.host = host
+        self.port = port
+        self.size = size
+        self.timeout = timeout
+        self._libres = []
+        self._abiertas = 0
+        self._disponible = asyncio.Condition()
+
+    async def _tomar(self):
+        async with self._disponible:
+            while not self._libres and self._abiertas >= self.size:
+                await self._disponible.wait()
+            if self._libres:
+                return self._libres.pop()
+            self._abiertas += 1
+        try:
+            reader, writer = await asyncio.wait_for(
+                asyncio.open_connection(self.host, self.port, limit=MAX_LINE), self.timeout)
+        except BaseException:
+            await self._soltar(None)
+            raise
+        return _Conexion(reader, writer)
+
+    async def _soltar(self, conexion):
+        async with self._disponible:
+            if conexion is None:
+                self._abiertas -= 1
+            else:
+                self._libres.append(conexion)
+            self._disponible.notify()
+
+    async def pedir(self, mensaje):
+        """
+        Envía una petición por una conexión libre del pool.
+
+        Retorna:
+        - dict: Respuesta del servidor.
+        """
+        conexion = await self._tomar()
+        try:
+            respuesta = await conexion.pedir(mensaje, self.timeout)
+        except BaseException:
+            conexion.cerrar()
+            await self._soltar(None)
+            raise
+        await self._soltar(conexion)
+        return respuesta
+
+    def cerrar(self):
+        for conexion in self._libres:
+            conexion.cerrar()
+        self._libres.clear()
+
+
+# Errores de red tras los que se reintenta (ConnectionError es un OSError); los
+# rechazos del servidor (RechazoServidor) no se reintentan
+_ERRORES_RED = (OSError, asyncio.TimeoutError)
+
+
+class LeaderboardClient:
+    """
+    Cliente no bloqueante de la tabla de puntajes. Todos sus métodos públicos
+    se llaman desde el hilo del juego y regresan de inmediato (salvo las esperas
+    explícitas de flush(), close() y top(wait=...)).
+    """
+    def __init__(self, host="127.0.0.1", port=DEFAULT_PORT, ttl=30.0, batch_size=50,
+                 flush_interval=0.5, timeout=3.0, max_retry_delay=30.0):
+        """
+        Parámetros:
+        - host, port: Dirección del servidor.
+        - ttl (float): Segundos que la caché del top se considera fresca.
+        - batch_size (int): Máximo de puntajes por envío.
+        - flush_interval (float): Segundos que se espera a juntar más puntajes antes de enviar.
+        - timeout (float): Límite de cada conexión o petición.
+        - max_retry_delay (float): Espera máxima entre reintentos.
+        """
+        self.ttl = ttl
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_retry_delay = max_retry_delay
+        # (modo, n) → (momento de la consulta, filas)
+        self._cache = {}
+        self._refrescando = set()
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, name="leaderboard-cliente",
+                                        daemon=True)
+        self._thread.start()
+        self._pool = None
+        self._cola = None
+        self._sin_enviar = 0
+        # Puntajes descartados porque el servidor los rechazó
+        self.descartados = 0
+        self._vacia = None
+        self._envio = None
+        asyncio.run_coroutine_threadsafe(self._preparar(host, port, timeout), self._loop).result()
+
+    async def _preparar(self, host, port, timeout):
+        # Los objetos de asyncio se crean dentro del bucle del cliente
+        self._pool = _Pool(host, port, timeout=timeout)
+        self._cola = asyncio.Queue()
+        self._vacia = asyncio.Event()
+        self._vacia.set()
+        self._envio = asyncio.get_running_loop().create_task(self._enviar_lotes())
+
+    @classmethod
+    def desde_direccion(cls, direccion, **kwargs):
+        """Crea un cliente a partir de "host:puerto" (o solo "host")."""
+        host, _, port = direccion.partition(":")
+        return cls(host or "127.0.0.1", int(port) if port else DEFAULT_PORT, **kwargs)
+
+    @property
+    def pendientes(self):
+        """Puntajes encolados o enviados sin confirmación del servidor."""
+        return self._sin_enviar
+
+    def submit(self, puntos, nombre=None, fecha=None, modo=puntajes.MODO_NORMAL):
+        """
+        Encola un puntaje para enviarlo en segundo plano.
+
+        Parámetros:
+        - puntos (int): Puntuación.
+        - nombre (str): Nombre del jugador (opcional).
+        - fecha (str): Fecha "AAAA-MM-DD HH:MM" (por defecto: ahora).
+        - modo (str): Modo de juego de la partida (uno de puntajes.MODOS).
+        """
+        registro = {"uid": uuid.uuid4().hex, "puntos": int(puntos), "nombre": nombre,
+                    "fecha": fecha or datetime.now().strftime(puntajes.FORMATO_FECHA),
+                    "modo": puntajes.validar_modo(modo)}
+        self._loop.call_soon_threadsafe(self._encolar, registro)
+
+    def _encolar(self, registro):
+        self._sin_enviar += 1
+        self._vacia.clear()
+        self._cola.put_nowait(registro)
+
+    async def _juntar_lote(self):
+        """Espera un puntaje y junta los que lleguen en flush_interval (hasta batch_size)."""
+        lote = [await self._cola.get()]
+        limite = self._loop.time() + self.flush_interval
+        while len(lote) < self.batch_size:
+            restante = limite - self._loop.time()
+            if restante <= 0:
+                break
+            try:
+                lote.append(await asyncio.wait_for(self._cola.get(), restante))
+            except asyncio.TimeoutError:
+                break
+        return lote
+
+    async def _enviar_lotes(self):
+        """
+        Tarea de fondo: junta puntajes en lotes y los envía. Los errores de red
+        se reintentan con espera exponencial; un lote rechazado se divide en
+        mitades y un puntaje rechazado por sí solo se descarta. Ningún error
+        detiene la tarea.
+        """
+        espera = 0.1
+        # Lotes por enviar, en orden; el primero es el que se está intentando
+        lotes = []
+        while True:
+            if not lotes:
+                lotes.append(await self._juntar_lote())
+            lote = lotes[0]
+            try:
+                await self._pool.pedir({"op": "submit", "scores": lote})
+            except _ERRORES_RED:
+                await asyncio.sleep(espera)
+                espera = min(espera * 2, self.max_retry_delay)
+                continue
+            except Exception as e:
+                lotes.pop(0)
+                self._rechazado(lote, e)
+                if len(lote) > 1:
+                    # Se reenvía por mitades para aislar los puntajes rechazados
+                    mitad = len(lote) // 2
+                    lotes[:0] = [lote[:mitad], lote[mitad:]]
+                    continue
+            else:
+                espera = 0.1
+                lotes.pop(0)
+                self._sin_enviar -= len(lote)
+                self._cache.clear()  # El top pudo cambiar
+            if self._sin_enviar == 0:
+                self._vacia.set()
+
+    def _rechazado(self, lote, error):
+        """Registra en el log un lote rechazado y descarta el puntaje si venía solo."""
+        if not isinstance(error, RechazoServidor):
+            # Un fallo inesperado del cliente se trata como un rechazo para no bloquear la cola
+            log.error("Error inesperado al enviar %d puntajes", len(lote), exc_info=error)
+        if len(lote) == 1:
+            self._sin_enviar -= 1
+            self.descartados += 1
+            log.warning("El servidor rechazó el puntaje %s (%s); se descarta", lote[0], error)
+        else:
+            log.warning("El servidor rechazó un lote de %d puntajes (%s); se envía por mitades",
+                        len(lote), error)
+
+    async def _consultar_top(self, clave):
+        modo, n = clave
+        try:
+            respuesta = await self._pool.pedir({"op": "top", "n": n, "modo": modo})
+            self._cache[clave] = (time.monotonic(), [tuple(fila) for fila in respuesta["top"]])
+        except _ERRORES_RED:
+            pass
+        except RechazoServidor as e:
+            log.warning("El servidor rechazó la consulta del top: %s", e)
+        finally:
+            self._refrescando.discard(clave)
+
+    def top(self, n=10, wait=0.0, modo=puntajes.MODO_NORMAL):
+        """
+        Mejores puntajes del servidor desde la caché. Si la caché expiró se pide
+        una actualización en segundo plano y se devuelven los datos anteriores.
+
+        Parámetros:
+        - n (int): Número de puntajes.
+        - wait (float): Si no hay nada en caché, segundos que se puede esperar la respuesta.
+        - modo (str): Modo de juego (uno de puntajes.MODOS).
+
+        Retorna:
+        - list o None: Tuplas (nombre, puntos, fecha), o None si aún no hay datos.
+        """
+        clave = (puntajes.validar_modo(modo), n)
+        entrada = self._cache.get(clave)
+        if entrada is None or time.monotonic() - entrada[0] > self.ttl:
+            future = None
+            if clave not in self._refrescando:
+                self._refrescando.add(clave)
+                future = asyncio.run_coroutine_threadsafe(self._consultar_top(clave), self._loop)
+            if entrada is None and wait > 0 and future is not None:
+                try:
+                    future.result(wait)
+                except concurrent.futures.TimeoutError:
+                    pass
+                entrada = self._cache.get(clave)
+        return entrada[1] if entrada else None
+
+    def flush(self, timeout=None):
+        """
+        Espera a que el servidor confirme todos los puntajes encolados.
+
+        Retorna:
+        - bool: True si no quedó nada pendiente.
+        """
+        future = asyncio.run_coroutine_threadsafe(self._vacia.wait(), self._loop)
+        try:
+            future.result(timeout)
+            return True
+        except concurrent.futures.TimeoutError:
+            future.cancel()
+            return False
+
+    def close(self, timeout=2.0):
+        """
+        Intenta enviar lo pendiente (hasta `timeout` segundos) y detiene el hilo del cliente.
+
+        Retorna:
+        - bool: True si no quedaron puntajes sin enviar.
+        """
+        enviado = self.flush(timeout)
+
+        async def cerrar():
+            self._envio.cancel()
+            await asyncio.gather(self._envio, return_exceptions=True)
+            self._pool.cerrar()
+        asyncio.run_coroutine_threadsafe(cerrar(), self._loop).result()
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop.close()
+        return enviado
+
+
+_cliente = None
+
+
+def conectar(direccion, **kwargs):
+    """
+    Crea el cliente compartido del juego.
+
+    Parámetros:
+    - direccion (str): "host:puerto" del servidor.
+
+    Retorna:
+    - LeaderboardClient: El cliente creado.
+    """
+    global _cliente
+    _cliente = LeaderboardClient.desde_direccion(direccion, **kwargs)
+    return _cliente
+
+
+def cliente():
+    """
+    Retorna:
+    - LeaderboardClient o None: Cliente compartido, o None si el juego no usa tabla en línea.
+    """
+    return _cliente
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Servidor de la tabla de puntajes compartida")
+    parser.add_argument("--host", default="0.0.0.0", help="Dirección donde escuchar")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help="Puerto")
+    parser.add_argument("--db", default=DB_FILE, help="Base de datos SQLite")
+    args = parser.parse_args()
+
+    async def servir():
+        server = LeaderboardServer(args.host, args.port, args.db)
+        await server.start()
+        print(f"Tabla de puntajes escuchando en {args.host}:{server.port}")
+        try:
+            await asyncio.Event().wait()
+        finally:
+            await server.stop()
+
+    try:
+        asyncio.run(servir())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
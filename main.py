@@ -1,10 +1,17 @@
+from startup import trace  # Primero, para medir también las importaciones
+import argparse
+import atexit
 import pygame
 import sys
 import os
-from datetime import datetime
-from recolector_mutante_v2 import Game
-
-pygame.init()
+import recolector_mutante_v2
+import puntajes
+import leaderboard
+from collision import COLLISION_AABB, COLLISION_MODES
+from quality import QualityGovernor, TIER_NAMES
+from session import Session
+from telemetry import TelemetryRecorder
+from text import text_cache
 
 WIDTH, HEIGHT = 800, 600
 WHITE = (255, 255, 255)
@@ -14,38 +21,221 @@ MINT = (80, 211, 172)  # Color #50D3AC
 
 # Fuente personalizada
 font_path = os.path.join("assets", "Audiowide-Regular.ttf")
-font = pygame.font.Font(font_path, 32)
+FONT_SIZE = 32
+
+# Se crean en iniciar(); importar este módulo no abre ventanas ni carga recursos
+screen = None
+sesion = None
 
-screen = pygame.display.set_mode((WIDTH, HEIGHT))
-pygame.display.set_caption("Recolector Mutante 2.0 - Menú Principal")
 
-DATA_PATH = "data"
-PUNTAJES_FILE = os.path.join(DATA_PATH, "puntajes.txt")
-if not os.path.exists(DATA_PATH):
-    os.makedirs(DATA_PATH)
+def iniciar():
+    """
+    Abre la sesión (ventana, audio, fuentes y caché de recursos, una sola vez
+    para el menú y todas las partidas).
+    """
+    global screen, sesion
+    sesion = Session("Recolector Mutante 2.0 - Menú Principal", (WIDTH, HEIGHT))
+    screen = sesion.open()
 
-def draw_text_centered(text, y, color=WHITE, bg=None):
+def draw_text_centered(text, y, color=WHITE, bg=None, superficie=None):
     """
-    Dibuja un texto centrado horizontalmente en la pantalla.
+    Dibuja un texto centrado horizontalmente en la pantalla, compuesto desde el
+    atlas de caracteres de la fuente (ver text.py).
 
     Parámetros:
     - text (str): Texto a mostrar.
     - y (int): Coordenada vertical (eje Y) donde centrar el texto.
     - color (tuple): Color del texto (por defecto: blanco).
     - bg (tuple): Color de fondo del texto (por defecto: None, es transparente).
+    - superficie (pygame.Surface): Dónde dibujar (por defecto: la pantalla).
     """
-    text_surf = font.render(text, True, color, bg)
+    if superficie is None:
+        superficie = screen
+    text_surf = text_cache.render(font_path, FONT_SIZE, color, text)
     text_rect = text_surf.get_rect(center=(WIDTH // 2, y))
-    screen.blit(text_surf, text_rect)
+    if bg is not None:
+        superficie.fill(bg, text_rect)
+    superficie.blit(text_surf, text_rect)
 
-def dibujar_fondo_con_marco():
+def dibujar_fondo_con_marco(superficie=None):
     """
     Dibuja el fondo del menú con un marco decorativo.
     Se utiliza en todas las pantallas del menú principal.
+
+    Parámetros:
+    - superficie (pygame.Surface): Dónde dibujar (por defecto: la pantalla).
+    """
+    if superficie is None:
+        superficie = screen
+    superficie.fill((10, 10, 10))
+    pygame.draw.rect(superficie, (30, 30, 30), (50, 50, WIDTH - 100, HEIGHT - 100), border_radius=20)
+    pygame.draw.rect(superficie, (80, 80, 80), (50, 50, WIDTH - 100, HEIGHT - 100), 2, border_radius=20)
+
+class Escena:
+    """
+    Pantalla estática del menú. Se pre-renderiza una sola vez y luego se queda
+    bloqueada en pygame.event.wait() hasta que llega una tecla, sin redibujar
+    ni consumir CPU mientras nadie la toca.
+    """
+    # Milisegundos entre actualizaciones de animación; None bloquea sin límite
+    intervalo = None
+
+    def __init__(self, lineas, teclas):
+        """
+        Parámetros:
+        - lineas (list): Tuplas (texto, y, color) que se dibujan centradas.
+        - teclas (dict): Tecla de pygame → valor que retorna la escena al presionarla.
+        """
+        self.lineas = lineas
+        self.teclas = teclas
+        self.superficie = None
+
+    def renderizar(self):
+        """
+        Compone la pantalla completa en una superficie la primera vez que se pide.
+
+        Retorna:
+        - pygame.Surface: Imagen de la escena lista para copiar a la pantalla.
+        """
+        if self.superficie is None:
+            self.superficie = pygame.Surface((WIDTH, HEIGHT)).convert()
+            dibujar_fondo_con_marco(self.superficie)
+            for texto, y, color in self.lineas:
+                draw_text_centered(texto, y, color, superficie=self.superficie)
+        return self.superficie
+
+    def animar(self, ahora):
+        """
+        Avanza la animación de la escena (si la tiene).
+
+        Parámetros:
+        - ahora (int): Milisegundos desde pygame.init().
+
+        Retorna:
+        - bool: True si hay que redibujar la pantalla.
+        """
+        return False
+
+    def dibujar(self):
+        """Copia la escena a la pantalla y la muestra."""
+        screen.blit(self.renderizar(), (0, 0))
+        pygame.display.flip()
+
+    def ejecutar(self):
+        """
+        Muestra la escena y espera eventos hasta que se presione una de sus teclas.
+
+        Retorna:
+        - El valor asociado a la tecla presionada.
+        """
+        self.dibujar()
+        while True:
+            if self.intervalo is None:
+                event = pygame.event.wait()
+            else:
+                event = pygame.event.wait(self.intervalo)
+            if event.type == pygame.QUIT:
+                sesion.close(); sys.exit()
+            if event.type == pygame.KEYDOWN and event.key in self.teclas:
+                return self.teclas[event.key]
+            if event.type in (pygame.WINDOWEXPOSED, pygame.VIDEOEXPOSE):
+                self.dibujar()
+            elif self.animar(pygame.time.get_ticks()):
+                self.dibujar()
+
+
+VOLVER = {pygame.K_ESCAPE: None}
+
+
+def escena_menu():
+    """Crea la escena del menú principal."""
+    opciones = ["1. Jugar", "2. Modo infinito", "3. Ver Puntajes", "4. Ayuda", "5. Créditos", "6. Salir"]
+    lineas = [("RECOLECTOR MUTANTE 2.0", 120, (255, 255, 0))]
+    lineas += [(op, 200 + i * 50, MINT) for i, op in enumerate(opciones)]
+    teclas = {
+        pygame.K_1: "jugar",
+        pygame.K_2: "infinito",
+        pygame.K_3: "puntajes",
+        pygame.K_4: "ayuda",
+        pygame.K_5: "creditos",
+        pygame.K_6: "salir",
+        pygame.K_ESCAPE: "salir",
+    }
+    return Escena(lineas, teclas)
+
+
+def escena_ayuda():
+    """Crea la escena de ayuda con las instrucciones del juego."""
+    return Escena([
+        ("AYUDA", 80, (0, 255, 255)),
+        ("Usa las flechas para mover al personaje", 140, MINT),
+        ("Evita obstáculos y recoge estrellas", 180, MINT),
+        ("Recolecta power-ups (escudo, ralentizador)", 220, MINT),
+        ("Modo infinito: sobrevive mientras todo se acelera", 260, MINT),
+        ("Presiona ESC para volver al menú", 320, GRAY),
+    ], VOLVER)
+
+
+def escena_creditos():
+    """Crea la escena de créditos."""
+    return Escena([
+        ("CRÉDITOS", 80, (255, 100, 200)),
+        ("Desarrolladores:", 140, MINT),
+        ("Luis Mario Franco Gómez", 180, MINT),
+        ("Lizeth Juliana Barrios Gonzales", 220, MINT),
+        ("Materia: Computación Gráfica", 260, MINT),
+        ("Docente: Francisco Alejandro Medina Aguirre", 300, MINT),
+        ("Presiona ESC para volver al menú", 380, GRAY),
+    ], VOLVER)
+
+
+# Título de la pantalla de puntajes de cada modo de juego
+TITULOS_PUNTAJES = {
+    puntajes.MODO_NORMAL: "PUNTAJES",
+    puntajes.MODO_INFINITO: "PUNTAJES - MODO INFINITO",
+}
+
+
+def escena_puntajes(modo=puntajes.MODO_NORMAL):
+    """
+    Crea la escena de puntajes de un modo de juego con sus últimos 10 registros
+    del almacén. Solo consulta esos 10 registros, sin leer todo el historial.
+    Si el juego está conectado a una tabla en línea, muestra en cambio los 10
+    mejores del servidor desde la caché del cliente, sin bloquear el menú (main()
+    la precarga al conectarse); mientras no haya respuesta, se muestran los del
+    almacén. TAB cambia al otro modo.
+
+    Parámetros:
+    - modo (str): Modo de juego (uno de puntajes.MODOS).
     """
-    screen.fill((10, 10, 10))
-    pygame.draw.rect(screen, (30, 30, 30), (50, 50, WIDTH - 100, HEIGHT - 100), border_radius=20)
-    pygame.draw.rect(screen, (80, 80, 80), (50, 50, WIDTH - 100, HEIGHT - 100), 2, border_radius=20)
+    otro = puntajes.MODO_INFINITO if modo == puntajes.MODO_NORMAL else puntajes.MODO_NORMAL
+    titulo = TITULOS_PUNTAJES[modo]
+    remoto = leaderboard.cliente()
+    ultimos = remoto.top(10, modo=modo) if remoto is not None else None
+    if ultimos is not None:
+        lineas = [(f"{titulo} (en línea)", 80, (0, 255, 0))]
+    else:
+        lineas = [(titulo, 80, (0, 255, 0))]
+        ultimos = puntajes.almacen().recientes(10, modo)
+    if ultimos:
+        lineas += [(puntajes.formatear(*fila), 140 + i * 30, WHITE) for i, fila in enumerate(ultimos)]
+    else:
+        lineas.append(("No hay puntajes guardados.", 150, WHITE))
+    lineas.append((f"TAB: {TITULOS_PUNTAJES[otro].lower()}", 460, GRAY))
+    lineas.append(("Presiona ESC para volver al menú", 500, GRAY))
+    return Escena(lineas, {**VOLVER, pygame.K_TAB: otro})
+
+
+# Las escenas fijas se pre-renderizan una vez y se reutilizan en cada visita
+_escenas = {}
+
+
+def _escena(nombre, fabrica):
+    """Retorna la escena con ese nombre, creándola la primera vez."""
+    if nombre not in _escenas:
+        _escenas[nombre] = fabrica()
+    return _escenas[nombre]
+
 
 def pantalla_menu():
     """
@@ -54,119 +244,103 @@ def pantalla_menu():
     Retorna:
     - str: La acción seleccionada por el usuario ('jugar', 'puntajes', 'ayuda', 'creditos' o 'salir').
     """
-    opciones = ["1. Jugar", "2. Ver Puntajes", "3. Ayuda", "4. Créditos", "5. Salir"]
-    seleccion = -1
-    while seleccion == -1:
-        dibujar_fondo_con_marco()
-        draw_text_centered("RECOLECTOR MUTANTE 2.0", 120, color=(255, 255, 0))
-        for i, op in enumerate(opciones):
-            draw_text_centered(op, 200 + i * 50, color=MINT)
-        pygame.display.flip()
-
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                pygame.quit(); sys.exit()
-            if event.type == pygame.KEYDOWN:
-                if event.key == pygame.K_1:
-                    return "jugar"
-                elif event.key == pygame.K_2:
-                    return "puntajes"
-                elif event.key == pygame.K_3:
-                    return "ayuda"
-                elif event.key == pygame.K_4:
-                    return "creditos"
-                elif event.key == pygame.K_5 or event.key == pygame.K_ESCAPE:
-                    return "salir"
+    return _escena("menu", escena_menu).ejecutar()
 
 def pantalla_ayuda():
     """
     Muestra la pantalla de ayuda con instrucciones del juego.
     Permite regresar al menú principal presionando ESC.
     """
-    while True:
-        dibujar_fondo_con_marco()
-        draw_text_centered("AYUDA", 80, color=(0, 255, 255))
-        draw_text_centered("Usa las flechas para mover al personaje", 140, color=MINT)
-        draw_text_centered("Evita obstáculos y recoge estrellas", 180, color=MINT)
-        draw_text_centered("Recolecta power-ups (escudo, ralentizador)", 220, color=MINT)
-        draw_text_centered("Presiona ESC para volver al menú", 320, color=GRAY)
-        pygame.display.flip()
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                pygame.quit(); sys.exit()
-            if event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE:
-                return
+    _escena("ayuda", escena_ayuda).ejecutar()
 
 def pantalla_creditos():
     """
     Muestra los créditos del juego incluyendo los desarrolladores y el docente.
     Permite regresar al menú principal presionando ESC.
     """
-
-    while True:
-        dibujar_fondo_con_marco()
-        draw_text_centered("CRÉDITOS", 80, color=(255, 100, 200))
-        draw_text_centered("Desarrolladores:", 140, color=MINT)
-        draw_text_centered("Luis Mario Franco Gómez", 180, color=MINT)
-        draw_text_centered("Lizeth Juliana Barrios Gonzales", 220, color=MINT)
-        draw_text_centered("Materia: Computación Gráfica", 260, color=MINT)
-        draw_text_centered("Docente: Francisco Alejandro Medina Aguirre", 300, color=MINT)
-        draw_text_centered("Presiona ESC para volver al menú", 380, color=GRAY)
-        pygame.display.flip()
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                pygame.quit(); sys.exit()
-            if event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE:
-                return
+    _escena("creditos", escena_creditos).ejecutar()
 
 def pantalla_puntajes():
     """
     Muestra la pantalla de puntajes guardados.
-    Carga y muestra los últimos 10 puntajes desde el archivo 'puntajes.txt'.
+    Carga y muestra los últimos 10 puntajes del almacén de puntajes
+    (o los 10 mejores de la tabla en línea, si hay una conectada), empezando
+    por el modo normal; TAB alterna con los del modo infinito.
     Permite regresar al menú principal presionando ESC.
     """
-    while True:
-        dibujar_fondo_con_marco()
-        draw_text_centered("PUNTAJES", 80, color=(0, 255, 0))
-        if os.path.exists(PUNTAJES_FILE):
-            with open(PUNTAJES_FILE, "r") as f:
-                lines = f.readlines()[-10:]
-            for i, line in enumerate(lines):
-                draw_text_centered(line.strip(), 140 + i * 30)
-        else:
-            draw_text_centered("No hay puntajes guardados.", 150)
-        draw_text_centered("Presiona ESC para volver al menú", 500, color=GRAY)
-        pygame.display.flip()
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                pygame.quit(); sys.exit()
-            if event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE:
-                return
+    # Los puntajes pueden cambiar entre visitas, así que esta escena se crea cada vez
+    modo = puntajes.MODO_NORMAL
+    while modo is not None:
+        modo = escena_puntajes(modo).ejecutar()
 
-def guardar_puntaje(nombre, puntos):
+def guardar_puntaje(nombre, puntos, modo=puntajes.MODO_NORMAL):
     """
-    Guarda un nuevo puntaje en el archivo 'puntajes.txt'.
+    Guarda un nuevo puntaje en el almacén de puntajes.
 
     Parámetros:
     - nombre (str): Nombre del jugador.
     - puntos (int): Puntos obtenidos por el jugador.
+    - modo (str): Modo de juego de la partida (uno de puntajes.MODOS).
     """
-    fecha = datetime.now().strftime("%Y-%m-%d %H:%M")
-    with open(PUNTAJES_FILE, "a") as f:
-        f.write(f"{nombre} - {puntos} pts - {fecha}\n")
-
-# Bucle principal del menú
-while True:
-    accion = pantalla_menu()
-    if accion == "jugar":
-        juego = Game()
-        juego.main_loop()
-        break
-    elif accion == "puntajes":
-        pantalla_puntajes()
-    elif accion == "ayuda":
-        pantalla_ayuda()
-    elif accion == "creditos":
-        pantalla_creditos()
-    elif accion == "salir":
-        pygame.quit(); sys.exit()
+    recolector_mutante_v2.guardar_puntaje(puntos, nombre, modo)
+
+def main():
+    """Punto de entrada: inicia la ventana y ejecuta el bucle principal del menú."""
+    parser = argparse.ArgumentParser(description="Recolector Mutante 2.0")
+    parser.add_argument("--startup-trace", action="store_true",
+                        help="Mostrar el tiempo de arranque por fase al salir")
+    parser.add_argument("--seed", type=int, default=None,
+                        help="Semilla de la partida (por defecto: al azar)")
+    parser.add_argument("--record", metavar="ARCHIVO", default=None,
+                        help="Grabar la entrada de la partida para reproducirla con replay.py "
+                             "(si se juegan varias, queda la última)")
+    parser.add_argument("--collision", choices=COLLISION_MODES, default=COLLISION_AABB,
+                        help="Prueba de colisión: rectángulos, círculos o píxeles (por defecto: aabb)")
+    parser.add_argument("--telemetry", metavar="ARCHIVO", default=None,
+                        help="Grabar telemetría por tick de todas las partidas (ver telemetry.py)")
+    parser.add_argument("--quality", choices=("auto",) + TIER_NAMES, default="auto",
+                        help="Calidad gráfica fija, o auto para ajustarla según el tiempo de los frames")
+    parser.add_argument("--leaderboard", metavar="HOST:PUERTO", default=None,
+                        help="Enviar los puntajes a una tabla en línea (ver leaderboard.py)")
+    args = parser.parse_args()
+    trace.enabled = args.startup_trace
+    trace.mark("importaciones")
+    if trace.enabled:
+        atexit.register(trace.report)
+    if args.leaderboard:
+        remoto = leaderboard.conectar(args.leaderboard)
+        atexit.register(remoto.close)
+        for modo in puntajes.MODOS:
+            remoto.top(10, modo=modo)  # Precarga la caché para la pantalla de puntajes
+
+    iniciar()
+    if args.telemetry:
+        sesion.telemetry = TelemetryRecorder(args.telemetry, recolector_mutante_v2.TICK_RATE)
+        atexit.register(sesion.telemetry.close)  # También si se cierra la ventana en plena partida
+    if args.quality != "auto":
+        sesion.quality = QualityGovernor(TIER_NAMES.index(args.quality), adaptive=False)
+    with trace.fase("menú (pre-render)"):
+        menu = _escena("menu", escena_menu)
+        menu.renderizar()
+    menu.dibujar()
+    trace.frame_shown()
+
+    # Bucle principal del menú
+    while True:
+        accion = pantalla_menu()
+        if accion in ("jugar", "infinito"):
+            # Al terminar la partida se vuelve al menú con la misma ventana y recursos
+            sesion.play(seed=args.seed, record=args.record, collision_mode=args.collision,
+                        endless=accion == "infinito")
+        elif accion == "puntajes":
+            pantalla_puntajes()
+        elif accion == "ayuda":
+            pantalla_ayuda()
+        elif accion == "creditos":
+            pantalla_creditos()
+        elif accion == "salir":
+            sesion.close(); sys.exit()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,211 @@
+"""
+Partículas de efectos visuales en arreglos de NumPy.
+
+Todas las partículas viven en un único arreglo preasignado de
+FIELDS x capacidad (posición, velocidad, vida restante, vida total y color),
+con las vivas siempre al principio. Cada frame se actualizan en una sola
+pasada vectorizada y las muertas se compactan hacia el final; se dibujan en
+lote con Surface.blits() a partir de sprites pre-renderizados por color y
+etapa de vida. La capacidad es un presupuesto duro: si una ráfaga no cabe, se
+emiten solo las que caben.
+
+Las partículas son solo cosméticas: usan su propio generador aleatorio y no
+tocan el estado de la partida, así que no afectan a las repeticiones.
+
+Requiere NumPy; si no está instalado, HAVE_NUMPY es False y el juego no muestra
+partículas.
+"""
+import math
+from collections import namedtuple
+
+try:
+    import numpy as np
+    HAVE_NUMPY = True
+except ImportError:
+    np = None
+    HAVE_NUMPY = False
+
+import pygame
+
+# Filas del arreglo de partículas
+FIELDS = 7
+X, Y, VX, VY, LIFE, TTL, COLOR = range(FIELDS)
+
+DEFAULT_CAPACITY = 2000
+# Sprites por color: de recién emitida (grande y opaca) a punto de morir
+STAGES = 4
+MAX_RADIUS = 4
+# Color transparente de los sprites (ningún canal del efecto llega a 0)
+COLOR_KEY = (0, 0, 0)
+# Fracción de la velocidad que se pierde por segundo, y gravedad en píxeles/s²
+DRAG = 2.5
+GRAVITY = 120.0
+
+# colors: colores posibles; count: partículas por ráfaga; speed: velocidad
+# máxima en píxeles/s; life: segundos de vida máximos
+Effect = namedtuple("Effect", "colors count speed life")
+
+FX_STAR = "star"
+FX_SHIELD_BREAK = "shield_break"
+FX_HIT = "hit"
+FX_SLOW = "slow"
+
+EFFECTS = {
+    FX_STAR: Effect(((255, 255, 0), (255, 255, 255)), 24, 160, 0.6),
+    FX_SHIELD_BREAK: Effect(((255, 255, 0), (255, 200, 0)), 48, 260, 0.8),
+    FX_HIT: Effect(((255, 60, 60), (255, 140, 0)), 64, 220, 1.0),
+    FX_SLOW: Effect(((80, 160, 255), (200, 230, 255)), 32, 120, 1.2),
+}
+
+
+class ParticleSystem:
+    """
+    Conjunto de partículas con presupuesto fijo, actualizado y dibujado por lotes.
+    """
+    def __init__(self, capacity=DEFAULT_CAPACITY, seed=None):
+        """
+        Parámetros:
+        - capacity (int): Máximo de partículas vivas a la vez.
+        - seed (int): Semilla del generador de las ráfagas (por defecto: una al azar).
+        """
+        if not HAVE_NUMPY:
+            raise RuntimeError("ParticleSystem requiere NumPy (pip install numpy)")
+        self.capacity = capacity
+        self.data = np.zeros((FIELDS, capacity), dtype=np.float32)
+        self.count = 0
+        # Partículas que no se emitieron por falta de presupuesto
+        self.dropped = 0
+        self.rng = np.random.default_rng(seed)
+        self._palette = {}
+        self._sprites = []
+
+    def _color_index(self, color):
+        """Índice del color en la paleta, agregándolo (y sus sprites) la primera vez."""
+        index = self._palette.get(color)
+        if index is None:
+            index = self._palette[color] = len(self._palette)
+            self._sprites.extend(self._render_stages(color))
+        return index
+
+    def _render_stages(self, color):
+        """
+        Las partículas se apagan achicándose y oscureciéndose. Los sprites usan
+        color clave en lugar de transparencia por píxel: con miles de copias
+        por frame, cada blit sale unas tres veces más barato.
+
+        Retorna:
+        - list: Un sprite por etapa de vida, todos del mismo tamaño y centrados.
+        """
+        side = 2 * MAX_RADIUS + 1
+        sprites = []
+        for stage in range(STAGES):
+            sprite = pygame.Surface((side, side))
+            sprite.fill(COLOR_KEY)
+            fraction = stage / max(1, STAGES - 1)
+            radius = 1 + (MAX_RADIUS - 1) * fraction
+            shade = 0.35 + 0.65 * fraction
+            pygame.draw.circle(sprite, [max(1, int(c * shade)) for c in color],
+                               (MAX_RADIUS, MAX_RADIUS), radius)
+            sprite.set_colorkey(COLOR_KEY, pygame.RLEACCEL)
+            if pygame.display.get_init() and pygame.display.get_surface() is not None:
+                sprite = sprite.convert()
+            sprites.append(sprite)
+        return sprites
+
+    def burst(self, effect, x, y):
+        """
+        Emite una ráfaga de partículas en todas las direcciones desde un punto.
+
+        Parámetros:
+        - effect (Effect): Efecto a emitir (ver EFFECTS).
+        - x, y (float): Centro de la ráfaga en pantalla.
+
+        Retorna:
+        - int: Partículas emitidas (menos que effect.count si se agotó el presupuesto).
+        """
+        n = self.count
+        k = min(effect.count, self.capacity - n)
+        self.dropped += effect.count - max(0, k)
+        if k <= 0:
+            return 0
+        rng = self.rng
+        d = self.data[:, n:n + k]
+        angle = rng.random(k, dtype=np.float32) * (2 * math.pi)
+        speed = effect.speed * (0.3 + 0.7 * rng.random(k, dtype=np.float32))
+        life = effect.life * (0.5 + 0.5 * rng.random(k, dtype=np.float32))
+        d[X] = x
+        d[Y] = y
+        d[VX] = np.cos(angle) * speed
+        d[VY] = np.sin(angle) * speed
+        d[LIFE] = life
+        d[TTL] = life
+        colors = [self._color_index(color) for color in effect.colors]
+        d[COLOR] = rng.choice(colors, k) if len(colors) > 1 else colors[0]
+        self.count = n + k
+        return k
+
+    def update(self, dt):
+        """
+        Avanza todas las partículas y descarta las que murieron.
+
+        Parámetros:
+        - dt (float): Segundos transcurridos.
+        """
+        n = self.count
+        if n == 0 or dt <= 0:
+            return
+        d = self.data[:, :n]
+        d[LIFE] -= dt
+        d[X] += d[VX] * dt
+        d[Y] += d[VY] * dt
+        d[VX:VY + 1] *= max(0.0, 1.0 - DRAG * dt)
+        d[VY] += GRAVITY * dt
+        alive = d[LIFE] > 0
+        k = int(np.count_nonzero(alive))
+        if k < n:
+            # Las vivas pasan al principio; las muertas quedan libres al final
+            self.data[:, :k] = d[:, alive]
+            self.count = k
+
+    def draw(self, surface, area=None):
+        """
+        Dibuja todas las partículas vivas en un solo lote.
+
+        Parámetros:
+        - surface (pygame.Surface): Superficie destino.
+        - area (pygame.Rect): Zona donde se permite dibujar (por defecto: toda la superficie).
+
+        Retorna:
+        - pygame.Rect o None: Rectángulo que abarca lo dibujado, o None si no hay partículas.
+        """
+        n = self.count
+        if n == 0:
+            return None
+        area = surface.get_rect() if area is None else area
+        side = 2 * MAX_RADIUS + 1
+        d = self.data[:, :n]
+        xs = d[X].astype(np.intp) - MAX_RADIUS
+        ys = d[Y].astype(np.intp) - MAX_RADIUS
+        # Fuera del área no se llama a blit (las que cayeron por debajo siguen vivas hasta apagarse)
+        visible = ((xs > area.left - side) & (xs < area.right)
+                   & (ys > area.top - side) & (ys < area.bottom))
+        if not visible.all():
+            d, xs, ys = d[:, visible], xs[visible], ys[visible]
+            if not len(xs):
+                return None
+        stage = np.minimum((d[LIFE] / d[TTL] * STAGES).astype(np.intp), STAGES - 1)
+        sprite_index = d[COLOR].astype(np.intp) * STAGES + stage
+        x0, y0 = int(xs.min()), int(ys.min())
+        bounds = pygame.Rect(x0, y0, int(xs.max()) - x0 + side, int(ys.max()) - y0 + side).clip(area)
+
+        previous_clip = surface.get_clip()
+        surface.set_clip(area)
+        sprites = self._sprites
+        surface.blits(zip(map(sprites.__getitem__, sprite_index.tolist()),
+                          zip(xs.tolist(), ys.tolist())), doreturn=False)
+        surface.set_clip(previous_clip)
+        return bounds
+
+    def clear(self):
+        """Elimina todas las partículas vivas."""
+        self.count = 0
@@ -0,0 +1,220 @@
+"""
+Perfilador de frames integrado en el juego.
+
+En cada frame de run_level se toma el tiempo de cada fase (eventos, entrada,
+movimiento del jugador, obstáculos, colisiones, dibujo, HUD, envío a pantalla
+y espera del reloj) y se guarda en un buffer circular de tamaño fijo, sin
+crear objetos por frame. Con F3 se muestra un panel con la gráfica de tiempos
+de frame recientes y el desglose por fase (su propio costo no se cuenta); al terminar la sesión se escriben
+los datos en CSV y un resumen en JSON.
+"""
+import csv
+import json
+import os
+import time
+from array import array
+
+import pygame
+
+PHASES = ("events", "input", "player_move", "obstacles", "collisions",
+          "draw", "draw_info", "flip", "wait")
+(P_EVENTS, P_INPUT, P_PLAYER_MOVE, P_OBSTACLES, P_COLLISIONS,
+ P_DRAW, P_DRAW_INFO, P_FLIP, P_WAIT) = range(len(PHASES))
+
+PHASE_COLORS = [
+    (120, 120, 120), (160, 160, 255), (80, 211, 172), (255, 160, 60), (255, 80, 80),
+    (90, 160, 255), (255, 255, 0), (200, 100, 255), (60, 60, 60),
+]
+
+DEFAULT_CAPACITY = 3600  # Un minuto a 60 FPS
+DUMP_PATH = os.path.join("data", "perfil")
+
+
+class FrameProfiler:
+    """
+    Buffer circular de tiempos por fase. Cada frame ocupa una fila de
+    len(PHASES) valores en un array de dobles preasignado.
+    """
+    def __init__(self, capacity=DEFAULT_CAPACITY):
+        """
+        Parámetros:
+        - capacity (int): Número de frames que se conservan.
+        """
+        self.capacity = capacity
+        self.samples = array("d", bytes(8 * capacity * len(PHASES)))
+        self.levels = array("i", bytes(4 * capacity))
+        self.count = 0      # Frames registrados en total
+        self.overlay = False
+        # Fila del frame en curso, ya con el formato de self.samples para copiarla sin convertir
+        self._row = array("d", bytes(8 * len(PHASES)))
+        self._zeros = array("d", bytes(8 * len(PHASES)))
+        self._last = 0.0
+        self._font = None
+        self._panel = None
+        self._panel_count = 0
+
+    def begin_frame(self):
+        """Inicia la medición de un frame."""
+        self._row[:] = self._zeros
+        self._last = time.perf_counter()
+
+    def mark(self, phase):
+        """
+        Suma a una fase el tiempo transcurrido desde la marca anterior.
+
+        Parámetros:
+        - phase (int): Índice de la fase (P_EVENTS, P_DRAW, ...).
+        """
+        now = time.perf_counter()
+        self._row[phase] += now - self._last
+        self._last = now
+
+    def end_frame(self, level):
+        """
+        Guarda el frame en el buffer circular.
+
+        Parámetros:
+        - level (int): Nivel que se estaba jugando.
+        """
+        slot = self.count % self.capacity
+        base = slot * len(PHASES)
+        self.samples[base:base + len(PHASES)] = self._row
+        self.levels[slot] = level
+        self.count += 1
+
+    def toggle_overlay(self):
+        """Muestra u oculta el panel del perfilador."""
+        self.overlay = not self.overlay
+
+    def frames(self, last=None):
+        """
+        Recorre los frames guardados del más antiguo al más reciente.
+
+        Parámetros:
+        - last (int): Solo los últimos N frames (opcional).
+
+        Retorna:
+        - generator: Tuplas (nivel, tiempos por fase en segundos).
+        """
+        stored = min(self.count, self.capacity)
+        if last is not None:
+            stored = min(stored, last)
+        n = len(PHASES)
+        for k in range(self.count - stored, self.count):
+            slot = k % self.capacity
+            yield self.levels[slot], self.samples[slot * n:(slot + 1) * n]
+
+    def summary(self):
+        """
+        Resume los frames guardados: percentiles del tiempo de frame, promedio
+        por fase, resumen por nivel y los peores frames con su desglose.
+
+        Retorna:
+        - dict: Resumen listo para JSON (tiempos en milisegundos).
+        """
+        rows = list(self.frames())
+        if not rows:
+            return {"frames": 0}
+        totals = sorted(sum(times) * 1000 for _, times in rows)
+
+        def pct(values, p):
+            return values[min(len(values) - 1, int(len(values) * p / 100))]
+
+        by_level = {}
+        for level, times in rows:
+            by_level.setdefault(level, []).append(sum(times) * 1000)
+        worst = sorted(rows, key=lambda r: sum(r[1]), reverse=True)[:10]
+        return {
+            "frames": len(rows),
+            "frame_ms": {"p50": pct(totals, 50), "p90": pct(totals, 90),
+                         "p99": pct(totals, 99), "max": totals[-1]},
+            "phase_mean_ms": {name: sum(t[i] for _, t in rows) * 1000 / len(rows)
+                              for i, name in enumerate(PHASES)},
+            "levels": {str(level): {"frames": len(v), "p50_ms": pct(sorted(v), 50),
+                                    "max_ms": max(v)}
+                       for level, v in sorted(by_level.items())},
+            "worst_frames": [{"level": level,
+                              "phases_ms": {name: t[i] * 1000 for i, name in enumerate(PHASES)}}
+                             for level, t in worst],
+        }
+
+    def dump(self, path=DUMP_PATH):
+        """
+        Escribe los frames en '<path>.csv' y el resumen en '<path>.json'.
+
+        Parámetros:
+        - path (str): Ruta base sin extensión.
+        """
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(path + ".csv", "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(("level",) + tuple(f"{name}_ms" for name in PHASES) + ("total_ms",))
+            for level, times in self.frames():
+                writer.writerow([level] + [f"{t * 1000:.4f}" for t in times]
+                                + [f"{sum(times) * 1000:.4f}"])
+        with open(path + ".json", "w") as f:
+            json.dump(self.summary(), f, indent=2)
+
+    def skip(self):
+        """Descarta el tiempo desde la última marca (por ejemplo, el del propio panel)."""
+        self._last = time.perf_counter()
+
+    def draw_overlay(self, surface, width=300, height=150, frames=120, refresh=10):
+        """
+        Dibuja el panel del perfilador en la esquina inferior derecha: una barra
+        apilada por fase para cada uno de los últimos frames y el promedio por fase.
+        El panel se recompone cada 'refresh' frames y entre tanto se reutiliza.
+
+        Parámetros:
+        - surface (pygame.Surface): Pantalla.
+        - width, height (int): Tamaño del panel.
+        - frames (int): Frames que se grafican.
+        - refresh (int): Cada cuántos frames se recompone el panel.
+
+        Retorna:
+        - pygame.Rect: Zona dibujada.
+        """
+        if self._panel is None or self.count - self._panel_count >= refresh:
+            self._panel = self._render_panel(width, height, frames)
+            self._panel_count = self.count
+        rect = self._panel.get_rect(bottomright=(surface.get_width() - 10,
+                                                 surface.get_height() - 10))
+        surface.blit(self._panel, rect)
+        return rect
+
+    def _render_panel(self, width, height, frames):
+        if self._font is None:
+            self._font = pygame.font.Font(None, 16)
+        panel = pygame.Surface((width, height))
+        panel.fill((10, 10, 10))
+        pygame.draw.rect(panel, (80, 80, 80), panel.get_rect(), 1)
+
+        graph_h = 70
+        budget_ms = 1000 / 60
+        scale = graph_h / (2 * budget_ms)  # La gráfica llega a dos presupuestos de frame
+        base_y = 5 + graph_h
+        bar_w = max(1, (width - 10) // frames)
+        recent = list(self.frames(frames))
+        means = [0.0] * len(PHASES)
+        for k, (_, times) in enumerate(recent):
+            x = 5 + k * bar_w
+            y = base_y
+            for i, t in enumerate(times):
+                means[i] += t
+                h = int(t * 1000 * scale)
+                if h:
+                    top = max(5, y - h)
+                    pygame.draw.rect(panel, PHASE_COLORS[i], (x, top, bar_w, y - top))
+                    y = top
+        budget_y = base_y - int(budget_ms * scale)
+        pygame.draw.line(panel, (255, 255, 255), (5, budget_y), (5 + frames * bar_w, budget_y))
+
+        n = max(1, len(recent))
+        total = sum(means) * 1000 / n
+        text = self._font.render(f"frame {total:5.2f} ms", True, (255, 255, 255))
+        panel.blit(text, (5, base_y + 4))
+        for i, name in enumerate(PHASES):
+            col, row = divmod(i, 5)
+            label = self._font.render(f"{name} {means[i] * 1000 / n:5.2f}", True, PHASE_COLORS[i])
+            panel.blit(label, (5 + col * 150, base_y + 18 + row * 11))
+        return panel.convert() if pygame.display.get_surface() is not None else panel
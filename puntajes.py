@@ -0,0 +1,377 @@
+"""
+Almacén de puntajes en SQLite.
+
+Reemplaza el archivo plano 'data/puntajes.txt'. Los puntajes se guardan en una
+tabla con índices para consultar los mejores, los más recientes y el mejor de
+cada jugador sin leer todo el historial, y los agregados (mejor, promedio,
+partidas por día) se mantienen al día con triggers en cada inserción.
+Cada puntaje lleva su modo de juego (normal o infinito): los mejores, los
+recientes, el mejor de cada jugador y los agregados van por modo, para que las
+partidas infinitas (sin límite de puntos) no compitan con las normales. La
+primera vez que se abre, importa el archivo de texto anterior si existe (todo
+como modo normal).
+"""
+import os
+import re
+import sqlite3
+from datetime import datetime
+
+DATA_PATH = "data"
+DB_FILE = os.path.join(DATA_PATH, "puntajes.db")
+TXT_FILE = os.path.join(DATA_PATH, "puntajes.txt")
+
+FORMATO_FECHA = "%Y-%m-%d %H:%M"
+
+# Modos de juego con tabla de puntajes propia
+MODO_NORMAL = "normal"
+MODO_INFINITO = "infinito"
+MODOS = (MODO_NORMAL, MODO_INFINITO)
+
+# "nombre - 12 pts - 2025-06-03 15:28" (main.py) o "12 pts - 2025-06-03 15:28" (juego)
+_LINEA_TXT = re.compile(r"^(?:(?P<nombre>.*?) - )?(?P<puntos>-?\d+) pts - (?P<fecha>.+)$")
+
+_ESQUEMA = """
+CREATE TABLE IF NOT EXISTS puntajes (
+    id INTEGER PRIMARY KEY,
+    nombre TEXT,
+    puntos INTEGER NOT NULL,
+    fecha TEXT NOT NULL,
+    modo TEXT NOT NULL DEFAULT 'normal'
+);
+
+CREATE TABLE IF NOT EXISTS meta (
+    clave TEXT PRIMARY KEY,
+    valor TEXT
+);
+
+CREATE TABLE IF NOT EXISTS envios (
+    uid TEXT PRIMARY KEY
+);
+"""
+
+# Agregados por modo de juego. Después de _ESQUEMA y de migrar las bases
+# anteriores a los modos (ver AlmacenPuntajes._migrar_modos())
+_AGREGADOS = """
+CREATE TABLE IF NOT EXISTS resumen (
+    modo TEXT PRIMARY KEY,
+    partidas INTEGER NOT NULL,
+    suma INTEGER NOT NULL,
+    mejor INTEGER
+);
+
+CREATE TABLE IF NOT EXISTS por_dia (
+    modo TEXT NOT NULL,
+    dia TEXT NOT NULL,
+    partidas INTEGER NOT NULL,
+    PRIMARY KEY (modo, dia)
+);
+
+CREATE INDEX IF NOT EXISTS idx_puntajes_modo ON puntajes (modo, puntos DESC, id);
+CREATE INDEX IF NOT EXISTS idx_puntajes_modo_id ON puntajes (modo, id);
+CREATE INDEX IF NOT EXISTS idx_puntajes_modo_nombre ON puntajes (modo, nombre, puntos DESC);
+DROP INDEX IF EXISTS idx_puntajes_puntos;
+DROP INDEX IF EXISTS idx_puntajes_nombre;
+"""
+
+_TRIGGER = """
+CREATE TRIGGER IF NOT EXISTS puntajes_agregados_modo AFTER INSERT ON puntajes
+BEGIN
+    INSERT INTO resumen (modo, partidas, suma, mejor) VALUES (NEW.modo, 1, NEW.puntos, NEW.puntos)
+        ON CONFLICT (modo) DO UPDATE SET
+            partidas = partidas + 1,
+            suma = suma + NEW.puntos,
+            mejor = CASE WHEN mejor IS NULL OR NEW.puntos > mejor THEN NEW.puntos ELSE mejor END;
+    INSERT INTO por_dia (modo, dia, partidas) VALUES (NEW.modo, substr(NEW.fecha, 1, 10), 1)
+        ON CONFLICT (modo, dia) DO UPDATE SET partidas = partidas + 1;
+END;
+"""
+
+# Pasa los agregados de una base anterior a los modos (una sola fila de resumen y
+# por_dia por día, renombradas a *_anterior) a las tablas por modo, como "normal"
+_MIGRAR_AGREGADOS = """
+INSERT INTO resumen (modo, partidas, suma, mejor)
+    SELECT 'normal', partidas, suma, mejor FROM resumen_anterior WHERE partidas > 0;
+INSERT INTO por_dia (modo, dia, partidas) SELECT 'normal', dia, partidas FROM por_dia_anterior;
+DROP TABLE resumen_anterior;
+DROP TABLE por_dia_anterior;
+"""
+
+
+def validar_modo(modo):
+    """
+    Retorna:
+    - str: El modo, si es uno de MODOS.
+
+    Lanza ValueError si no lo es.
+    """
+    if modo not in MODOS:
+        raise ValueError(f"modo de juego desconocido: {modo!r}")
+    return modo
+
+
+def _sentencias(script):
+    """Separa un script SQL sin triggers en sentencias, para ejecutarlas dentro de una transacción."""
+    return [s for s in script.split(";") if s.strip()]
+
+
+def formatear(nombre, puntos, fecha):
+    """
+    Formatea un registro igual que el antiguo archivo de texto.
+
+    Retorna:
+    - str: "nombre - N pts - fecha", o "N pts - fecha" si no hay nombre.
+    """
+    if nombre:
+        return f"{nombre} - {puntos} pts - {fecha}"
+    return f"{puntos} pts - {fecha}"
+
+
+class AlmacenPuntajes:
+    """
+    Historial de puntajes con consultas indexadas y agregados incrementales.
+    """
+    def __init__(self, ruta=DB_FILE, importar_de=TXT_FILE):
+        """
+        Abre (o crea) la base de datos e importa el archivo de texto una única vez.
+
+        Parámetros:
+        - ruta (str): Ruta del archivo SQLite (":memory:" para pruebas).
+        - importar_de (str): Archivo de texto anterior a importar (None para omitirlo).
+        """
+        if ruta != ":memory:":
+            os.makedirs(os.path.dirname(ruta) or ".", exist_ok=True)
+        self.conexion = sqlite3.connect(ruta)
+        self.conexion.executescript(_ESQUEMA)
+        self._migrar_modos()
+        if importar_de and os.path.exists(importar_de) and not self._ya_importado(importar_de):
+            self.importar_txt(importar_de)
+
+    def _columnas(self, tabla):
+        return [fila[1] for fila in self.conexion.execute(f"PRAGMA table_info({tabla})")]
+
+    def _migrar_modos(self):
+        """
+        Crea las tablas de agregados por modo y el trigger que las mantiene. En una
+        base anterior a los modos, sus puntajes y agregados pasan a ser del modo
+        normal, en una sola transacción.
+        """
+        with self.conexion:
+            # Las sentencias DDL no abren una transacción por sí solas
+            self.conexion.execute("BEGIN")
+            if "modo" not in self._columnas("puntajes"):
+                self.conexion.execute(
+                    "ALTER TABLE puntajes ADD COLUMN modo TEXT NOT NULL DEFAULT 'normal'")
+            # El trigger anterior escribe en las tablas sin modo
+            self.conexion.execute("DROP TRIGGER IF EXISTS puntajes_agregados")
+            anteriores = "id" in self._columnas("resumen")
+            if anteriores:
+                self.conexion.execute("ALTER TABLE resumen RENAME TO resumen_anterior")
+                self.conexion.execute("ALTER TABLE por_dia RENAME TO por_dia_anterior")
+            for sentencia in _sentencias(_AGREGADOS):
+                self.conexion.execute(sentencia)
+            if anteriores:
+                for sentencia in _sentencias(_MIGRAR_AGREGADOS):
+                    self.conexion.execute(sentencia)
+            self.conexion.execute(_TRIGGER)
+
+    def _ya_importado(self, ruta):
+        fila = self.conexion.execute(
+            "SELECT 1 FROM meta WHERE clave = ?", (f"importado:{os.path.abspath(ruta)}",)).fetchone()
+        return fila is not None
+
+    def importar_txt(self, ruta):
+        """
+        Importa el historial del antiguo 'puntajes.txt' en una sola transacción.
+        Acepta los dos formatos que escribían main.py y recolector_mutante_v2.py
+        (todos los puntajes son del modo normal); las líneas que no se reconocen se ignoran. Durante la carga masiva el
+        trigger se desactiva y los agregados se actualizan con una sola consulta.
+
+        Parámetros:
+        - ruta (str): Archivo de texto a importar.
+
+        Retorna:
+        - int: Número de puntajes importados.
+        """
+        def filas():
+            with open(ruta, "r", encoding="utf-8", errors="replace") as f:
+                for linea in f:
+                    m = _LINEA_TXT.match(linea.strip())
+                    if m:
+                        yield m.group("nombre"), int(m.group("puntos")), m.group("fecha")
+
+        with self.conexion:
+            antes = self.total()
+            ultimo = self.conexion.execute("SELECT COALESCE(MAX(id), 0) FROM puntajes").fetchone()[0]
+            self.conexion.execute("DROP TRIGGER IF EXISTS puntajes_agregados_modo")
+            self.conexion.executemany(
+                "INSERT INTO puntajes (nombre, puntos, fecha) VALUES (?, ?, ?)", filas())
+            self.conexion.execute("""
+                INSERT INTO resumen (modo, partidas, suma, mejor)
+                    SELECT modo, COUNT(*), SUM(puntos), MAX(puntos) FROM puntajes WHERE id > ? GROUP BY modo
+                ON CONFLICT (modo) DO UPDATE SET
+                    partidas = partidas + excluded.partidas,
+                    suma = suma + excluded.suma,
+                    mejor = CASE WHEN mejor IS NULL OR excluded.mejor > mejor
+                                 THEN excluded.mejor ELSE mejor END""", (ultimo,))
+            self.conexion.execute("""
+                INSERT INTO por_dia (modo, dia, partidas)
+                    SELECT modo, substr(fecha, 1, 10), COUNT(*) FROM puntajes WHERE id > ? GROUP BY 1, 2
+                ON CONFLICT (modo, dia) DO UPDATE SET partidas = partidas + excluded.partidas""", (ultimo,))
+            self.conexion.execute(_TRIGGER)
+            self.conexion.execute(
+                "INSERT OR REPLACE INTO meta (clave, valor) VALUES (?, ?)",
+                (f"importado:{os.path.abspath(ruta)}", datetime.now().strftime(FORMATO_FECHA)))
+        return self.total() - antes
+
+    def guardar(self, puntos, nombre=None, fecha=None, modo=MODO_NORMAL):
+        """
+        Guarda un puntaje.
+
+        Parámetros:
+        - puntos (int): Puntuación obtenida.
+        - nombre (str): Nombre del jugador (opcional).
+        - fecha (str): Fecha "AAAA-MM-DD HH:MM" (por defecto: ahora).
+        - modo (str): Modo de juego de la partida (uno de MODOS).
+        """
+        fecha = fecha or datetime.now().strftime(FORMATO_FECHA)
+        with self.conexion:
+            self.conexion.execute(
+                "INSERT INTO puntajes (nombre, puntos, fecha, modo) VALUES (?, ?, ?, ?)",
+                (nombre, int(puntos), fecha, validar_modo(modo)))
+
+    def guardar_varios(self, registros):
+        """
+        Guarda varios puntajes en una sola transacción. Los que traen un
+        identificador ya recibido se ignoran, así que reenviar un lote es seguro.
+
+        Parámetros:
+        - registros (list): Tuplas (puntos, nombre, fecha, uid, modo); uid puede ser None.
+
+        Retorna:
+        - int: Número de puntajes nuevos guardados.
+        """
+        nuevos = 0
+        with self.conexion:
+            for puntos, nombre, fecha, uid, modo in registros:
+                validar_modo(modo)
+                if uid is not None:
+                    cursor = self.conexion.execute("INSERT OR IGNORE INTO envios (uid) VALUES (?)", (uid,))
+                    if cursor.rowcount == 0:
+                        continue
+                self.conexion.execute(
+                    "INSERT INTO puntajes (nombre, puntos, fecha, modo) VALUES (?, ?, ?, ?)",
+                    (nombre, int(puntos), fecha or datetime.now().strftime(FORMATO_FECHA), modo))
+                nuevos += 1
+        return nuevos
+
+    def top(self, n=10, modo=MODO_NORMAL):
+        """
+        Parámetros:
+        - n (int): Número de puntajes.
+        - modo (str): Modo de juego (uno de MODOS).
+
+        Retorna:
+        - list: Las n mejores tuplas (nombre, puntos, fecha) del modo, de mayor a menor.
+        """
+        return self.conexion.execute(
+            "SELECT nombre, puntos, fecha FROM puntajes WHERE modo = ? ORDER BY puntos DESC, id LIMIT ?",
+            (validar_modo(modo), n)).fetchall()
+
+    def recientes(self, n=10, modo=MODO_NORMAL):
+        """
+        Parámetros:
+        - n (int): Número de puntajes.
+        - modo (str): Modo de juego (uno de MODOS).
+
+        Retorna:
+        - list: Las n tuplas (nombre, puntos, fecha) más recientes del modo, de la más antigua a la más nueva.
+        """
+        filas = self.conexion.execute(
+            "SELECT nombre, puntos, fecha FROM puntajes WHERE modo = ? ORDER BY id DESC LIMIT ?",
+            (validar_modo(modo), n)).fetchall()
+        return filas[::-1]
+
+    def mejor_de(self, nombre, modo=MODO_NORMAL):
+        """
+        Parámetros:
+        - nombre (str): Nombre del jugador.
+        - modo (str): Modo de juego (uno de MODOS).
+
+        Retorna:
+        - int o None: Mejor puntaje del jugador en ese modo, o None si no tiene registros.
+        """
+        fila = self.conexion.execute(
+            "SELECT puntos FROM puntajes WHERE modo = ? AND nombre = ? ORDER BY puntos DESC LIMIT 1",
+            (validar_modo(modo), nombre)).fetchone()
+        return fila[0] if fila else None
+
+    def total(self, modo=None):
+        """
+        Parámetros:
+        - modo (str): Contar solo las partidas de ese modo (por defecto: todas).
+
+        Retorna:
+        - int: Número de partidas registradas.
+        """
+        if modo is None:
+            return self.conexion.execute("SELECT COALESCE(SUM(partidas), 0) FROM resumen").fetchone()[0]
+        fila = self.conexion.execute(
+            "SELECT partidas FROM resumen WHERE modo = ?", (validar_modo(modo),)).fetchone()
+        return fila[0] if fila else 0
+
+    def resumen(self, modo=MODO_NORMAL):
+        """
+        Agregados de un modo de juego, mantenidos de forma incremental, sin recorrer el historial.
+
+        Parámetros:
+        - modo (str): Modo de juego (uno de MODOS).
+
+        Retorna:
+        - dict: {"partidas", "mejor", "promedio"}.
+        """
+        fila = self.conexion.execute(
+            "SELECT partidas, suma, mejor FROM resumen WHERE modo = ?", (validar_modo(modo),)).fetchone()
+        partidas, suma, mejor = fila or (0, 0, None)
+        return {
+            "partidas": partidas,
+            "mejor": mejor,
+            "promedio": suma / partidas if partidas else 0.0,
+        }
+
+    def por_dia(self, dias=None, modo=MODO_NORMAL):
+        """
+        Parámetros:
+        - dias (int): Limitar a los últimos N días con partidas (opcional).
+        - modo (str): Modo de juego (uno de MODOS).
+
+        Retorna:
+        - list: Tuplas (dia, partidas) del modo ordenadas por día.
+        """
+        validar_modo(modo)
+        if dias is None:
+            return self.conexion.execute(
+                "SELECT dia, partidas FROM por_dia WHERE modo = ? ORDER BY dia", (modo,)).fetchall()
+        filas = self.conexion.execute(
+            "SELECT dia, partidas FROM por_dia WHERE modo = ? ORDER BY dia DESC LIMIT ?",
+            (modo, dias)).fetchall()
+        return filas[::-1]
+
+    def cerrar(self):
+        """Cierra la conexión con la base de datos."""
+        self.conexion.close()
+
+
+_almacen = None
+
+
+def almacen():
+    """
+    Retorna el almacén compartido, abriéndolo la primera vez que se usa.
+
+    Retorna:
+    - AlmacenPuntajes: Almacén en 'data/puntajes.db'.
+    """
+    global _almacen
+    if _almacen is None:
+        _almacen = AlmacenPuntajes()
+    return _almacen
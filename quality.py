@@ -0,0 +1,131 @@
+"""
+Calidad gráfica adaptativa.
+
+QualityGovernor lleva un promedio móvil del tiempo de trabajo de cada frame
+(lógica + dibujo, sin la espera del reloj ni del vsync). Si el promedio supera
+el presupuesto del frame baja un nivel de calidad; si queda holgura durante un
+buen rato, sube uno. Los umbrales de bajada y subida son distintos y tras cada
+cambio se espera a llenar de nuevo la ventana de medición (histéresis), así que
+la calidad no oscila entre dos niveles.
+
+Niveles, de mayor a menor calidad:
+
+    alta     todo: fondo con imagen, HUD redondeado, texto al instante, parpadeo
+    media    sin efectos cosméticos (parpadeo de inmunidad)
+    baja     además, HUD de rectángulos planos y texto del HUD a 4 Hz
+    mínima   además, fondo de color plano y texto del HUD a 2 Hz
+"""
+from collections import namedtuple
+
+# effects: efectos cosméticos; simple_hud: marco del HUD sin bordes redondeados;
+# hud_interval: frames mínimos entre redibujos del texto del HUD por cambios de estado;
+# background: imagen de fondo (False = color plano)
+QualityTier = namedtuple("QualityTier", "name effects simple_hud hud_interval background")
+
+TIERS = (
+    QualityTier("alta", True, False, 1, True),
+    QualityTier("media", False, False, 1, True),
+    QualityTier("baja", False, True, 15, True),
+    QualityTier("mínima", False, True, 30, False),
+)
+TIER_NAMES = tuple(tier.name for tier in TIERS)
+
+# Color del fondo plano del nivel "mínima"
+FLAT_BACKGROUND = (24, 18, 40)
+
+
+class QualityGovernor:
+    """
+    Elige el nivel de calidad a partir del tiempo medido de los frames.
+    Con adaptive=False se queda fijo en el nivel inicial.
+    """
+    def __init__(self, tier=0, adaptive=True, window=60, down=1.0, up=0.6, hold=180):
+        """
+        Parámetros:
+        - tier (int): Nivel inicial (índice en TIERS, 0 = máxima calidad).
+        - adaptive (bool): Si es False, el nivel no cambia.
+        - window (int): Frames del promedio móvil.
+        - down (float): Fracción del presupuesto por encima de la cual se baja un nivel.
+        - up (float): Fracción del presupuesto por debajo de la cual se puede subir un nivel.
+        - hold (int): Frames seguidos por debajo de `up` necesarios para subir.
+        """
+        self.tier = tier
+        self.adaptive = adaptive
+        self.window = window
+        self.down = down
+        self.up = up
+        self.hold = hold
+        self.changes = 0
+        self._samples = [0.0] * window
+        self._index = 0
+        self._filled = 0
+        self._total = 0.0
+        self._headroom = 0
+
+    @property
+    def settings(self):
+        """QualityTier del nivel actual."""
+        return TIERS[self.tier]
+
+    @property
+    def name(self):
+        """Nombre del nivel actual."""
+        return TIERS[self.tier].name
+
+    def average(self):
+        """
+        Retorna:
+        - float: Promedio móvil en segundos (0 si aún no hay frames).
+        """
+        return self._total / self._filled if self._filled else 0.0
+
+    def set_tier(self, tier):
+        """
+        Fija el nivel y reinicia la medición (el promedio anterior correspondía a otro nivel).
+
+        Parámetros:
+        - tier (int): Índice en TIERS.
+        """
+        tier = max(0, min(len(TIERS) - 1, tier))
+        if tier != self.tier:
+            self.tier = tier
+            self.changes += 1
+        self._samples[:] = [0.0] * self.window
+        self._index = self._filled = self._headroom = 0
+        self._total = 0.0
+
+    def observe(self, seconds, budget):
+        """
+        Registra el tiempo de trabajo de un frame y ajusta el nivel si hace falta.
+
+        Parámetros:
+        - seconds (float): Tiempo de lógica + dibujo del frame.
+        - budget (float): Presupuesto del frame en segundos (1 / FPS objetivo).
+
+        Retorna:
+        - bool: True si el nivel cambió en este frame.
+        """
+        if not self.adaptive:
+            return False
+        i = self._index
+        self._total += seconds - self._samples[i]
+        self._samples[i] = seconds
+        self._index = (i + 1) % self.window
+        if self._filled < self.window:
+            self._filled += 1
+            if self._filled < self.window:
+                return False
+        average = self._total / self.window
+        if average > budget * self.down:
+            if self.tier < len(TIERS) - 1:
+                self.set_tier(self.tier + 1)
+                return True
+            return False
+        if average < budget * self.up and self.tier > 0:
+            self._headroom += 1
+            if self._headroom >= self.hold:
+                self.set_tier(self.tier - 1)
+                return True
+        else:
+            self._headroom = 0
+        return False
@@ -2,10 +2,22 @@ import pygame
 import sys
 import random
 import time
-import os
-from datetime import datetime
-
-pygame.init()
+from collections import deque
+from asset_cache import assets
+from text import Text
+from spatial_hash import SpatialHash, swap_remove, append_slotted
+from dirty_render import DirtyRenderer
+from entity_pool import EntityPool, gc_paused
+from quality import QualityGovernor, FLAT_BACKGROUND
+from particles import (ParticleSystem, EFFECTS, FX_STAR, FX_SHIELD_BREAK, FX_HIT, FX_SLOW,
+                       HAVE_NUMPY as HAVE_PARTICLES)
+from collision import COLLISION_AABB, COLLISION_CIRCLE, COLLISION_MASK, circles_overlap, masks_overlap
+from telemetry import (EV_STAR, EV_HIT, EV_SHIELD_USED, EV_SHIELD_GAINED, EV_SLOW, EV_LEVEL_END,
+                       LEVEL_RESULTS)
+from profiler import (FrameProfiler, P_EVENTS, P_INPUT, P_PLAYER_MOVE, P_OBSTACLES,
+                      P_COLLISIONS, P_DRAW, P_DRAW_INFO, P_FLIP, P_WAIT)
+import puntajes
+import leaderboard
 
 WIDTH, HEIGHT = 800, 600
 UI_HEIGHT = 120
@@ -16,35 +28,216 @@ RED = (200, 0, 0)
 BLUE = (0, 0, 255)
 YELLOW = (255, 255, 0)
 PURPLE = (128, 0, 128)
+GRAY = (150, 150, 150)
 
-screen = pygame.display.set_mode((WIDTH, HEIGHT))
-pygame.display.set_caption("Recolector Mutante 2.0")
 font_path = "./assets/Audiowide-Regular.ttf"
-font = pygame.font.Font(font_path, 28)
-
 
 BACKGROUND_PATH = "./assets/background.png"
-background = pygame.image.load(BACKGROUND_PATH)
-background = pygame.transform.scale(background, (WIDTH, HEIGHT))
+COLLECTOR_PATH = "./assets/collector.png"
+STAR_PATH = "./assets/start.png"
+OBSTACLE_PATH = "./assets/obstacle.png"
+HEART_PATH = "./assets/heart.png"
+POWER_UP_PATHS = {"shield": "./assets/shield.png", "slow": "./assets/slow.png"}
 
 MUSIC_PATH = "./assets/song.mp3"
-pygame.mixer.music.load(MUSIC_PATH)
-pygame.mixer.music.set_volume(0.5)
-pygame.mixer.music.play(-1)
 
-def guardar_puntaje(puntos):
+# Sprites del juego con el tamaño al que se dibujan, para precargarlos
+SPRITES = [
+    (BACKGROUND_PATH, (WIDTH, HEIGHT), False),
+    (COLLECTOR_PATH, (50, 50), True),
+    (STAR_PATH, (30, 30), True),
+    (OBSTACLE_PATH, (40, 40), True),
+    (HEART_PATH, (30, 30), True),
+    (POWER_UP_PATHS["shield"], (30, 30), True),
+    (POWER_UP_PATHS["slow"], (30, 30), True),
+]
+
+# Sprites (ruta, tamaño) que chocan, con la máscara que usa el modo de colisión "mask"
+COLLIDERS = [
+    (COLLECTOR_PATH, (50, 50)),
+    (STAR_PATH, (30, 30)),
+    (OBSTACLE_PATH, (40, 40)),
+    (POWER_UP_PATHS["shield"], (30, 30)),
+    (POWER_UP_PATHS["slow"], (30, 30)),
+]
+
+# Fuentes (ruta, tamaño, color) de la barra de información, para pre-renderizar sus caracteres
+HUD_GLYPHS = [
+    (font_path, 28, WHITE),
+    (font_path, 28, RED),
+    (font_path, 16, GRAY),
+]
+
+# Bits de entrada por tick (flechas del teclado)
+KEY_LEFT = 1
+KEY_RIGHT = 2
+KEY_UP = 4
+KEY_DOWN = 8
+
+# Ticks de simulación por segundo de juego
+TICK_RATE = 60
+# Tiempo real máximo que se simula por frame; tras una pausa larga (arrastrar la
+# ventana, un tirón del disco) el juego no intenta recuperar todo de golpe
+MAX_FRAME_TIME = 0.25
+
+# Resultados de Game.step
+LEVEL_CLEARED = "cleared"
+LEVEL_TIMEOUT = "timeout"
+PLAYER_DEAD = "dead"
+
+# Modo infinito: cada etapa dura level_time_limit segundos y termina subiendo la
+# dificultad. Los obstáculos viven OBSTACLE_TTL segundos y las estrellas STAR_TTL,
+# y se van reemplazando de a poco en lugar de regenerar todo.
+OBSTACLE_TTL = 10
+STAR_TTL = 12
+ENDLESS_STARS = 6
+# En cada etapa los obstáculos crecen 1/ENDLESS_GROWTH; la velocidad sube cada ENDLESS_SPEED_EVERY etapas
+ENDLESS_GROWTH = 4
+ENDLESS_SPEED_EVERY = 3
+# Distancia mínima al jugador a la que entra un obstáculo nuevo
+SPAWN_CLEARANCE = 60
+
+# Zona de la barra de información; el texto de aviso puede sobresalir un poco
+HUD_RECT = pygame.Rect(0, 0, WIDTH, UI_HEIGHT + 10)
+# Área de juego, debajo de la barra de información
+PLAY_AREA = pygame.Rect(0, UI_HEIGHT, WIDTH, HEIGHT - UI_HEIGHT)
+
+# Se crean en init_display(); la simulación no los necesita
+screen = None
+font = None          # Texto blanco del HUD y de los avisos (ver text.py)
+warning_font = None  # Texto rojo del aviso de controles invertidos
+small_font = None    # Texto pequeño del HUD (nivel de calidad)
+background = None
+# Límite de FPS del dibujo cuando Game.fps es None: 0 si el vsync quedó confirmado
+# (el propio vsync limita), si no la frecuencia de la pantalla o TICK_RATE (ver open_window())
+display_fps = TICK_RATE
+
+
+def open_window(size):
+    """
+    Abre la ventana pidiendo vsync. Pygame 2 solo lo aplica junto con SCALED u
+    OPENGL y, si no puede, lo ignora sin avisar; por eso solo se dibuja sin
+    límite cuando pygame confirma el vsync, y si no se deja un límite de FPS real.
+
+    Parámetros:
+    - size (tuple): Tamaño de la ventana.
+
+    Retorna:
+    - pygame.Surface: La pantalla.
+    """
+    global display_fps
+    try:
+        surface = pygame.display.set_mode(size, pygame.SCALED, vsync=1)
+    except pygame.error:
+        surface = pygame.display.set_mode(size)
+        vsync = False
+    else:
+        is_vsync = getattr(pygame.display, "is_vsync", None)
+        vsync = is_vsync is not None and is_vsync()
+    refresh_rate = getattr(pygame.display, "get_current_refresh_rate", None)
+    refresh = refresh_rate() if refresh_rate is not None else 0
+    display_fps = 0 if vsync else (refresh or TICK_RATE)
+    return surface
+
+
+def init_display():
+    """
+    Inicializa la ventana, la fuente y el fondo.
+    Solo se necesita para jugar con gráficos; la simulación funciona sin llamarla.
+    Si otra parte del programa ya creó la ventana, se reutiliza.
+    """
+    global screen, font, warning_font, small_font, background
+    if screen is not None:
+        return
+    pygame.display.init()
+    pygame.font.init()
+    screen = pygame.display.get_surface()
+    if screen is None:
+        screen = open_window((WIDTH, HEIGHT))
+    pygame.display.set_caption("Recolector Mutante 2.0")
+    font = Text(font_path, 28, WHITE)
+    warning_font = Text(font_path, 28, RED)
+    small_font = Text(font_path, 16, GRAY)
+    background = assets.image(BACKGROUND_PATH, (WIDTH, HEIGHT), alpha=False)
+
+
+def start_music():
+    """
+    Inicia la música de fondo en bucle si hay archivo y dispositivo de audio.
+    Si ya está sonando (por ejemplo, al volver a jugar), no la reinicia.
+    """
+    try:
+        if not pygame.mixer.get_init():
+            pygame.mixer.init()
+        if pygame.mixer.music.get_busy():
+            return
+        pygame.mixer.music.load(MUSIC_PATH)
+        pygame.mixer.music.set_volume(0.5)
+        pygame.mixer.music.play(-1)
+    except pygame.error:
+        pass  # Sin archivo de música o sin dispositivo de audio
+
+
+class TickClock:
+    """
+    Reloj simulado: el tiempo solo avanza cuando se llama a advance().
+    Cada tick equivale a 1/TICK_RATE segundos de juego, así que la partida no
+    depende del reloj real y se puede reproducir exactamente.
+    """
+    def __init__(self, tick_rate=TICK_RATE):
+        """
+        Parámetros:
+        - tick_rate (int): Ticks por segundo de juego simulado.
+        """
+        self.dt = 1.0 / tick_rate
+        self.ticks = 0
+
+    def reset(self):
+        """Vuelve el reloj a cero para una partida nueva."""
+        self.ticks = 0
+
+    def __call__(self):
+        """Retorna el tiempo simulado actual en segundos."""
+        return self.ticks * self.dt
+
+    def advance(self):
+        """Avanza el reloj un tick."""
+        self.ticks += 1
+
+
+def keys_to_mask(keys):
+    """
+    Convierte el estado del teclado de pygame en la máscara de bits de entrada.
+
+    Parámetros:
+    - keys: Resultado de pygame.key.get_pressed().
+
+    Retorna:
+    - int: Combinación de KEY_LEFT, KEY_RIGHT, KEY_UP y KEY_DOWN.
+    """
+    mask = 0
+    if keys[pygame.K_LEFT]: mask |= KEY_LEFT
+    if keys[pygame.K_RIGHT]: mask |= KEY_RIGHT
+    if keys[pygame.K_UP]: mask |= KEY_UP
+    if keys[pygame.K_DOWN]: mask |= KEY_DOWN
+    return mask
+
+def guardar_puntaje(puntos, nombre=None, modo=puntajes.MODO_NORMAL):
     """
-    Guarda el puntaje obtenido en el archivo 'puntajes.txt', junto con la fecha y hora actual.
+    Guarda el puntaje obtenido en el almacén de puntajes, junto con la fecha y hora actual.
 
     Parámetros:
     - puntos (int): Puntuación obtenida por el jugador.
+    - nombre (str): Nombre del jugador (opcional).
+    - modo (str): Modo de juego de la partida (uno de puntajes.MODOS).
+
+    Si el juego está conectado a una tabla en línea, el puntaje también se
+    encola para enviarlo en segundo plano.
     """
-    ruta = os.path.join("data", "puntajes.txt")
-    if not os.path.exists("data"):
-        os.makedirs("data")
-    fecha = datetime.now().strftime("%Y-%m-%d %H:%M")
-    with open(ruta, "a") as f:
-        f.write(f"{puntos} pts - {fecha}\n")
+    puntajes.almacen().guardar(puntos, nombre, modo=modo)
+    remoto = leaderboard.cliente()
+    if remoto is not None:
+        remoto.submit(puntos, nombre, modo=modo)
 
 class Player:
     """
@@ -53,29 +246,50 @@ class Player:
     """
     def __init__(self):
         self.size = 50
+        self.reset()
+
+    def reset(self):
+        """Devuelve al jugador al estado de inicio de partida."""
         self.pos = [WIDTH // 2, (HEIGHT + UI_HEIGHT) // 2]
+        # Posición al inicio del último tick, para interpolar al dibujar
+        self.prev_pos = list(self.pos)
         self.lives = 3
         self.has_shield = False
-        self.image = pygame.image.load("./assets/collector.png")
-        self.image = pygame.transform.scale(self.image, (self.size, self.size))
 
-    def draw(self, immune=False):
+    @property
+    def image(self):
+        """Imagen del recolector, compartida desde la caché de recursos."""
+        return assets.image(COLLECTOR_PATH, (self.size, self.size))
+
+    @property
+    def mask(self):
+        """Máscara de colisión del recolector, compartida desde la caché de recursos."""
+        return assets.mask(COLLECTOR_PATH, (self.size, self.size))
+
+    def draw(self, immune=False, alpha=1.0):
         """
         Dibuja al jugador en pantalla, con efecto de parpadeo si es inmune y con borde si tiene escudo.
 
         Parámetros:
         - immune (bool): Indica si el jugador está en estado de inmunidad (parpadea si es True).
+        - alpha (float): Fracción del tick transcurrida (0-1) para interpolar la posición.
+
+        Retorna:
+        - pygame.Rect o None: Zona dibujada, o None si no se dibujó por el parpadeo.
         """
         if immune:
             # Parpadea solo si ha pasado un número impar de décimas de segundo
             ticks = pygame.time.get_ticks() // 100
             if ticks % 2 == 0:
-                return  # No dibuja este frame → efecto parpadeo
+                return None  # No dibuja este frame → efecto parpadeo
 
-        screen.blit(self.image, self.pos)
+        (px, py), (qx, qy) = self.prev_pos, self.pos
+        pos = (px + (qx - px) * alpha, py + (qy - py) * alpha)
+        rect = screen.blit(self.image, pos)
 
         if self.has_shield:
-            pygame.draw.rect(screen, YELLOW, (*self.pos, self.size, self.size), 3)
+            pygame.draw.rect(screen, YELLOW, (*pos, self.size, self.size), 3)
+        return rect
 
 
     def move(self, dx, dy):
@@ -86,71 +300,124 @@ class Player:
         - dx (int): Desplazamiento en el eje X.
         - dy (int): Desplazamiento en el eje Y.
         """
-
+        self.prev_pos[0], self.prev_pos[1] = self.pos
         self.pos[0] = max(0, min(WIDTH - self.size, self.pos[0] + dx))
         self.pos[1] = max(UI_HEIGHT, min(HEIGHT - self.size, self.pos[1] + dy))
 
 class Star:
     """
     Representa una estrella que el jugador puede recolectar para obtener puntos.
+    Las instancias se reutilizan desde un EntityPool (ver reset()).
     """
+    __slots__ = ("size", "x", "y", "spawn_time", "slot")
 
-    def __init__(self):
+    def __init__(self, spawn_time=None, rng=random):
         """
         Inicializa una estrella con posición aleatoria y registra su tiempo de aparición.
-        Carga la imagen correspondiente.
+
+        Parámetros:
+        - spawn_time (float): Momento de aparición según el reloj del juego (por defecto: time.time()).
+        - rng: Generador aleatorio a usar (por defecto: el módulo random).
         """
+        self.slot = -1
+        self.reset(spawn_time, rng)
+
+    def reset(self, spawn_time=None, rng=random):
+        """Reinicia la estrella como si se acabara de crear (mismos parámetros que el constructor)."""
         self.size = 30
-        self.x = random.randint(0, WIDTH - self.size)
-        self.y = random.randint(UI_HEIGHT, HEIGHT - self.size)
-        self.spawn_time = time.time()
-        self.image = pygame.image.load("./assets/start.png")
-        self.image = pygame.transform.scale(self.image, (self.size, self.size))
+        self.x = rng.randint(0, WIDTH - self.size)
+        self.y = rng.randint(UI_HEIGHT, HEIGHT - self.size)
+        self.spawn_time = time.time() if spawn_time is None else spawn_time
+
+    @property
+    def image(self):
+        """Imagen de la estrella, compartida desde la caché de recursos."""
+        return assets.image(STAR_PATH, (self.size, self.size))
+
+    @property
+    def mask(self):
+        """Máscara de colisión de la estrella, compartida desde la caché de recursos."""
+        return assets.mask(STAR_PATH, (self.size, self.size))
 
     def draw(self):
-        """Dibuja la estrella en pantalla."""
-        screen.blit(self.image, (self.x, self.y))
+        """Dibuja la estrella en pantalla y retorna el rectángulo dibujado."""
+        return screen.blit(self.image, (self.x, self.y))
 
 class PowerUp:
     """
     Representa un potenciador que puede otorgar un escudo o ralentizar los obstáculos.
+    Las instancias se reutilizan desde un EntityPool (ver reset()).
     """
-    def __init__(self):
+    __slots__ = ("size", "x", "y", "kind", "slot")
+
+    def __init__(self, rng=random):
         """
         Inicializa un PowerUp con tipo aleatorio ('shield' o 'slow') y posición aleatoria.
-        Carga la imagen correspondiente.
+
+        Parámetros:
+        - rng: Generador aleatorio a usar (por defecto: el módulo random).
         """
+        self.slot = -1
+        self.reset(rng)
+
+    def reset(self, rng=random):
+        """Reinicia el PowerUp como si se acabara de crear (mismos parámetros que el constructor)."""
         self.size = 30
-        self.x = random.randint(0, WIDTH - self.size)
-        self.y = random.randint(UI_HEIGHT, HEIGHT - self.size)
-        self.kind = random.choice(["shield", "slow"])
-        filename = "shield.png" if self.kind == "shield" else "slow.png"
-        self.image = pygame.image.load(f"./assets/{filename}")
-        self.image = pygame.transform.scale(self.image, (self.size, self.size))
+        self.x = rng.randint(0, WIDTH - self.size)
+        self.y = rng.randint(UI_HEIGHT, HEIGHT - self.size)
+        self.kind = rng.choice(["shield", "slow"])
+
+    @property
+    def image(self):
+        """Imagen según el tipo de PowerUp, compartida desde la caché de recursos."""
+        return assets.image(POWER_UP_PATHS[self.kind], (self.size, self.size))
 
+    @property
+    def mask(self):
+        """Máscara de colisión según el tipo de PowerUp, compartida desde la caché de recursos."""
+        return assets.mask(POWER_UP_PATHS[self.kind], (self.size, self.size))
 
     def draw(self):
-        """Dibuja el PowerUp en pantalla."""
-        screen.blit(self.image, (self.x, self.y))
+        """Dibuja el PowerUp en pantalla y retorna el rectángulo dibujado."""
+        return screen.blit(self.image, (self.x, self.y))
 
 class Obstacle:
     """
     Representa un obstáculo móvil que el jugador debe evitar.
+    Las instancias se reutilizan desde un EntityPool (ver reset()).
     """
-    def __init__(self, speed):
+    __slots__ = ("size", "x", "y", "dx", "dy", "prev_x", "prev_y", "slot")
+
+    def __init__(self, speed, rng=random):
         """
         Inicializa el obstáculo con una velocidad y dirección aleatoria.
 
         Parámetros:
         - speed (int): Velocidad del obstáculo.
+        - rng: Generador aleatorio a usar (por defecto: el módulo random).
         """
+        self.slot = -1
+        self.reset(speed, rng)
+
+    def reset(self, speed, rng=random):
+        """Reinicia el obstáculo como si se acabara de crear (mismos parámetros que el constructor)."""
         self.size = 40
-        self.x = random.randint(0, WIDTH - self.size)
-        self.y = random.randint(UI_HEIGHT, HEIGHT - self.size)
-        self.dx = random.choice([-1, 1]) * speed
-        self.dy = random.choice([-1, 1]) * speed
-        self.image = pygame.image.load("./assets/obstacle.png")
-        self.image = pygame.transform.scale(self.image, (self.size, self.size))
+        self.x = rng.randint(0, WIDTH - self.size)
+        self.y = rng.randint(UI_HEIGHT, HEIGHT - self.size)
+        self.dx = rng.choice([-1, 1]) * speed
+        self.dy = rng.choice([-1, 1]) * speed
+        self.prev_x = self.x
+        self.prev_y = self.y
+
+    @property
+    def image(self):
+        """Imagen del obstáculo, compartida desde la caché de recursos."""
+        return assets.image(OBSTACLE_PATH, (self.size, self.size))
+
+    @property
+    def mask(self):
+        """Máscara de colisión del obstáculo, compartida desde la caché de recursos."""
+        return assets.mask(OBSTACLE_PATH, (self.size, self.size))
 
     def move(self, speed_mod):
         """
@@ -159,6 +426,8 @@ class Obstacle:
         Parámetros:
         - speed_mod (float): Modificador de velocidad (por ejemplo, para ralentizar).
         """
+        self.prev_x = self.x
+        self.prev_y = self.y
         self.x += self.dx * speed_mod
         self.y += self.dy * speed_mod
         if self.x <= 0 or self.x >= WIDTH - self.size:
@@ -166,23 +435,112 @@ class Obstacle:
         if self.y <= UI_HEIGHT or self.y >= HEIGHT - self.size:
             self.dy *= -1
 
-    def draw(self):
-        """Dibuja el obstáculo en pantalla."""
-        screen.blit(self.image, (self.x, self.y))
+    def draw(self, alpha=1.0):
+        """
+        Dibuja el obstáculo en pantalla y retorna el rectángulo dibujado.
+
+        Parámetros:
+        - alpha (float): Fracción del tick transcurrida (0-1) para interpolar la posición.
+        """
+        x = self.prev_x + (self.x - self.prev_x) * alpha
+        y = self.prev_y + (self.y - self.prev_y) * alpha
+        return screen.blit(self.image, (x, y))
 
 class Game:
     """
     Controlador principal del juego. Maneja la lógica del flujo del juego,
     niveles, eventos, colisiones y renderizado.
+    La lógica de cada tick vive en step(), que no dibuja ni lee el teclado,
+    por lo que puede ejecutarse sin ventana ni mezclador de audio.
     """
-    def __init__(self):
+    def __init__(self, clock=None, seed=None):
         """
         Inicializa el juego: jugador, listas de objetos, reglas, nivel y puntaje.
+
+        Parámetros:
+        - clock (callable): Función que devuelve el tiempo de juego en segundos
+          (por defecto: un TickClock que avanza un tick por cada step()).
+        - seed (int): Semilla del generador aleatorio (por defecto: una al azar).
         """
+        self.clock = clock if clock is not None else TickClock()
+        self._advance_clock = getattr(self.clock, "advance", None)
+        # Fuente de entrada opcional (callable que recibe el juego); None = teclado
+        self.input_source = None
+        # Límite de FPS del dibujo (None = el de la ventana, ver display_fps; 0 = sin límite);
+        # la lógica siempre va a TICK_RATE
+        self.fps = None
+        # False = un tick por frame, sin importar el tiempo real (avance rápido de repeticiones)
+        self.fixed_timestep = True
+        self.save_score = True
+        # Perfilador de frames (ver profiler.py); main_loop crea uno si no hay
+        self.profiler = None
+        # Grabador opcional de telemetría por tick (ver telemetry.py)
+        self.telemetry = None
+        # Partículas de efectos (ver particles.py); main_loop crea un sistema si hay NumPy
+        self.particles = None
         self.player = Player()
+        self.rng = random.Random()
         self.stars = []
         self.power_ups = []
         self.obstacles = []
+        # Instancias descartadas listas para reutilizar (ver entity_pool.py)
+        self.star_pool = EntityPool(Star)
+        self.power_up_pool = EntityPool(PowerUp)
+        self.obstacle_pool = EntityPool(Obstacle)
+        # Detener el recolector cíclico durante cada nivel y recolectar entre niveles
+        self.pause_gc = True
+        # Prueba fina de colisión: "aabb", "circle" o "mask" (ver collision.py)
+        self.collision_mode = COLLISION_AABB
+        # Modo infinito: una sola etapa tras otra hasta perder todas las vidas
+        self.endless = False
+        # Obstáculos por orden de vencimiento (vencimiento, obstáculo), para el modo infinito
+        self._obstacle_expiry = deque()
+        # Rejillas de broadphase por tipo de entidad
+        self.star_grid = SpatialHash()
+        self.power_up_grid = SpatialHash()
+        self.obstacle_grid = SpatialHash()
+        self.score_to_advance = 5
+        self.max_levels = 5
+        self.level_time_limit = 30
+        self.immunity_duration = 3
+        self.dirty_rendering = True
+        # Nivel de calidad gráfica según el tiempo medido de los frames (ver quality.py)
+        self.quality = QualityGovernor()
+        self._static_layer = None
+        self._static_layer_key = None
+        # Frames desde el último redibujo del texto del HUD
+        self._hud_age = 0
+        # Obstáculos que muestra el HUD del modo infinito y segundo en que se contaron
+        self._hud_obstacles = (None, 0)
+        self.reset(seed)
+
+    def reset(self, seed=None):
+        """
+        Prepara una partida nueva sobre el mismo objeto: jugador, reglas, nivel,
+        puntaje y temporizadores vuelven al inicio y las entidades regresan a sus
+        pools. Se conservan la configuración, los pools, las rejillas, la capa
+        estática y el perfilador, así que volver a jugar no crea ni carga nada.
+
+        Parámetros:
+        - seed (int): Semilla de la nueva partida (por defecto: una al azar).
+        """
+        reset_clock = getattr(self.clock, "reset", None)
+        if reset_clock is not None:
+            reset_clock()
+        self.seed = seed if seed is not None else random.randrange(2 ** 63)
+        self.rng.seed(self.seed)
+        # Grabador opcional de la entrada de cada tick (ver replay.py); es de una sola partida
+        self.recorder = None
+        if self.particles is not None:
+            self.particles.clear()
+        self.player.reset()
+        self.star_pool.release_all(self.stars)
+        self.star_grid.clear()
+        self.power_up_pool.release_all(self.power_ups)
+        self.power_up_grid.clear()
+        self.obstacle_pool.release_all(self.obstacles)
+        self.obstacle_grid.clear()
+        self._obstacle_expiry.clear()
         self.rules = {
             "player_speed": 5,
             "obstacle_speed": 3,
@@ -191,29 +549,235 @@ class Game:
         }
         self.level = 1
         self.score = 0
-        self.score_to_advance = 5
-        self.max_levels = 5
-        self.level_time_limit = 30
         self.start_time = 0
         self.slow_obstacles = False
         self.slow_timer = 0
         self.immunity_start_time = 0
-        self.immunity_duration = 3
+        self._hud_state = None
 
     def spawn_star(self):
         """Agrega una nueva estrella al juego."""
-        self.stars.append(Star())
+        star = self.star_pool.acquire(self.clock(), self.rng)
+        append_slotted(self.stars, star)
+        self.star_grid.insert(star, star.x, star.y, star.size, star.size)
 
     def spawn_power_up(self):
         """Agrega aleatoriamente un PowerUp al juego con probabilidad del 30%."""
-        if random.random() < 0.3:
-            self.power_ups.append(PowerUp())
+        if self.rng.random() < 0.3:
+            pu = self.power_up_pool.acquire(self.rng)
+            append_slotted(self.power_ups, pu)
+            self.power_up_grid.insert(pu, pu.x, pu.y, pu.size, pu.size)
 
     def spawn_obstacles(self):
-        """Genera una nueva lista de obstáculos según las reglas del nivel actual."""
-        self.obstacles.clear()
-        for _ in range(self.rules["num_obstacles"]):
-            self.obstacles.append(Obstacle(self.rules["obstacle_speed"]))
+        """
+        Genera una nueva lista de obstáculos según las reglas del nivel actual.
+        Sus vencimientos (solo cuentan en el modo infinito) se reparten a lo largo
+        de OBSTACLE_TTL para que después se renueven de a pocos.
+        """
+        self.obstacle_pool.release_all(self.obstacles)
+        self.obstacle_grid.clear()
+        self._obstacle_expiry.clear()
+        count = self.rules["num_obstacles"]
+        now = self.clock()
+        for i in range(count):
+            self.spawn_obstacle(now + OBSTACLE_TTL * (i + 1) / count)
+
+    def spawn_obstacle(self, expires, from_edge=False):
+        """
+        Agrega un obstáculo.
+
+        Parámetros:
+        - expires (float): Momento en que se retira (solo en el modo infinito).
+        - from_edge (bool): Si es True, entra por un costado en lugar de aparecer en medio.
+        """
+        obs = self.obstacle_pool.acquire(self.rules["obstacle_speed"], self.rng)
+        if from_edge:
+            obs.x, obs.dx = self.entry_point(obs.y, obs.size, obs.dx)
+            obs.prev_x = obs.x
+        append_slotted(self.obstacles, obs)
+        self.obstacle_grid.insert(obs, obs.x, obs.y, obs.size, obs.size)
+        self._obstacle_expiry.append((expires, obs))
+
+    def entry_point(self, y, size, dx):
+        """
+        Elige el costado por el que entra un obstáculo nuevo: el opuesto a su
+        dirección horizontal, o el otro si el jugador está cerca de ese punto.
+
+        Parámetros:
+        - y (float): Posición vertical del obstáculo.
+        - size (int): Lado del obstáculo.
+        - dx (float): Velocidad horizontal sorteada.
+
+        Retorna:
+        - tuple: (x, dx) con los que entra.
+        """
+        x = 0 if dx > 0 else WIDTH - size
+        px, py = self.player.pos
+        reach = self.player.size + SPAWN_CLEARANCE
+        if (x < px + reach and x + size > px - SPAWN_CLEARANCE
+                and y < py + reach and y + size > py - SPAWN_CLEARANCE):
+            x, dx = WIDTH - size - x, -dx
+        return x, dx
+
+    def despawn_expired(self, now):
+        """
+        Retira los obstáculos vencidos (modo infinito). Como todos viven lo
+        mismo, los vencidos siempre están al principio de la cola.
+
+        Parámetros:
+        - now (float): Tiempo de juego actual.
+        """
+        expiry = self._obstacle_expiry
+        while expiry and expiry[0][0] <= now:
+            obs = expiry.popleft()[1]
+            swap_remove(self.obstacles, obs)
+            self.obstacle_grid.remove(obs)
+            self.obstacle_pool.release(obs)
+
+    def expire_stars(self, now):
+        """
+        Retira las estrellas que llevan STAR_TTL segundos sin recogerse (modo infinito).
+
+        Parámetros:
+        - now (float): Tiempo de juego actual.
+        """
+        for star in [star for star in self.stars if now - star.spawn_time >= STAR_TTL]:
+            swap_remove(self.stars, star)
+            self.star_grid.remove(star)
+            self.star_pool.release(star)
+
+    def stream_entities(self, now):
+        """
+        Modo infinito: avanza de etapa si se cumplió su tiempo, retira lo vencido
+        y repone obstáculos y estrellas. Los obstáculos nuevos se limitan por
+        tick (hasta cuatro veces el ritmo de reemplazo) para que una etapa que
+        agrega cientos no cree un pico en un solo frame.
+
+        Parámetros:
+        - now (float): Tiempo de juego actual.
+        """
+        if now - self.start_time >= self.level_time_limit:
+            self.start_time = now
+            self.level += 1
+            self.mutate_rules()
+            self.spawn_power_up()
+        self.despawn_expired(now)
+        target = self.rules["num_obstacles"]
+        missing = target - self.obstacle_count()
+        if missing > 0:
+            budget = 1 + 4 * target // (OBSTACLE_TTL * TICK_RATE)
+            for _ in range(min(missing, budget)):
+                self.spawn_obstacle(now + OBSTACLE_TTL, from_edge=True)
+        self.expire_stars(now)
+        if self.remaining_stars() < ENDLESS_STARS:
+            self.spawn_star()
+
+    def move_obstacles(self):
+        """Mueve todos los obstáculos y actualiza su posición en la rejilla."""
+        speed_mod = 0.5 if self.slow_obstacles else 1
+        grid = self.obstacle_grid
+        for obs in self.obstacles:
+            obs.move(speed_mod)
+            grid.update(obs, obs.x, obs.y, obs.size, obs.size)
+
+    def obstacle_count(self):
+        """
+        Retorna:
+        - int: Obstáculos en juego.
+        """
+        return len(self.obstacles)
+
+    def obstacle_contacts(self):
+        """
+        Busca las parejas de obstáculos que se tocan entre sí.
+
+        Retorna:
+        - list: Tuplas (Obstacle, Obstacle) que se superponen.
+        """
+        return self.obstacle_grid.pairs()
+
+    def obstacle_positions(self):
+        """
+        Retorna:
+        - tuple: (posiciones x, posiciones y) de los obstáculos, para la telemetría.
+        """
+        obstacles = self.obstacles
+        return [obs.x for obs in obstacles], [obs.y for obs in obstacles]
+
+    def remaining_stars(self):
+        """
+        Retorna:
+        - int: Número de estrellas que quedan por recolectar en el nivel.
+        """
+        return len(self.stars)
+
+    def blinking(self):
+        """
+        Indica si el jugador debe parpadear: es inmune y la calidad actual
+        permite efectos cosméticos.
+
+        Retorna:
+        - bool
+        """
+        return self.quality.settings.effects and self.is_immune()
+
+    def is_immune(self):
+        """
+        Indica si el jugador sigue en su periodo de inmunidad.
+
+        Retorna:
+        - bool: True si aún no termina la inmunidad.
+        """
+        return (self.clock() - self.immunity_start_time) < self.immunity_duration
+
+    def time_left(self):
+        """
+        Retorna:
+        - int: Segundos enteros que quedan del nivel.
+        """
+        return max(0, int(self.level_time_limit - (self.clock() - self.start_time)))
+
+    def hud_obstacles(self):
+        """
+        Obstáculos en juego que muestra el HUD del modo infinito. Se cuentan una
+        vez por segundo, junto con el tiempo restante: como entran y se retiran
+        casi en cada tick, el conteo exacto obligaría a redibujar el texto en cada frame.
+
+        Retorna:
+        - int: Obstáculos contados al empezar el segundo actual.
+        """
+        second, count = self._hud_obstacles
+        left = self.time_left()
+        if left != second:
+            count = self.obstacle_count()
+            self._hud_obstacles = (left, count)
+        return count
+
+    def hud_state(self):
+        """
+        Resume lo que muestra la barra de información; si no cambia, no hace falta redibujarla.
+
+        Retorna:
+        - tuple: (nivel, puntaje, tiempo restante, vidas, controles invertidos, nivel de calidad
+          y, en el modo infinito, obstáculos en juego según hud_obstacles()).
+        """
+        return (self.level, self.score, self.time_left(), self.player.lives,
+                self.rules["invert_controls"], self.quality.tier,
+                self.hud_obstacles() if self.endless else 0)
+
+    def draw_info_frame(self, surface):
+        """
+        Dibuja el fondo redondeado de la barra de información.
+
+        Parámetros:
+        - surface (pygame.Surface): Superficie destino (pantalla o capa estática).
+        """
+        info_bg_rect = pygame.Rect(10, 10, WIDTH - 20, UI_HEIGHT - 20)
+        if self.quality.settings.simple_hud:
+            surface.fill((20, 20, 20), info_bg_rect)
+            return
+        pygame.draw.rect(surface, (20, 20, 20), info_bg_rect, border_radius=15)
+        pygame.draw.rect(surface, (80, 80, 80), info_bg_rect, 2, border_radius=15)
 
     def draw_info(self):
         """
@@ -221,33 +785,32 @@ class Game:
         vidas del jugador y si los controles están invertidos.
         """
         # Fondo redondeado para la barra de información
-        info_bg_rect = pygame.Rect(10, 10, WIDTH - 20, UI_HEIGHT - 20)
-        pygame.draw.rect(screen, (20, 20, 20), info_bg_rect, border_radius=15)
-        pygame.draw.rect(screen, (80, 80, 80), info_bg_rect, 2, border_radius=15)
+        self.draw_info_frame(screen)
+        self.draw_info_contents()
 
+    def draw_info_contents(self):
+        """Dibuja los corazones y los textos de la barra de información."""
         # Mostrar corazones como vidas
-        heart_img = pygame.image.load("./assets/heart.png")
-        heart_img = pygame.transform.scale(heart_img, (30, 30))
+        heart_img = assets.image(HEART_PATH, (30, 30))
         for i in range(self.player.lives):
             screen.blit(heart_img, (WIDTH - 40 * (i + 1), 20))
 
-        # Texto estilizado
-        nivel_text = font.render(f"Nivel: {self.level}", True, WHITE)
-        puntos_text = font.render(f"Puntos: {self.score}", True, WHITE)
-        objetivo_text = font.render(f"Objetivo: {self.level * self.score_to_advance}", True, WHITE)
-        tiempo_restante = max(0, int(self.level_time_limit - (time.time() - self.start_time)))
-        tiempo_text = font.render(f"Tiempo: {tiempo_restante}s", True, WHITE)
-
-        # Posicionar textos
-        screen.blit(nivel_text, (30, 20))
-        screen.blit(puntos_text, (30, 55))
-        screen.blit(objetivo_text, (250, 20))
-        screen.blit(tiempo_text, (250, 55))
+        # Texto estilizado: las etiquetas salen de la caché y solo se componen los números nuevos
+        font.draw(screen, (30, 20), "Nivel: ", str(self.level))
+        font.draw(screen, (30, 55), "Puntos: ", str(self.score))
+        if self.endless:
+            font.draw(screen, (250, 20), "Obstáculos: ", str(self.hud_obstacles()))
+        else:
+            font.draw(screen, (250, 20), "Objetivo: ", str(self.level * self.score_to_advance))
+        font.draw(screen, (250, 55), "Tiempo: ", str(self.time_left()), "s")
 
         # Aviso si controles invertidos
         if self.rules["invert_controls"]:
-            inv_text = font.render("Controles invertidos ACTIVOS", True, RED)
-            screen.blit(inv_text, (30, 90))
+            warning_font.draw(screen, (30, 90), "Controles invertidos ACTIVOS")
+
+        # Nivel de calidad gráfica actual
+        quality_text = small_font.render(f"Calidad: {self.quality.name}")
+        screen.blit(quality_text, quality_text.get_rect(topright=(WIDTH - 30, 80)))
 
 
     def check_collisions(self):
@@ -260,131 +823,517 @@ class Game:
         """
 
         px, py = self.player.pos
-        now = time.time()
+        size = self.player.size
+        now = self.clock()
         immune = now - self.immunity_start_time < self.immunity_duration
-
-        for star in self.stars[:]:
-            if (px < star.x + star.size and px + self.player.size > star.x and
-                py < star.y + star.size and py + self.player.size > star.y):
-                self.stars.remove(star)
-                elapsed = time.time() - star.spawn_time
-                self.score += 3 if elapsed <= 5 else 1
-
-        for obs in self.obstacles:
-            if (px < obs.x + obs.size and px + self.player.size > obs.x and
-                py < obs.y + obs.size and py + self.player.size > obs.y):
-                if immune:
-                    continue
+        telemetry = self.telemetry
+
+        # La rejilla solo devuelve entidades cuyo rectángulo toca al jugador;
+        # la prueba fina del modo de colisión se hace solo sobre esas
+        for star in self.narrow_phase(self.star_grid.query(px, py, size, size)):
+            swap_remove(self.stars, star)
+            self.star_grid.remove(star)
+            elapsed = now - star.spawn_time
+            points = 3 if elapsed <= 5 else 1
+            self.score += points
+            if telemetry is not None:
+                telemetry.event(EV_STAR, star.x, star.y, points, elapsed)
+            self.emit_effect(FX_STAR, star.x + star.size / 2, star.y + star.size / 2)
+            self.star_pool.release(star)
+
+        if not immune:
+            for obs in self.narrow_phase(self.obstacle_grid.query(px, py, size, size)):
                 if self.player.has_shield:
                     self.player.has_shield = False
+                    if telemetry is not None:
+                        telemetry.event(EV_SHIELD_USED, obs.x, obs.y)
+                    self.emit_effect(FX_SHIELD_BREAK, px + size / 2, py + size / 2)
                 else:
                     self.player.lives -= 1
                     self.immunity_start_time = now  # ← Corrección aquí
-
-        for pu in self.power_ups[:]:
-            if (px < pu.x + pu.size and px + self.player.size > pu.x and
-                py < pu.y + pu.size and py + self.player.size > pu.y):
-                self.power_ups.remove(pu)
-                if pu.kind == "shield":
-                    self.player.has_shield = True           
-                elif pu.kind == "slow":
-                    self.slow_obstacles = True
-                    self.slow_timer = time.time()
+                    if telemetry is not None:
+                        telemetry.event(EV_HIT, obs.x, obs.y, self.player.lives)
+                    self.emit_effect(FX_HIT, px + size / 2, py + size / 2)
+
+        for pu in self.narrow_phase(self.power_up_grid.query(px, py, size, size)):
+            swap_remove(self.power_ups, pu)
+            self.power_up_grid.remove(pu)
+            if pu.kind == "shield":
+                self.player.has_shield = True
+                if telemetry is not None:
+                    telemetry.event(EV_SHIELD_GAINED, pu.x, pu.y)
+            elif pu.kind == "slow":
+                self.slow_obstacles = True
+                self.slow_timer = now
+                if telemetry is not None:
+                    telemetry.event(EV_SLOW, pu.x, pu.y)
+                self.emit_effect(FX_SLOW, pu.x + pu.size / 2, pu.y + pu.size / 2)
+            # Se devuelve al pool al final: desde ahí puede reutilizarse y cambiar sus campos
+            self.power_up_pool.release(pu)
         return False
 
+    def emit_effect(self, effect, x, y):
+        """
+        Lanza una ráfaga de partículas si hay sistema de partículas y la calidad
+        actual permite efectos cosméticos. No cambia el estado de la partida.
+
+        Parámetros:
+        - effect (str): Nombre del efecto (FX_STAR, FX_SHIELD_BREAK, FX_HIT o FX_SLOW).
+        - x, y (float): Centro de la ráfaga.
+        """
+        particles = self.particles
+        if particles is not None and self.quality.settings.effects:
+            particles.burst(EFFECTS[effect], x, y)
+
+    def narrow_phase(self, candidates):
+        """
+        Filtra las entidades que el broadphase encontró tocando el rectángulo
+        del jugador, según el modo de colisión.
+
+        Parámetros:
+        - candidates (list): Entidades cuyo rectángulo se superpone con el del jugador.
+
+        Retorna:
+        - list: Las que colisionan con el jugador.
+        """
+        mode = self.collision_mode
+        if mode == COLLISION_AABB or not candidates:
+            return candidates
+        px, py = self.player.pos
+        size = self.player.size
+        if mode == COLLISION_CIRCLE:
+            return [e for e in candidates if circles_overlap(px, py, size, e.x, e.y, e.size)]
+        player_mask = self.player.mask
+        return [e for e in candidates if masks_overlap(player_mask, px, py, e.mask, e.x, e.y)]
+
     def mutate_rules(self):
         """
         Realiza una mutación aleatoria en las reglas del juego:
         aumenta velocidad, número de obstáculos o invierte controles.
         """
-        mutation = random.choice(list(self.rules.keys()))
+        mutation = self.rng.choice(list(self.rules.keys()))
         if mutation == "invert_controls":
             self.rules[mutation] = not self.rules[mutation]
         else:
             self.rules[mutation] += 1
+        if self.endless:
+            # En el modo infinito la dificultad no deja de crecer
+            self.rules["num_obstacles"] += max(1, self.rules["num_obstacles"] // ENDLESS_GROWTH)
+            if self.level % ENDLESS_SPEED_EVERY == 0:
+                self.rules["obstacle_speed"] += 1
 
-    def run_level(self):
+    def start_level(self):
         """
-        Ejecuta un nivel completo del juego.
-
-        Retorna:
-        - bool: True si se completó el nivel, False si se pierde una vida o termina el juego.
+        Prepara un nivel: reubica al jugador, genera estrellas, obstáculos
+        y PowerUps, y reinicia los temporizadores del nivel.
         """
-        clock = pygame.time.Clock()
         self.player.pos = [WIDTH // 2, (HEIGHT + UI_HEIGHT) // 2]
-        self.stars.clear()
-        self.power_ups.clear()
+        self.player.prev_pos = list(self.player.pos)
+        self.star_pool.release_all(self.stars)
+        self.star_grid.clear()
+        self.power_up_pool.release_all(self.power_ups)
+        self.power_up_grid.clear()
         self.spawn_obstacles()
         for _ in range(self.level * self.score_to_advance):
             self.spawn_star()
         self.spawn_power_up()
-        self.start_time = time.time()
-        self.immunity_start_time = time.time()
+        if self.collision_mode == COLLISION_MASK:
+            self.prepare_masks()
+        self.start_time = self.clock()
+        self.immunity_start_time = self.clock()
+        self._hud_obstacles = (None, 0)
 
-        while True:
-            screen.blit(background, (0, 0))
-            pygame.draw.rect(screen, BLACK, (0, 0, WIDTH, UI_HEIGHT))
+    def prepare_masks(self):
+        """
+        Crea de antemano las máscaras de colisión de todos los sprites que chocan,
+        para que su costo quede al preparar el nivel y no en el primer choque.
+        Las siguientes veces salen de la caché de recursos.
+        """
+        for path, size in COLLIDERS:
+            assets.mask(path, size)
 
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    pygame.quit()
-                    sys.exit()
-
-            keys = pygame.key.get_pressed()
-            dx = dy = 0
-            if keys[pygame.K_LEFT]: dx -= self.rules["player_speed"]
-            if keys[pygame.K_RIGHT]: dx += self.rules["player_speed"]
-            if keys[pygame.K_UP]: dy -= self.rules["player_speed"]
-            if keys[pygame.K_DOWN]: dy += self.rules["player_speed"]
-            if self.rules["invert_controls"]:
-                dx, dy = -dx, -dy
-
-            self.player.move(dx, dy)
-            for obs in self.obstacles:
-                obs.move(0.5 if self.slow_obstacles else 1)
-
-            self.check_collisions()
-
-            if time.time() - self.start_time > self.level_time_limit:
-                self.player.lives -= 1
-                if self.player.lives <= 0:
-                    return False
-                else:
-                    return True
+    def step(self, input_mask):
+        """
+        Avanza la simulación un tick sin dibujar nada y luego avanza el reloj
+        del juego (si es un reloj simulado).
+
+        Parámetros:
+        - input_mask (int): Teclas presionadas (combinación de KEY_LEFT, KEY_RIGHT, KEY_UP, KEY_DOWN).
+
+        Retorna:
+        - str o None: LEVEL_CLEARED, LEVEL_TIMEOUT o PLAYER_DEAD si el nivel terminó, None si continúa.
+        """
+        if self.recorder is not None:
+            self.recorder.record(input_mask)
+        result = self.update(input_mask)
+        telemetry = self.telemetry
+        if telemetry is not None:
+            if result is not None:
+                px, py = self.player.pos
+                telemetry.event(EV_LEVEL_END, px, py, LEVEL_RESULTS.index(result),
+                                self.clock() - self.start_time)
+            telemetry.tick(self)
+        if self._advance_clock is not None:
+            self._advance_clock()
+        return result
+
+    def update(self, input_mask):
+        """
+        Lógica de un tick: movimiento, colisiones y fin de nivel.
+
+        Parámetros:
+        - input_mask (int): Teclas presionadas en este tick.
+
+        Retorna:
+        - str o None: Igual que step().
+        """
+        speed = self.rules["player_speed"]
+        dx = dy = 0
+        if input_mask & KEY_LEFT: dx -= speed
+        if input_mask & KEY_RIGHT: dx += speed
+        if input_mask & KEY_UP: dy -= speed
+        if input_mask & KEY_DOWN: dy += speed
+        if self.rules["invert_controls"]:
+            dx, dy = -dx, -dy
+
+        prof = self.profiler
+        self.player.move(dx, dy)
+        if prof is not None:
+            prof.mark(P_PLAYER_MOVE)
+        self.move_obstacles()
+        if prof is not None:
+            prof.mark(P_OBSTACLES)
+
+        self.check_collisions()
+        if prof is not None:
+            prof.mark(P_COLLISIONS)
+
+        now = self.clock()
+        if self.endless:
+            self.stream_entities(now)
+        elif now - self.start_time > self.level_time_limit:
+            self.player.lives -= 1
+            return LEVEL_TIMEOUT
+
+        if self.slow_obstacles and (now - self.slow_timer > 5):
+            self.slow_obstacles = False
+
+        if not self.endless and not self.remaining_stars():
+            return LEVEL_CLEARED
+        if self.player.lives <= 0:
+            return PLAYER_DEAD
+        return None
+
+    def end_level(self, completed):
+        """
+        Aplica el resultado de un nivel: si se completó, muta las reglas y sube de nivel.
+
+        Parámetros:
+        - completed (bool): Resultado devuelto por run_level.
+        """
+        if completed:
+            self.mutate_rules()
+            self.level += 1
+
+    def is_over(self):
+        """
+        Indica si la partida terminó (sin vidas o sin niveles restantes; en el
+        modo infinito, solo sin vidas).
+
+        Retorna:
+        - bool: True si ya no quedan niveles por jugar.
+        """
+        if self.endless:
+            return self.player.lives <= 0
+        return not (self.level <= self.max_levels and self.player.lives > 0)
+
+    def draw_entities(self, alpha=1.0):
+        """
+        Dibuja al jugador, las estrellas, los PowerUps y los obstáculos.
 
-            if self.slow_obstacles and (time.time() - self.slow_timer > 5):
-                self.slow_obstacles = False
+        Parámetros:
+        - alpha (float): Fracción del tick transcurrida (0-1) para interpolar las posiciones.
+
+        Retorna:
+        - list: Rectángulos de pantalla modificados.
+        """
+        rects = []
+        player_rect = self.player.draw(self.blinking(), alpha)
+        if player_rect is not None:
+            rects.append(player_rect)
+        for star in self.stars:
+            rects.append(star.draw())
+        for pu in self.power_ups:
+            rects.append(pu.draw())
+        for obs in self.obstacles:
+            rects.append(obs.draw(alpha))
+        return rects
+
+    def draw_particles(self):
+        """
+        Dibuja las partículas sobre el área de juego (si la calidad lo permite).
+
+        Retorna:
+        - pygame.Rect o None: Zona que abarcan, o None si no se dibujó nada.
+        """
+        if self.particles is None or not self.quality.settings.effects:
+            return None
+        return self.particles.draw(screen, PLAY_AREA)
+
+    def entities_touch(self, rect):
+        """
+        Indica si alguna entidad ocupa parte de la zona dada.
+
+        Parámetros:
+        - rect (pygame.Rect): Zona a comprobar.
+
+        Retorna:
+        - bool: True si el jugador o alguna entidad se superpone con la zona.
+        """
+        px, py = self.player.pos
+        size = self.player.size
+        if rect.colliderect((px, py, size, size)):
+            return True
+        area = (rect.x, rect.y, rect.w, rect.h)
+        return bool(self.star_grid.query(*area) or self.power_up_grid.query(*area)
+                    or self.obstacle_grid.query(*area))
+
+    def draw_background(self, surface):
+        """
+        Dibuja el fondo del área de juego (imagen o color plano, según la calidad)
+        y la franja negra del HUD.
+
+        Parámetros:
+        - surface (pygame.Surface): Superficie destino (pantalla o capa estática).
+        """
+        if self.quality.settings.background:
+            surface.blit(background, (0, 0))
+        else:
+            surface.fill(FLAT_BACKGROUND)
+        pygame.draw.rect(surface, BLACK, (0, 0, WIDTH, UI_HEIGHT))
+
+    def static_layer(self):
+        """
+        Capa estática precompuesta: fondo, franja negra y marco del HUD.
+        Se crea en el formato de la pantalla y solo se rehace si el nivel de
+        calidad cambia el fondo o el marco.
+
+        Retorna:
+        - pygame.Surface: Superficie del tamaño de la pantalla.
+        """
+        settings = self.quality.settings
+        key = (settings.background, settings.simple_hud)
+        if self._static_layer is None or self._static_layer_key != key:
+            layer = pygame.Surface((WIDTH, HEIGHT)).convert()
+            self.draw_background(layer)
+            self.draw_info_frame(layer)
+            self._static_layer = layer
+            self._static_layer_key = key
+        return self._static_layer
+
+    def draw_dirty(self, renderer, alpha=1.0):
+        """
+        Dibuja el frame actualizando solo las zonas que cambiaron.
+
+        Parámetros:
+        - renderer (DirtyRenderer): Renderizador con la capa estática del nivel.
+        - alpha (float): Fracción del tick transcurrida (0-1) para interpolar las posiciones.
+        """
+        if renderer.static_layer is not self.static_layer():
+            # Cambió el nivel de calidad: nueva capa estática y redibujo completo
+            renderer.static_layer = self.static_layer()
+            renderer.reset()
+            self._hud_state = None
+        renderer.restore()
+        state = self.hud_state()
+        self._hud_age += 1
+        # Si un sprite pasa por debajo del texto del HUD hay que repintar el texto encima.
+        # Las posiciones dibujadas quedan hasta un tick por detrás de las de la lógica.
+        # Los cambios de estado esperan hud_interval frames (salvo el primero del nivel).
+        reach = max(self.rules["player_speed"], self.rules["obstacle_speed"])
+        state_changed = state != self._hud_state and (
+            self._hud_state is None or self._hud_age >= self.quality.settings.hud_interval)
+        redraw_hud = (state_changed or renderer.touches(HUD_RECT)
+                      or self.entities_touch(HUD_RECT.inflate(0, 2 * reach)))
+        if redraw_hud:
+            renderer.restore(HUD_RECT)
+        renderer.add_all(self.draw_entities(alpha))
+        renderer.add(self.draw_particles())
+        prof = self.profiler
+        if prof is not None:
+            prof.mark(P_DRAW)
+        if redraw_hud:
+            self.draw_info_contents()
+            renderer.add_overlay(HUD_RECT)
+            self._hud_state = state
+            self._hud_age = 0
+        if prof is not None:
+            prof.mark(P_DRAW_INFO)
+        overlay = self.draw_profiler()
+        if overlay is not None:
+            renderer.add(overlay)
+        renderer.present()
+        if prof is not None:
+            prof.mark(P_FLIP)
+
+    def draw(self, alpha=1.0):
+        """
+        Dibuja el fondo, las entidades y la interfaz del frame actual.
 
-            immune = (time.time() - self.immunity_start_time) < self.immunity_duration
-            self.player.draw(immune)
-            for star in self.stars:
-                star.draw()
-            for pu in self.power_ups:
-                pu.draw()
-            for obs in self.obstacles:
-                obs.draw()
-            self.draw_info()
+        Parámetros:
+        - alpha (float): Fracción del tick transcurrida (0-1) para interpolar las posiciones.
+        """
+        self.draw_background(screen)
+        self.draw_entities(alpha)
+        self.draw_particles()
+        prof = self.profiler
+        if prof is not None:
+            prof.mark(P_DRAW)
+        self.draw_info()
+        if prof is not None:
+            prof.mark(P_DRAW_INFO)
+        self.draw_profiler()
+
+    def draw_profiler(self):
+        """
+        Dibuja el panel del perfilador si está visible (se alterna con F3).
+
+        Retorna:
+        - pygame.Rect o None: Zona del panel, o None si no se dibujó.
+        """
+        if self.profiler is None or not self.profiler.overlay:
+            return None
+        rect = self.profiler.draw_overlay(screen)
+        self.profiler.skip()
+        return rect
+
+    def read_input(self):
+        """
+        Lee la entrada del tick: de la fuente configurada o, si no hay, del teclado.
+
+        Retorna:
+        - int: Máscara de teclas presionadas.
+        """
+        if self.input_source is not None:
+            return self.input_source(self)
+        return keys_to_mask(pygame.key.get_pressed())
+
+    def make_renderer(self):
+        """
+        Crea el renderizador de rectángulos sucios del nivel, o None si está desactivado.
+
+        Retorna:
+        - DirtyRenderer o None
+        """
+        if not self.dirty_rendering:
+            return None
+        renderer = DirtyRenderer(screen, self.static_layer())
+        renderer.reset()
+        self._hud_state = None
+        return renderer
+
+    def run_frame(self, renderer, clock, steps=1, alpha=1.0):
+        """
+        Ejecuta un frame completo: eventos, entrada y lógica de los ticks pendientes,
+        dibujo y espera del reloj.
 
+        Parámetros:
+        - renderer (DirtyRenderer): Renderizador del nivel (None para redibujar todo).
+        - clock (pygame.time.Clock): Reloj que limita los FPS (ver self.fps).
+        - steps (int): Ticks de lógica a simular en este frame (puede ser 0).
+        - alpha (float): Fracción del siguiente tick ya transcurrida, para interpolar el dibujo.
+
+        Retorna:
+        - str o None: Resultado del último step(); None si el nivel sigue o no hubo ticks.
+        """
+        frame_start = time.perf_counter()
+        prof = self.profiler
+        if prof is not None:
+            prof.begin_frame()
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                # Cerrar la ventana termina el programa a mitad del nivel: la grabación
+                # y la telemetría se cierran antes para no perder su último bloque
+                self.close_outputs()
+                if self.telemetry is not None:
+                    self.telemetry.close()
+                pygame.quit()
+                sys.exit()
+            if event.type == pygame.KEYDOWN and event.key == pygame.K_F3 and prof is not None:
+                prof.toggle_overlay()
+        if prof is not None:
+            prof.mark(P_EVENTS)
+
+        result = None
+        for _ in range(steps):
+            input_mask = self.read_input()
+            if prof is not None:
+                prof.mark(P_INPUT)
+            result = self.step(input_mask)
+            if result is not None:
+                # El nivel terminó: el frame muestra el estado final sin interpolar
+                alpha = 1.0
+                break
+        if result == LEVEL_TIMEOUT:
+            if prof is not None:
+                prof.end_frame(self.level)
+            return result
+        if self.particles is not None:
+            # Las partículas avanzan con el tiempo de juego simulado en este frame
+            self.particles.update(steps / TICK_RATE)
+
+        if renderer is not None:
+            self.draw_dirty(renderer, alpha)
+        else:
+            self.draw(alpha)
             pygame.display.flip()
-            clock.tick(60)
+            if prof is not None:
+                prof.mark(P_FLIP)
+        # La calidad se ajusta con el trabajo del frame, sin contar la espera del reloj, contra
+        # el presupuesto fijo de la lógica: con o sin vsync, y a cualquier frecuencia de pantalla
+        self.quality.observe(time.perf_counter() - frame_start, 1.0 / TICK_RATE)
+        clock.tick(display_fps if self.fps is None else self.fps)
+        if prof is not None:
+            prof.mark(P_WAIT)
+            prof.end_frame(self.level)
+        return result
+
+    def run_level(self):
+        """
+        Ejecuta un nivel completo del juego con paso de tiempo fijo: el reloj real
+        se lee una vez por frame, el tiempo acumulado se consume en ticks de
+        1/TICK_RATE segundos y el dibujo interpola entre los dos últimos ticks.
+        Así la velocidad del juego no depende de los FPS que se logren.
 
-            if not self.stars:
+        Retorna:
+        - bool: True si se completó el nivel, False si se pierde una vida o termina el juego.
+        """
+        clock = pygame.time.Clock()
+        self.start_level()
+        renderer = self.make_renderer()
+        dt = getattr(self.clock, "dt", 1.0 / TICK_RATE)
+        accumulator = 0.0
+        previous = time.perf_counter()
+
+        while True:
+            if self.fixed_timestep:
+                now = time.perf_counter()
+                accumulator += min(now - previous, MAX_FRAME_TIME)
+                previous = now
+                steps = int(accumulator / dt)
+                accumulator -= steps * dt
+                result = self.run_frame(renderer, clock, steps, accumulator / dt)
+            else:
+                result = self.run_frame(renderer, clock)
+            if result == LEVEL_TIMEOUT:
+                return self.player.lives > 0
+
+            if result == LEVEL_CLEARED:
                 return True
 
-            if self.player.lives <= 0:
+            if result == PLAYER_DEAD:
                 # Mostrar pantalla de colisión antes de terminar
-                screen.blit(background, (0, 0))
-                pygame.draw.rect(screen, BLACK, (0, 0, WIDTH, UI_HEIGHT))
-                immune = (time.time() - self.immunity_start_time) < self.immunity_duration
-                self.player.draw(immune)
-
-                for obs in self.obstacles:
-                    obs.draw()
-                for star in self.stars:
-                    star.draw()
-                for pu in self.power_ups:
-                    pu.draw()
-                self.draw_info()
+                self.draw()
                 pygame.display.flip()
                 pygame.time.delay(1000)  # Espera 1 segundo para mostrar que perdió la vida
                 return False
@@ -394,11 +1343,18 @@ class Game:
         """
         Bucle principal del juego. Maneja la presentación inicial,
         la ejecución de niveles y el final del juego.
-        Guarda el puntaje final al terminar.
+        Guarda el puntaje final al terminar. No cierra pygame, así que la
+        ventana sigue disponible para el menú o para otra partida (ver Game.reset()).
         """
+        init_display()
+        start_music()
+        if self.profiler is None:
+            self.profiler = FrameProfiler()
+        if self.particles is None and HAVE_PARTICLES:
+            self.particles = ParticleSystem()
         screen.blit(background, (0, 0))
         pygame.draw.rect(screen, BLACK, (0, 0, WIDTH, UI_HEIGHT))
-        sub_text = font.render("Prepárate para recolectar... ¡y sobrevivir!", True, WHITE)
+        sub_text = font.render("Prepárate para recolectar... ¡y sobrevivir!")
         sub_rect = sub_text.get_rect(center=(WIDTH // 2, HEIGHT // 2 + 10))
         screen.blit(sub_text, sub_rect)
         pygame.display.flip()
@@ -407,26 +1363,40 @@ class Game:
         for i in range(3, 0, -1):
             screen.blit(background, (0, 0))
             pygame.draw.rect(screen, BLACK, (0, 0, WIDTH, UI_HEIGHT))
-            count_text = font.render(f"Empieza en... {i}", True, WHITE)
+            count_text = font.render(f"Empieza en... {i}")
             screen.blit(count_text, (WIDTH // 2 - 100, HEIGHT // 2))
             pygame.display.flip()
             pygame.time.delay(1000)
 
-        while self.level <= self.max_levels and self.player.lives > 0:
-            if self.run_level():
-                self.mutate_rules()
-                self.level += 1
+        while not self.is_over():
+            # La recolección se hace aquí, entre niveles, y no a mitad de un frame
+            with gc_paused(self.pause_gc):
+                completed = self.run_level()
+            self.end_level(completed)
 
         screen.blit(background, (0, 0))
         pygame.draw.rect(screen, BLACK, (0, 0, WIDTH, UI_HEIGHT))
-        msg = font.render("\u00a1Juego Terminado!", True, WHITE)
+        msg = font.render("\u00a1Juego Terminado!")
         screen.blit(msg, (WIDTH // 2 - 150, HEIGHT // 2))
         pygame.display.flip()
         pygame.time.delay(3000)
 
-        guardar_puntaje(self.score)
+        if self.save_score:
+            guardar_puntaje(self.score, modo=puntajes.MODO_INFINITO if self.endless
+                            else puntajes.MODO_NORMAL)
+        self.close_outputs()
 
-        pygame.quit()
+    def close_outputs(self):
+        """
+        Cierra lo que la partida escribe en disco: la grabación de la entrada (con
+        el pie del estado final) y el volcado del perfilador. La telemetría no se
+        cierra aquí porque la comparten todas las partidas de la sesión.
+        """
+        if self.recorder is not None:
+            self.recorder.close(self)
+        if self.profiler is not None:
+            self.profiler.dump()
 
 if __name__ == "__main__":
     Game().main_loop()
+    pygame.quit()
@@ -0,0 +1,243 @@
+"""
+Grabación y reproducción determinista de partidas.
+
+Como el juego usa un generador aleatorio con semilla y un reloj simulado por
+ticks, basta con guardar la semilla y la máscara de teclas de cada tick para
+volver a simular la partida exactamente igual. El archivo es binario y compacto:
+
+    cabecera   b"RMRP", versión (u8), banderas (u8), ticks por segundo (u16), semilla (u64)
+               (bits 0-1 de las banderas: índice del modo de colisión en COLLISION_MODES;
+               bit 2: modo infinito)
+    cuerpo     tramos (máscara u8, repeticiones en varint LEB128)
+    pie        0xFF, ticks totales (u32), puntaje (i32), vidas (i32), nivel (i32)
+
+Uso:
+    python replay.py partida.rmr             # sin gráficos, a máxima velocidad
+    python replay.py partida.rmr --render    # con gráficos, a velocidad real
+    python replay.py partida.rmr --render --uncapped
+"""
+import argparse
+import struct
+import time
+
+from collision import COLLISION_AABB, COLLISION_MODES
+
+MAGIC = b"RMRP"
+VERSION = 1
+HEADER = struct.Struct("<4sBBHQ")
+FOOTER = struct.Struct("<Iiii")
+END_MARKER = 0xFF
+FLAG_COLLISION = 0x03
+FLAG_ENDLESS = 0x04
+
+
+def _write_varint(out, value):
+    """Agrega un entero sin signo en formato varint LEB128."""
+    while value >= 0x80:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def _read_varint(data, pos):
+    """
+    Lee un varint LEB128.
+
+    Retorna:
+    - tuple: (valor, nueva posición).
+    """
+    value = shift = 0
+    while True:
+        byte = data[pos]
+        pos += 1
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return value, pos
+        shift += 7
+
+
+class InputRecorder:
+    """
+    Graba la máscara de entrada de cada tick comprimida por tramos (RLE):
+    mantener una tecla presionada muchos ticks ocupa solo un par de bytes.
+    """
+    def __init__(self, path, seed, tick_rate, collision_mode=COLLISION_AABB, endless=False):
+        """
+        Parámetros:
+        - path (str): Archivo de salida.
+        - seed (int): Semilla de la partida.
+        - tick_rate (int): Ticks por segundo del reloj simulado.
+        - collision_mode (str): Modo de colisión de la partida (cambia el resultado de cada tick).
+        - endless (bool): Si la partida es del modo infinito.
+        """
+        flags = COLLISION_MODES.index(collision_mode) | (FLAG_ENDLESS if endless else 0)
+        self.file = open(path, "wb")
+        self.file.write(HEADER.pack(MAGIC, VERSION, flags, tick_rate, seed))
+        self.ticks = 0
+        self._mask = None
+        self._count = 0
+        self._buffer = bytearray()
+
+    @classmethod
+    def for_game(cls, path, game):
+        """Crea un grabador con la semilla, la frecuencia de ticks, el modo de colisión y el modo infinito de un juego."""
+        tick_rate = round(1 / game.clock.dt) if hasattr(game.clock, "dt") else 60
+        return cls(path, game.seed, tick_rate, game.collision_mode, game.endless)
+
+    def record(self, mask):
+        """
+        Registra la entrada de un tick.
+
+        Parámetros:
+        - mask (int): Máscara de teclas (0-15).
+        """
+        self.ticks += 1
+        if mask == self._mask:
+            self._count += 1
+            return
+        self._flush_run()
+        self._mask = mask
+        self._count = 1
+
+    def _flush_run(self):
+        if self._count:
+            self._buffer.append(self._mask)
+            _write_varint(self._buffer, self._count)
+            if len(self._buffer) >= 4096:
+                self.file.write(self._buffer)
+                self._buffer.clear()
+
+    def close(self, game=None):
+        """
+        Escribe el último tramo y el pie con el estado final para verificar la reproducción.
+
+        Parámetros:
+        - game (Game): Juego terminado (opcional; sin él el pie queda en ceros).
+        """
+        if self.file.closed:
+            return
+        self._flush_run()
+        self._count = 0
+        self._buffer.append(END_MARKER)
+        score, lives, level = (game.score, game.player.lives, game.level) if game else (0, 0, 0)
+        self._buffer += FOOTER.pack(self.ticks, score, lives, level)
+        self.file.write(self._buffer)
+        self._buffer.clear()
+        self.file.close()
+
+
+class InputReplay:
+    """
+    Fuente de entrada que devuelve, tick a tick, las máscaras de una grabación.
+    Se usa como Game.input_source o con headless.run_game_headless.
+    """
+    def __init__(self, path):
+        """
+        Parámetros:
+        - path (str): Archivo de grabación.
+        """
+        with open(path, "rb") as f:
+            data = f.read()
+        magic, version, flags, self.tick_rate, self.seed = HEADER.unpack_from(data, 0)
+        if magic != MAGIC or version != VERSION or (flags & FLAG_COLLISION) >= len(COLLISION_MODES):
+            raise ValueError(f"{path} no es una grabación válida del Recolector Mutante")
+        self.collision_mode = COLLISION_MODES[flags & FLAG_COLLISION]
+        self.endless = bool(flags & FLAG_ENDLESS)
+        self._data = data
+        self._pos = HEADER.size
+        self._mask = 0
+        self._left = 0
+        self.footer = None
+        self.exhausted = False
+        self.ticks = 0
+
+    def __call__(self, game=None):
+        """
+        Retorna:
+        - int: Máscara del siguiente tick (0 si la grabación ya terminó).
+        """
+        if self._left == 0:
+            if not self._next_run():
+                self.exhausted = True
+                return 0
+        self._left -= 1
+        self.ticks += 1
+        return self._mask
+
+    def _next_run(self):
+        data = self._data
+        if self._pos >= len(data) or data[self._pos] == END_MARKER:
+            if self.footer is None and self._pos < len(data):
+                self.footer = FOOTER.unpack_from(data, self._pos + 1)
+            return False
+        self._mask = data[self._pos]
+        self._left, self._pos = _read_varint(data, self._pos + 1)
+        return True
+
+    def make_game(self, game_factory=None):
+        """
+        Crea un juego con la misma semilla, reloj, modo de colisión y modo
+        infinito que la partida grabada, con esta grabación como fuente de entrada.
+
+        Parámetros:
+        - game_factory (callable): Clase de juego (por defecto: Game).
+
+        Retorna:
+        - Game: Juego listo para reproducir.
+        """
+        from recolector_mutante_v2 import Game, TickClock
+        game = (game_factory or Game)(clock=TickClock(self.tick_rate), seed=self.seed)
+        game.input_source = self
+        game.collision_mode = self.collision_mode
+        game.endless = self.endless
+        game.save_score = False
+        return game
+
+    def verify(self, game):
+        """
+        Compara el estado final de la reproducción con el grabado en el pie.
+
+        Parámetros:
+        - game (Game): Juego reproducido.
+
+        Retorna:
+        - bool: True si coinciden ticks, puntaje, vidas y nivel.
+        """
+        if self.footer is None:
+            # Avanzar hasta el pie si la partida terminó antes de leer el marcador
+            while self._next_run():
+                self._left = 0
+        if self.footer is None:
+            return False
+        return self.footer == (self.ticks, game.score, game.player.lives, game.level)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Reproduce una partida grabada")
+    parser.add_argument("archivo", help="Grabación (.rmr) hecha con main.py --record")
+    parser.add_argument("--render", action="store_true", help="Mostrar la partida en pantalla")
+    parser.add_argument("--uncapped", action="store_true", help="Con --render, un tick por frame a máxima velocidad")
+    args = parser.parse_args()
+
+    replay = InputReplay(args.archivo)
+    game = replay.make_game()
+    start = time.perf_counter()
+    if args.render:
+        if args.uncapped:
+            game.fixed_timestep = False
+            game.fps = 0
+        game.main_loop()
+    else:
+        from headless import run_game_headless
+        run_game_headless(replay, game=game)
+    elapsed = time.perf_counter() - start
+
+    ok = replay.verify(game)
+    print(f"Semilla {replay.seed}: nivel {game.level}, {game.score} pts, "
+          f"{game.player.lives} vidas, {replay.ticks} ticks en {elapsed:.2f}s")
+    print("Reproducción idéntica a la grabación" if ok else
+          f"La reproducción NO coincide con la grabación (esperado {replay.footer})")
+
+
+if __name__ == "__main__":
+    main()
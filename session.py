@@ -0,0 +1,144 @@
+"""
+Sesión del juego: lo que vive mientras el programa está abierto.
+
+La ventana, el mezclador de audio, las fuentes y la caché de recursos se crean
+una sola vez. Session.play() ejecuta una partida tras otra sobre el mismo
+objeto Game (reiniciado en su lugar con Game.reset()) y regresa al menú, sin
+volver a inicializar pygame, abrir la ventana ni decodificar imágenes. El modo
+infinito, que llega a miles de obstáculos, usa el motor de arreglos
+(ArrayGame) si NumPy está instalado.
+"""
+import time
+
+import pygame
+
+import recolector_mutante_v2 as rm
+from asset_bundle import AssetBundle, BUNDLE_PATH
+from asset_cache import assets
+from entity_arrays import ArrayGame, HAVE_NUMPY
+from quality import QualityGovernor
+from replay import InputRecorder
+from startup import trace
+
+
+class Session:
+    """
+    Dueña de la ventana, el audio, las fuentes, la caché de recursos y el
+    juego reutilizable. Se abre una vez con open() y se cierra con close().
+    """
+    def __init__(self, caption="Recolector Mutante 2.0", size=(rm.WIDTH, rm.HEIGHT)):
+        """
+        Parámetros:
+        - caption (str): Título de la ventana fuera de la partida (el menú).
+        - size (tuple): Tamaño de la ventana.
+        """
+        self.caption = caption
+        self.size = size
+        self.assets = assets
+        self.screen = None
+        self.game = None
+        # Un juego reutilizable por motor (Game o ArrayGame); self.game es el de la última partida
+        self._games = {}
+        # Grabador de telemetría compartido por todas las partidas (opcional, ver telemetry.py)
+        self.telemetry = None
+        # Calidad gráfica compartida: una partida nueva empieza en el nivel al que llegó la anterior
+        self.quality = QualityGovernor()
+        self.games_played = 0
+        # Segundos que tardó en quedar lista la última partida (reinicio + grabador)
+        self.last_restart = None
+
+    def open(self):
+        """
+        Inicializa pygame y crea la ventana (una sola vez para el menú y todas
+        las partidas), abre el paquete precocinado de recursos si existe y lanza
+        en segundo plano la precarga de los sprites que no estén en él.
+
+        Retorna:
+        - pygame.Surface: La pantalla.
+        """
+        if self.screen is not None:
+            return self.screen
+        with trace.fase("pygame (video + fuentes)"):
+            pygame.display.init()
+            pygame.font.init()
+        with trace.fase("ventana"):
+            # Con vsync si pygame lo confirma; si no, con límite de FPS (ver rm.open_window)
+            self.screen = rm.open_window(self.size)
+            pygame.display.set_caption(self.caption)
+        with trace.fase("paquete de recursos"):
+            bundle = AssetBundle.open(BUNDLE_PATH)
+            self.assets.use_bundle(bundle)
+        if bundle is not None and bundle.stale:
+            print(f"{BUNDLE_PATH} desactualizado ({', '.join(sorted(bundle.stale))}): "
+                  f"se cargan los originales; reconstruir con python asset_bundle.py build")
+        self.assets.prefetch(rm.SPRITES,
+                             on_done=lambda segundos: trace.record_background("sprites del juego", segundos))
+        return self.screen
+
+    def font(self, path, size):
+        """
+        Retorna:
+        - pygame.font.Font: Fuente compartida desde la caché de recursos.
+        """
+        return self.assets.font(path, size)
+
+    def new_game(self, seed=None, endless=False, **settings):
+        """
+        Prepara la siguiente partida reutilizando el juego de la sesión.
+
+        Parámetros:
+        - seed (int): Semilla de la partida (por defecto: una al azar).
+        - endless (bool): Modo infinito (con NumPy, sobre el motor de arreglos).
+        - **settings: Atributos del juego a fijar (por ejemplo, collision_mode="mask").
+
+        Retorna:
+        - Game: Juego listo para main_loop().
+        """
+        factory = ArrayGame if endless and HAVE_NUMPY else rm.Game
+        game = self._games.get(factory)
+        if game is None:
+            game = self._games[factory] = factory(seed=seed)
+        else:
+            game.reset(seed)
+        self.game = game
+        game.endless = endless
+        for name, value in settings.items():
+            setattr(self.game, name, value)
+        self.game.telemetry = self.telemetry
+        self.game.quality = self.quality
+        if self.telemetry is not None:
+            self.telemetry.begin_game()
+        return self.game
+
+    def play(self, seed=None, record=None, endless=False, **settings):
+        """
+        Juega una partida completa y regresa, con la ventana y el audio intactos.
+
+        Parámetros:
+        - seed (int): Semilla de la partida (por defecto: una al azar).
+        - record (str): Archivo donde grabar la entrada de la partida (opcional).
+        - endless (bool): Modo infinito.
+        - **settings: Atributos del juego a fijar (ver new_game()).
+
+        Retorna:
+        - Game: El juego terminado (su puntaje ya quedó guardado).
+        """
+        start = time.perf_counter()
+        game = self.new_game(seed, endless, **settings)
+        if record:
+            game.recorder = InputRecorder.for_game(record, game)
+        self.last_restart = time.perf_counter() - start
+        game.main_loop()
+        self.games_played += 1
+        # De vuelta al menú: la música se apaga y la ventana recupera su título
+        if pygame.mixer.get_init():
+            pygame.mixer.music.stop()
+        pygame.display.set_caption(self.caption)
+        return game
+
+    def close(self):
+        """Cierra la ventana y el audio, y termina de escribir la telemetría."""
+        if self.telemetry is not None:
+            self.telemetry.close()
+        pygame.quit()
+        self.screen = None
@@ -0,0 +1,187 @@
+"""
+Broadphase de colisiones basado en una rejilla uniforme (spatial hash).
+
+Cada objeto se registra en las celdas que cubre su rectángulo. Las consultas
+por rectángulo solo revisan los objetos de las celdas tocadas, y las bajas se
+hacen con "swap-remove" (el último elemento ocupa el hueco), sin recorrer listas.
+"""
+
+
+class SpatialHash:
+    """
+    Rejilla uniforme que indexa objetos por su rectángulo (x, y, ancho, alto).
+    Los objetos deben ser hashables; se usan como claves en los índices internos.
+    """
+    def __init__(self, cell_size=64):
+        """
+        Parámetros:
+        - cell_size (int): Lado de cada celda en píxeles.
+        """
+        self.cell_size = cell_size
+        self._cells = {}   # (cx, cy) -> lista de objetos
+        self._slots = {}   # objeto -> {(cx, cy): posición en la lista de esa celda}
+        self._rects = {}   # objeto -> (x, y, w, h)
+        self._ranges = {}  # objeto -> (cx0, cy0, cx1, cy1)
+
+    def __len__(self):
+        return len(self._rects)
+
+    def __contains__(self, item):
+        return item in self._rects
+
+    def _cell_range(self, x, y, w, h):
+        """Retorna el rango de celdas (cx0, cy0, cx1, cy1) que cubre el rectángulo."""
+        cs = self.cell_size
+        return (int(x // cs), int(y // cs), int((x + w) // cs), int((y + h) // cs))
+
+    def _link(self, item, cell_range):
+        """Agrega el objeto a todas las celdas del rango."""
+        slots = self._slots[item]
+        cx0, cy0, cx1, cy1 = cell_range
+        for cx in range(cx0, cx1 + 1):
+            for cy in range(cy0, cy1 + 1):
+                cell = self._cells.get((cx, cy))
+                if cell is None:
+                    cell = self._cells[(cx, cy)] = []
+                slots[(cx, cy)] = len(cell)
+                cell.append(item)
+
+    def _unlink(self, item):
+        """Quita el objeto de todas sus celdas usando swap-remove."""
+        slots = self._slots[item]
+        for key, slot in slots.items():
+            cell = self._cells[key]
+            last = cell.pop()
+            if last is not item:
+                cell[slot] = last
+                self._slots[last][key] = slot
+            elif not cell:
+                del self._cells[key]
+        slots.clear()
+
+    def insert(self, item, x, y, w, h):
+        """
+        Registra un objeto con su rectángulo.
+
+        Parámetros:
+        - item: Objeto a indexar.
+        - x, y, w, h (float): Rectángulo del objeto.
+        """
+        if item in self._rects:
+            self.update(item, x, y, w, h)
+            return
+        cell_range = self._cell_range(x, y, w, h)
+        self._rects[item] = (x, y, w, h)
+        self._ranges[item] = cell_range
+        self._slots[item] = {}
+        self._link(item, cell_range)
+
+    def update(self, item, x, y, w, h):
+        """
+        Actualiza el rectángulo de un objeto. Solo toca las celdas si el
+        objeto cambió de celda, así que moverse dentro de la misma es O(1).
+        """
+        self._rects[item] = (x, y, w, h)
+        cell_range = self._cell_range(x, y, w, h)
+        if cell_range != self._ranges[item]:
+            self._unlink(item)
+            self._ranges[item] = cell_range
+            self._link(item, cell_range)
+
+    def remove(self, item):
+        """Elimina un objeto del índice."""
+        self._unlink(item)
+        del self._slots[item]
+        del self._rects[item]
+        del self._ranges[item]
+
+    def clear(self):
+        """Vacía la rejilla."""
+        self._cells.clear()
+        self._slots.clear()
+        self._rects.clear()
+        self._ranges.clear()
+
+    def query(self, x, y, w, h):
+        """
+        Busca los objetos cuyo rectángulo se superpone con el dado
+        (misma prueba AABB estricta que usa el juego).
+
+        Parámetros:
+        - x, y, w, h (float): Rectángulo de búsqueda.
+
+        Retorna:
+        - list: Objetos que se superponen, sin repetidos.
+        """
+        found = []
+        seen = set()
+        rects = self._rects
+        cx0, cy0, cx1, cy1 = self._cell_range(x, y, w, h)
+        for cx in range(cx0, cx1 + 1):
+            for cy in range(cy0, cy1 + 1):
+                cell = self._cells.get((cx, cy))
+                if not cell:
+                    continue
+                for item in cell:
+                    if item in seen:
+                        continue
+                    seen.add(item)
+                    ix, iy, iw, ih = rects[item]
+                    if x < ix + iw and x + w > ix and y < iy + ih and y + h > iy:
+                        found.append(item)
+        return found
+
+    def pairs(self):
+        """
+        Busca todas las parejas de objetos indexados que se superponen entre sí
+        (por ejemplo, obstáculo contra obstáculo) sin comparar todos contra todos.
+
+        Retorna:
+        - list: Tuplas (a, b) sin repetidos.
+        """
+        found = []
+        seen = set()
+        rects = self._rects
+        for cell in self._cells.values():
+            n = len(cell)
+            for i in range(n):
+                a = cell[i]
+                ax, ay, aw, ah = rects[a]
+                for j in range(i + 1, n):
+                    b = cell[j]
+                    key = (id(a), id(b)) if id(a) < id(b) else (id(b), id(a))
+                    if key in seen:
+                        continue
+                    seen.add(key)
+                    bx, by, bw, bh = rects[b]
+                    if ax < bx + bw and ax + aw > bx and ay < by + bh and ay + ah > by:
+                        found.append((a, b))
+        return found
+
+
+def swap_remove(items, item):
+    """
+    Quita un objeto de una lista en O(1) moviendo el último a su lugar.
+    Los objetos deben guardar su posición en el atributo `slot`.
+
+    Parámetros:
+    - items (list): Lista de entidades.
+    - item: Entidad a eliminar.
+    """
+    last = items.pop()
+    if last is not item:
+        items[item.slot] = last
+        last.slot = item.slot
+    item.slot = -1
+
+
+def append_slotted(items, item):
+    """
+    Agrega una entidad al final de la lista registrando su posición en `slot`.
+
+    Parámetros:
+    - items (list): Lista de entidades.
+    - item: Entidad a agregar.
+    """
+    item.slot = len(items)
+    items.append(item)
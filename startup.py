@@ -0,0 +1,98 @@
+"""
+Medición del arranque del juego.
+
+Registra cuánto tarda cada fase del arranque (importaciones, inicialización de
+pygame, ventana, fuente, pre-renderizado del menú...) y el tiempo total hasta
+el primer frame. main.py lo activa con la opción --startup-trace.
+"""
+import time
+from contextlib import contextmanager
+
+# Momento en que se importó este módulo; main.py lo importa antes que pygame
+T0 = time.perf_counter()
+
+
+class StartupTrace:
+    """
+    Acumula la duración de las fases del arranque.
+    Si está desactivado, fase() no mide nada y report() no imprime nada.
+    """
+    def __init__(self, start=T0):
+        """
+        Parámetros:
+        - start (float): Instante de referencia (time.perf_counter()).
+        """
+        self.start = start
+        self.enabled = False
+        self.phases = []
+        self.background = []
+        self.first_frame = None
+        self._last = start
+
+    def mark(self, name):
+        """
+        Cierra una fase que empezó donde terminó la anterior.
+
+        Parámetros:
+        - name (str): Nombre de la fase.
+        """
+        now = time.perf_counter()
+        self.phases.append((name, now - self._last))
+        self._last = now
+
+    @contextmanager
+    def fase(self, name):
+        """
+        Mide el bloque de código como una fase con nombre.
+
+        Parámetros:
+        - name (str): Nombre de la fase.
+        """
+        begin = time.perf_counter()
+        try:
+            yield
+        finally:
+            now = time.perf_counter()
+            self.phases.append((name, now - begin))
+            self._last = now
+
+    def record_background(self, name, seconds):
+        """
+        Registra una tarea que corrió en un hilo aparte (no suma al tiempo hasta el primer frame).
+
+        Parámetros:
+        - name (str): Nombre de la tarea.
+        - seconds (float): Duración en segundos.
+        """
+        self.background.append((name, seconds))
+
+    def frame_shown(self):
+        """Registra el momento en que se mostró el primer frame (solo la primera vez)."""
+        if self.first_frame is None:
+            self.first_frame = time.perf_counter() - self.start
+
+    def report(self):
+        """
+        Imprime el desglose por fase y el tiempo hasta el primer frame.
+
+        Retorna:
+        - str: El mismo texto impreso (vacío si la traza está desactivada).
+        """
+        if not self.enabled:
+            return ""
+        lines = ["Arranque:"]
+        total = 0.0
+        for name, seconds in self.phases:
+            total += seconds
+            lines.append(f"  {name:<28} {seconds * 1000:8.1f} ms  (acum. {total * 1000:8.1f} ms)")
+        if self.first_frame is not None:
+            lines.append(f"  {'Tiempo hasta el primer frame':<28} {self.first_frame * 1000:8.1f} ms")
+        for name, seconds in self.background:
+            lines.append(f"  [segundo plano] {name:<14} {seconds * 1000:8.1f} ms")
+        text = "\n".join(lines)
+        print(text)
+        return text
+
+
+# Traza compartida del proceso
+trace = StartupTrace()
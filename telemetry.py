@@ -0,0 +1,359 @@
+"""
+Telemetría de partidas en formato binario por columnas.
+
+TelemetryRecorder guarda, tick a tick, la posición del jugador y de cada
+obstáculo, y los eventos del juego (estrella recogida con su bonificación,
+golpe, escudo ganado o gastado, ralentizador, fin de nivel). Cada tick solo
+agrega sus valores a arreglos en memoria; al llenarse un bloque se entrega a un
+hilo escritor, que lo pasa a columnas y lo escribe: el frame nunca espera al disco.
+
+El archivo es una cabecera seguida de bloques independientes:
+
+    cabecera   b"RMTL", versión (u8), ticks por segundo (u16)
+    bloque     etiqueta (4 bytes), filas (u32), filas extra (u32), bytes (u32), columnas
+
+    b"TICK"    tick u32, nivel u16, jugador_x i16, jugador_y i16, vidas i16, obstáculos u16
+               y después obs_x i16, obs_y i16 de todos los obstáculos de esas filas (filas extra)
+    b"EVNT"    tick u32, tipo u8, x i16, y i16, cantidad i16, valor f32
+
+Todo en little-endian. read_chunks() recorre el archivo bloque por bloque,
+así que un registro de varios gigabytes se analiza sin cargarlo en memoria.
+
+Uso:
+    python main.py --telemetry partidas.rmt
+    python telemetry.py partidas.rmt
+"""
+import argparse
+import queue
+import struct
+import sys
+import threading
+from array import array
+from collections import Counter, namedtuple
+
+MAGIC = b"RMTL"
+VERSION = 1
+HEADER = struct.Struct("<4sBH")
+CHUNK = struct.Struct("<4sIII")
+TAG_TICKS = b"TICK"
+TAG_EVENTS = b"EVNT"
+
+# Columnas de cada bloque: (nombre, código de array)
+TICK_COLUMNS = (("tick", "I"), ("level", "H"), ("x", "h"), ("y", "h"), ("lives", "h"),
+                ("obstacles", "H"))
+OBSTACLE_COLUMNS = (("obs_x", "h"), ("obs_y", "h"))
+EVENT_COLUMNS = (("tick", "I"), ("kind", "B"), ("x", "h"), ("y", "h"), ("amount", "h"),
+                 ("value", "f"))
+
+# Tipos de evento. amount y value dependen del tipo:
+EV_GAME_START = 0     # amount: número de partida en la sesión
+EV_STAR = 1           # amount: puntos obtenidos; value: segundos desde que apareció la estrella
+EV_HIT = 2            # amount: vidas restantes
+EV_SHIELD_USED = 3    # el escudo absorbió un golpe
+EV_SHIELD_GAINED = 4
+EV_SLOW = 5
+EV_LEVEL_END = 6      # amount: resultado (ver LEVEL_RESULTS); value: segundos jugados del nivel
+EVENT_NAMES = ("game_start", "star", "hit", "shield_used", "shield_gained", "slow", "level_end")
+LEVEL_RESULTS = ("cleared", "timeout", "dead")
+
+DEFAULT_CHUNK_TICKS = 1800  # 30 segundos de juego por bloque
+
+Tick = namedtuple("Tick", "tick level x y lives obstacles")
+Event = namedtuple("Event", "tick kind x y amount value")
+
+
+def _new_columns(columns):
+    return {name: array(code) for name, code in columns}
+
+
+class TelemetryRecorder:
+    """
+    Grabador de telemetría. Los métodos tick() y event() solo agregan valores
+    a arreglos en memoria; la serialización y la escritura ocurren en un hilo
+    aparte. Una instancia puede grabar varias partidas seguidas (ver begin_game()).
+    """
+    def __init__(self, path, tick_rate=60, chunk_ticks=DEFAULT_CHUNK_TICKS, obstacles=True):
+        """
+        Parámetros:
+        - path (str): Archivo de salida.
+        - tick_rate (int): Ticks por segundo del juego.
+        - chunk_ticks (int): Ticks por bloque.
+        - obstacles (bool): Guardar también la posición de cada obstáculo.
+        """
+        self.chunk_ticks = chunk_ticks
+        self.obstacles = obstacles
+        self.ticks = 0
+        self.games = 0
+        self._file = open(path, "wb")
+        self._file.write(HEADER.pack(MAGIC, VERSION, tick_rate))
+        # Filas de tick seguidas (len(TICK_COLUMNS) valores por fila); el escritor las pasa a columnas
+        self._tick_rows = array("q")
+        self._obs = _new_columns(OBSTACLE_COLUMNS)
+        self._events = _new_columns(EVENT_COLUMNS)
+        self._rows = 0
+        self._queue = queue.SimpleQueue()
+        self._writer = threading.Thread(target=self._write_loop, name="telemetria", daemon=True)
+        self._writer.start()
+
+    @classmethod
+    def for_game(cls, path, game, **kwargs):
+        """Crea un grabador con la frecuencia de ticks de un juego."""
+        tick_rate = round(1 / game.clock.dt) if hasattr(game.clock, "dt") else 60
+        return cls(path, tick_rate, **kwargs)
+
+    def begin_game(self):
+        """Marca el comienzo de una partida en el registro."""
+        self.games += 1
+        self.event(EV_GAME_START, 0, 0, self.games)
+
+    def event(self, kind, x, y, amount=0, value=0.0):
+        """
+        Registra un evento en el tick actual.
+
+        Parámetros:
+        - kind (int): Tipo de evento (EV_*).
+        - x, y (float): Posición asociada (la de la estrella, el obstáculo...).
+        - amount (int): Dato entero del evento.
+        - value (float): Dato real del evento.
+        """
+        cols = self._events
+        cols["tick"].append(self.ticks)
+        cols["kind"].append(kind)
+        cols["x"].append(int(x))
+        cols["y"].append(int(y))
+        cols["amount"].append(amount)
+        cols["value"].append(value)
+
+    def tick(self, game):
+        """
+        Registra el estado de un tick ya simulado.
+
+        Parámetros:
+        - game (Game): Juego después de step().
+        """
+        n = 0
+        if self.obstacles:
+            xs, ys = game.obstacle_positions()
+            n = len(xs)
+            _extend_i16(self._obs["obs_x"], xs)
+            _extend_i16(self._obs["obs_y"], ys)
+        px, py = game.player.pos
+        self._tick_rows.extend((self.ticks, game.level, int(px), int(py), game.player.lives, n))
+        self.ticks += 1
+        self._rows += 1
+        if self._rows >= self.chunk_ticks:
+            self.flush()
+
+    def flush(self):
+        """Entrega al hilo escritor lo acumulado hasta ahora (sin esperar a que se escriba)."""
+        if self._rows:
+            self._queue.put((TAG_TICKS, self._rows, self._tick_rows, self._obs))
+            self._tick_rows = array("q")
+            self._obs = _new_columns(OBSTACLE_COLUMNS)
+            self._rows = 0
+        if self._events["tick"]:
+            self._queue.put((TAG_EVENTS, len(self._events["tick"]), self._events, None))
+            self._events = _new_columns(EVENT_COLUMNS)
+
+    def close(self):
+        """Escribe lo pendiente, espera al hilo escritor y cierra el archivo."""
+        if self._file.closed:
+            return
+        self.flush()
+        self._queue.put(None)
+        self._writer.join()
+        self._file.close()
+
+    def _write_loop(self):
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            tag, rows, columns, extra = item
+            extra_rows = 0
+            if tag == TAG_TICKS:
+                width = len(TICK_COLUMNS)
+                parts = [_le_bytes(array(code, columns[k::width]))
+                         for k, (_, code) in enumerate(TICK_COLUMNS)]
+                extra_rows = len(extra["obs_x"])
+                parts += [_le_bytes(col) for col in extra.values()]
+            else:
+                parts = [_le_bytes(col) for col in columns.values()]
+            payload = b"".join(parts)
+            self._file.write(CHUNK.pack(tag, rows, extra_rows, len(payload)))
+            self._file.write(payload)
+
+
+def _extend_i16(column, values):
+    """Agrega valores a una columna int16 (desde una lista o un arreglo de NumPy)."""
+    if hasattr(values, "astype"):
+        column.frombytes(values.astype("=i2").tobytes())
+    else:
+        column.extend([int(v) for v in values])
+
+
+def _le_bytes(column):
+    """Bytes little-endian de una columna."""
+    if sys.byteorder == "big":
+        column = array(column.typecode, column)
+        column.byteswap()
+    return column.tobytes()
+
+
+def _read_columns(columns, rows, payload, offset):
+    """
+    Decodifica columnas consecutivas de `rows` filas.
+
+    Retorna:
+    - tuple: (dict nombre → array, posición siguiente en el payload).
+    """
+    out = {}
+    for name, code in columns:
+        col = array(code)
+        size = col.itemsize * rows
+        col.frombytes(payload[offset:offset + size])
+        if sys.byteorder == "big":
+            col.byteswap()
+        out[name] = col
+        offset += size
+    return out, offset
+
+
+def read_header(f):
+    """
+    Lee y valida la cabecera de un registro.
+
+    Retorna:
+    - int: Ticks por segundo de la grabación.
+    """
+    data = f.read(HEADER.size)
+    if len(data) < HEADER.size:
+        raise ValueError("archivo de telemetría vacío o truncado")
+    magic, version, tick_rate = HEADER.unpack(data)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError("no es un archivo de telemetría del Recolector Mutante")
+    return tick_rate
+
+
+def read_chunks(path):
+    """
+    Recorre un registro bloque por bloque. Un bloque final incompleto (por
+    ejemplo, si el juego se cerró a la fuerza) se ignora.
+
+    Parámetros:
+    - path (str): Archivo de telemetría.
+
+    Retorna:
+    - generator: Tuplas (etiqueta, columnas) con las columnas como dict nombre → array.
+    """
+    with open(path, "rb") as f:
+        read_header(f)
+        while True:
+            head = f.read(CHUNK.size)
+            if len(head) < CHUNK.size:
+                return
+            tag, rows, extra_rows, nbytes = CHUNK.unpack(head)
+            payload = f.read(nbytes)
+            if len(payload) < nbytes:
+                return
+            if tag == TAG_TICKS:
+                columns, offset = _read_columns(TICK_COLUMNS, rows, payload, 0)
+                obstacles, _ = _read_columns(OBSTACLE_COLUMNS, extra_rows, payload, offset)
+                columns.update(obstacles)
+            elif tag == TAG_EVENTS:
+                columns, _ = _read_columns(EVENT_COLUMNS, rows, payload, 0)
+            else:
+                continue  # Bloque de una versión futura
+            yield tag, columns
+
+
+def read_ticks(path):
+    """
+    Retorna:
+    - generator: Un Tick por tick grabado; obstacles es una lista de (x, y).
+    """
+    for tag, cols in read_chunks(path):
+        if tag != TAG_TICKS:
+            continue
+        obs_x, obs_y = cols["obs_x"], cols["obs_y"]
+        start = 0
+        for tick, level, x, y, lives, n in zip(cols["tick"], cols["level"], cols["x"],
+                                               cols["y"], cols["lives"], cols["obstacles"]):
+            yield Tick(tick, level, x, y, lives, list(zip(obs_x[start:start + n], obs_y[start:start + n])))
+            start += n
+
+
+def read_events(path, kinds=None):
+    """
+    Parámetros:
+    - kinds (set): Tipos de evento a entregar (por defecto: todos).
+
+    Retorna:
+    - generator: Un Event por evento grabado, en orden.
+    """
+    for tag, cols in read_chunks(path):
+        if tag != TAG_EVENTS:
+            continue
+        for event in zip(cols["tick"], cols["kind"], cols["x"], cols["y"],
+                         cols["amount"], cols["value"]):
+            if kinds is None or event[1] in kinds:
+                yield Event(*event)
+
+
+def summarize(path, cell=100):
+    """
+    Resume un registro en una sola pasada: densidad de obstáculos por nivel,
+    eventos por tipo y zonas de la pantalla donde más se recibe daño.
+
+    Parámetros:
+    - path (str): Archivo de telemetría.
+    - cell (int): Lado en píxeles de las zonas del mapa de golpes.
+
+    Retorna:
+    - dict: Resumen.
+    """
+    ticks = 0
+    per_level = {}   # nivel → [ticks, suma de obstáculos]
+    events = Counter()
+    hits = Counter()
+    for tag, cols in read_chunks(path):
+        if tag == TAG_TICKS:
+            ticks += len(cols["tick"])
+            for level, n in zip(cols["level"], cols["obstacles"]):
+                row = per_level.setdefault(level, [0, 0])
+                row[0] += 1
+                row[1] += n
+        else:
+            events.update(cols["kind"])
+            for kind, x, y in zip(cols["kind"], cols["x"], cols["y"]):
+                if kind == EV_HIT:
+                    hits[(x // cell * cell, y // cell * cell)] += 1
+    return {
+        "ticks": ticks,
+        "obstacles_per_level": {level: total / n for level, (n, total) in sorted(per_level.items())},
+        "events": {EVENT_NAMES[k]: v for k, v in sorted(events.items())},
+        "hit_zones": hits.most_common(10),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Resumen de un registro de telemetría")
+    parser.add_argument("archivo", help="Registro (.rmt) hecho con main.py --telemetry")
+    parser.add_argument("--cell", type=int, default=100, help="Tamaño de las zonas del mapa de golpes")
+    args = parser.parse_args()
+
+    summary = summarize(args.archivo, args.cell)
+    print(f"Ticks: {summary['ticks']}")
+    print("Obstáculos promedio por nivel:")
+    for level, mean in summary["obstacles_per_level"].items():
+        print(f"  nivel {level}: {mean:.1f}")
+    print("Eventos:")
+    for name, count in summary["events"].items():
+        print(f"  {name}: {count}")
+    print("Zonas con más golpes (x, y):")
+    for (x, y), count in summary["hit_zones"]:
+        print(f"  ({x}-{x + args.cell}, {y}-{y + args.cell}): {count}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,11 @@
+"""
+Configuración común de las pruebas: importar los módulos del juego desde la raíz
+del proyecto y usar los controladores de video y audio "dummy" (sin ventana).
+"""
+import os
+import sys
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,109 @@
+"""
+Cliente y servidor de la tabla de puntajes en el mismo proceso: envío por
+lotes, reintentos hasta que el servidor vuelve, lotes rechazados y tablas
+separadas por modo de juego.
+"""
+import asyncio
+
+import pytest
+
+from leaderboard import LeaderboardClient, LeaderboardServer
+
+
+@pytest.fixture
+def server():
+    """Servidor con base de datos en memoria que anota el tamaño de cada lote recibido."""
+    srv = LeaderboardServer(port=0, ruta=":memory:")
+    srv.lotes = []
+    procesar = srv.procesar
+
+    def procesar_anotando(mensaje):
+        if mensaje["op"] == "submit":
+            if any(p.get("nombre") == "malo" for p in mensaje["scores"]):
+                raise ValueError("puntaje inválido")
+            srv.lotes.append(len(mensaje["scores"]))
+        return procesar(mensaje)
+    srv.procesar = procesar_anotando
+    srv.start_in_thread()
+    yield srv
+    srv.stop_thread()
+
+
+def stored(srv):
+    """Puntajes guardados por el servidor (SQLite solo se puede usar desde el hilo del servidor)."""
+    async def total():
+        return srv.almacen.total()
+    return asyncio.run_coroutine_threadsafe(total(), srv._loop).result()
+
+
+def client_for(port, **kwargs):
+    kwargs.setdefault("flush_interval", 0.2)
+    kwargs.setdefault("timeout", 1.0)
+    kwargs.setdefault("max_retry_delay", 0.2)
+    return LeaderboardClient(port=port, **kwargs)
+
+
+def test_scores_are_sent_in_batches(server):
+    client = client_for(server.port, batch_size=3)
+    try:
+        for i in range(7):
+            client.submit(i * 10, f"j{i}")
+        assert client.flush(5)
+        assert server.lotes == [3, 3, 1]
+        assert [fila[1] for fila in client.top(3, wait=2)] == [60, 50, 40]
+    finally:
+        client.close()
+
+
+def test_retries_until_server_comes_back():
+    # Se reserva un puerto libre y se apaga el servidor: el cliente no tiene con quién hablar
+    first = LeaderboardServer(port=0, ruta=":memory:")
+    port = first.start_in_thread()
+    first.stop_thread()
+
+    client = client_for(port)
+    try:
+        client.submit(5, "a")
+        client.submit(7, "b")
+        assert not client.flush(0.5)
+        assert client.pendientes == 2
+
+        second = LeaderboardServer(port=port, ruta=":memory:")
+        second.start_in_thread()
+        try:
+            assert client.flush(5)
+            assert stored(second) == 2
+        finally:
+            second.stop_thread()
+    finally:
+        client.close(timeout=0)
+
+
+def test_rejected_score_is_dropped_without_blocking_the_queue(server):
+    client = client_for(server.port, batch_size=5)
+    try:
+        for nombre in ("a", "b", "malo", "c", "d"):
+            client.submit(1, nombre)
+        assert client.flush(5)
+        assert client.descartados == 1
+        assert client.pendientes == 0
+        assert stored(server) == 4
+
+        # Lo que llega después se sigue enviando con normalidad
+        client.submit(2, "e")
+        assert client.flush(5)
+        assert stored(server) == 5
+    finally:
+        client.close()
+
+
+def test_endless_scores_have_their_own_top(server):
+    client = client_for(server.port)
+    try:
+        client.submit(10, "normal")
+        client.submit(99, "infinito", modo="infinito")
+        assert client.flush(5)
+        assert [fila[0] for fila in client.top(5, wait=2)] == ["normal"]
+        assert [fila[0] for fila in client.top(5, wait=2, modo="infinito")] == ["infinito"]
+    finally:
+        client.close()
@@ -0,0 +1,146 @@
+"""
+Almacén de puntajes en SQLite: importación del antiguo puntajes.txt (una sola
+vez), agregados que mantienen los triggers, reenvíos sin duplicados, listas y
+agregados separados por modo de juego y migración de las bases sin modos.
+"""
+import sqlite3
+
+import pytest
+
+from puntajes import MODO_INFINITO, MODO_NORMAL, AlmacenPuntajes
+
+TXT = """\
+ana - 12 pts - 2025-06-03 15:28
+7 pts - 2025-06-03 16:00
+línea que no es un puntaje
+bea - -2 pts - 2025-06-04 09:10
+
+luis - 30 pts - 2025-06-05 20:45
+"""
+
+
+@pytest.fixture
+def txt(tmp_path):
+    path = tmp_path / "puntajes.txt"
+    path.write_text(TXT, encoding="utf-8")
+    return str(path)
+
+
+def test_imports_both_formats_once(tmp_path, txt):
+    ruta = str(tmp_path / "puntajes.db")
+    almacen = AlmacenPuntajes(ruta, importar_de=txt)
+    assert almacen.total() == 4
+    assert almacen.top(2) == [("luis", 30, "2025-06-05 20:45"), ("ana", 12, "2025-06-03 15:28")]
+    assert almacen.recientes(2) == [("bea", -2, "2025-06-04 09:10"), ("luis", 30, "2025-06-05 20:45")]
+    assert (None, 7, "2025-06-03 16:00") in almacen.top(10)
+    almacen.cerrar()
+
+    # Al volver a abrir, el archivo ya importado no se repite
+    almacen = AlmacenPuntajes(ruta, importar_de=txt)
+    assert almacen.total() == 4
+    almacen.cerrar()
+
+
+def test_aggregates_after_import_and_inserts(txt):
+    almacen = AlmacenPuntajes(":memory:", importar_de=txt)
+    assert almacen.resumen() == {"partidas": 4, "mejor": 30, "promedio": pytest.approx(47 / 4)}
+    assert almacen.por_dia() == [("2025-06-03", 2), ("2025-06-04", 1), ("2025-06-05", 1)]
+
+    # Después de la importación el trigger vuelve a estar activo
+    almacen.guardar(50, "ana", fecha="2025-06-05 21:00")
+    almacen.guardar(1, fecha="2025-06-06 08:00")
+    assert almacen.resumen() == {"partidas": 6, "mejor": 50, "promedio": pytest.approx(98 / 6)}
+    assert almacen.por_dia(2) == [("2025-06-05", 2), ("2025-06-06", 1)]
+    assert almacen.mejor_de("ana") == 50
+
+
+def test_aggregates_match_the_table(txt):
+    almacen = AlmacenPuntajes(":memory:", importar_de=txt)
+    almacen.guardar_varios([(i, f"j{i}", f"2025-07-0{i % 3 + 1} 10:00", None, MODO_NORMAL)
+                            for i in range(10)])
+    partidas, suma, mejor = almacen.conexion.execute(
+        "SELECT COUNT(*), SUM(puntos), MAX(puntos) FROM puntajes").fetchone()
+    assert almacen.resumen() == {"partidas": partidas, "mejor": mejor,
+                                 "promedio": pytest.approx(suma / partidas)}
+    por_dia = almacen.conexion.execute(
+        "SELECT substr(fecha, 1, 10), COUNT(*) FROM puntajes GROUP BY 1 ORDER BY 1").fetchall()
+    assert almacen.por_dia() == por_dia
+
+
+def test_resent_batches_are_not_duplicated():
+    almacen = AlmacenPuntajes(":memory:", importar_de=None)
+    lote = [(5, "a", "2025-06-03 15:28", "uid-1", MODO_NORMAL),
+            (6, "b", "2025-06-03 15:29", "uid-2", MODO_NORMAL)]
+    assert almacen.guardar_varios(lote) == 2
+    assert almacen.guardar_varios(lote + [(7, "c", None, "uid-3", MODO_NORMAL)]) == 1
+    assert almacen.total() == 3
+
+
+def test_modes_have_separate_lists():
+    almacen = AlmacenPuntajes(":memory:", importar_de=None)
+    almacen.guardar(10, "normal")
+    almacen.guardar(99, "infinito", modo=MODO_INFINITO)
+    assert [fila[0] for fila in almacen.top(5)] == ["normal"]
+    assert [fila[0] for fila in almacen.recientes(5, MODO_INFINITO)] == ["infinito"]
+    with pytest.raises(ValueError):
+        almacen.guardar(1, modo="otro")
+
+
+def test_modes_have_separate_aggregates():
+    almacen = AlmacenPuntajes(":memory:", importar_de=None)
+    almacen.guardar(10, "ana", fecha="2025-06-03 10:00")
+    almacen.guardar(500, "ana", fecha="2025-06-03 11:00", modo=MODO_INFINITO)
+    almacen.guardar(700, "ana", fecha="2025-06-04 11:00", modo=MODO_INFINITO)
+    assert almacen.resumen() == {"partidas": 1, "mejor": 10, "promedio": 10.0}
+    assert almacen.resumen(MODO_INFINITO) == {"partidas": 2, "mejor": 700, "promedio": 600.0}
+    assert almacen.por_dia() == [("2025-06-03", 1)]
+    assert almacen.por_dia(modo=MODO_INFINITO) == [("2025-06-03", 1), ("2025-06-04", 1)]
+    assert almacen.mejor_de("ana") == 10
+    assert almacen.mejor_de("ana", MODO_INFINITO) == 700
+    assert almacen.total() == 3 and almacen.total(MODO_INFINITO) == 2
+
+
+# Esquema de las bases creadas antes de los modos de juego
+ESQUEMA_SIN_MODOS = """
+CREATE TABLE puntajes (id INTEGER PRIMARY KEY, nombre TEXT, puntos INTEGER NOT NULL, fecha TEXT NOT NULL);
+CREATE INDEX idx_puntajes_puntos ON puntajes (puntos DESC, id);
+CREATE INDEX idx_puntajes_nombre ON puntajes (nombre, puntos DESC);
+CREATE TABLE resumen (id INTEGER PRIMARY KEY CHECK (id = 1), partidas INTEGER NOT NULL,
+                      suma INTEGER NOT NULL, mejor INTEGER);
+INSERT INTO resumen (id, partidas, suma, mejor) VALUES (1, 0, 0, NULL);
+CREATE TABLE por_dia (dia TEXT PRIMARY KEY, partidas INTEGER NOT NULL);
+CREATE TRIGGER puntajes_agregados AFTER INSERT ON puntajes
+BEGIN
+    UPDATE resumen SET partidas = partidas + 1, suma = suma + NEW.puntos,
+        mejor = CASE WHEN mejor IS NULL OR NEW.puntos > mejor THEN NEW.puntos ELSE mejor END
+    WHERE id = 1;
+    INSERT INTO por_dia (dia, partidas) VALUES (substr(NEW.fecha, 1, 10), 1)
+        ON CONFLICT (dia) DO UPDATE SET partidas = partidas + 1;
+END;
+INSERT INTO puntajes (nombre, puntos, fecha) VALUES ('viejo', 8, '2025-01-01 10:00');
+INSERT INTO puntajes (nombre, puntos, fecha) VALUES ('viejo', 4, '2025-01-02 10:00');
+"""
+
+
+def test_old_database_is_migrated_as_normal(tmp_path):
+    ruta = str(tmp_path / "puntajes.db")
+    conexion = sqlite3.connect(ruta)
+    conexion.executescript(ESQUEMA_SIN_MODOS)
+    conexion.close()
+
+    almacen = AlmacenPuntajes(ruta, importar_de=None)
+    assert almacen.resumen() == {"partidas": 2, "mejor": 8, "promedio": 6.0}
+    assert almacen.por_dia() == [("2025-01-01", 1), ("2025-01-02", 1)]
+    almacen.guardar(3, "nuevo", fecha="2025-01-02 12:00", modo=MODO_INFINITO)
+    almacen.guardar(5, "viejo", fecha="2025-01-02 13:00")
+    assert almacen.top(5) == [("viejo", 8, "2025-01-01 10:00"), ("viejo", 5, "2025-01-02 13:00"),
+                              ("viejo", 4, "2025-01-02 10:00")]
+    assert [fila[0] for fila in almacen.top(5, MODO_INFINITO)] == ["nuevo"]
+    assert almacen.resumen()["partidas"] == 3
+    assert almacen.por_dia(modo=MODO_INFINITO) == [("2025-01-02", 1)]
+    almacen.cerrar()
+
+    # Abrir otra vez una base ya migrada no cambia nada
+    almacen = AlmacenPuntajes(ruta, importar_de=None)
+    assert almacen.total() == 4 and almacen.resumen()["partidas"] == 3
+    almacen.cerrar()
@@ -0,0 +1,68 @@
+"""
+Grabación .rmr: una partida grabada se reproduce exactamente igual, y cerrar
+la ventana a mitad de un nivel deja la grabación completa (con su pie).
+"""
+import pygame
+import pytest
+
+import recolector_mutante_v2 as rm
+from headless import RandomInput, run_game_headless
+from replay import InputRecorder, InputReplay
+
+
+def record_game(path, seed, **settings):
+    game = rm.Game(clock=rm.TickClock(), seed=seed)
+    game.save_score = False
+    for name, value in settings.items():
+        setattr(game, name, value)
+    game.recorder = InputRecorder.for_game(path, game)
+    run_game_headless(RandomInput(seed), game=game)
+    game.recorder.close(game)
+    return game
+
+
+@pytest.mark.parametrize("settings", [{}, {"collision_mode": "circle"}, {"endless": True}])
+def test_round_trip(tmp_path, settings):
+    path = str(tmp_path / "partida.rmr")
+    recorded = record_game(path, seed=5, **settings)
+
+    replay = InputReplay(path)
+    assert replay.seed == 5
+    assert replay.collision_mode == recorded.collision_mode
+    assert replay.endless == recorded.endless
+    game = replay.make_game()
+    run_game_headless(replay, game=game)
+    assert replay.verify(game)
+    assert (game.score, game.player.lives, game.level) == (recorded.score, recorded.player.lives,
+                                                          recorded.level)
+
+
+def test_rejects_other_files(tmp_path):
+    path = tmp_path / "otro.rmr"
+    path.write_bytes(b"no es una grabacion" * 4)
+    with pytest.raises(ValueError):
+        InputReplay(str(path))
+
+
+def test_closing_the_window_keeps_the_footer(tmp_path):
+    path = str(tmp_path / "cerrada.rmr")
+    rm.init_display()
+    game = rm.Game(clock=rm.TickClock(), seed=9)
+    game.save_score = False
+    game.input_source = RandomInput(9)
+    game.recorder = InputRecorder.for_game(path, game)
+    game.start_level()
+    clock = pygame.time.Clock()
+    for _ in range(30):
+        game.run_frame(None, clock, 1, 1.0)
+    pygame.event.post(pygame.event.Event(pygame.QUIT))
+    with pytest.raises(SystemExit):
+        game.run_frame(None, clock, 1, 1.0)
+    rm.screen = None  # pygame.quit() cerró la ventana
+
+    replay = InputReplay(path)
+    game = replay.make_game()
+    game.start_level()
+    for _ in range(30):
+        game.step(replay(game))
+    assert replay.verify(game)
@@ -0,0 +1,93 @@
+"""
+Broadphase de la rejilla uniforme contra la búsqueda por fuerza bruta: mismas
+respuestas después de insertar, mover y quitar objetos, y swap_remove.
+"""
+import random
+
+import pytest
+
+from spatial_hash import SpatialHash, append_slotted, swap_remove
+
+
+def overlaps(a, b):
+    ax, ay, aw, ah = a
+    bx, by, bw, bh = b
+    return ax < bx + bw and ax + aw > bx and ay < by + bh and ay + ah > by
+
+
+def random_rect(rng):
+    # Incluye coordenadas negativas y rectángulos más grandes que una celda
+    return (rng.uniform(-100, 800), rng.uniform(-100, 600), rng.uniform(1, 150), rng.uniform(1, 150))
+
+
+def brute_query(rects, query):
+    return {item for item, rect in rects.items() if overlaps(rect, query)}
+
+
+def brute_pairs(rects):
+    items = list(rects)
+    return {frozenset((a, b)) for i, a in enumerate(items) for b in items[i + 1:]
+            if overlaps(rects[a], rects[b])}
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_matches_brute_force_after_moves_and_removals(seed):
+    rng = random.Random(seed)
+    grid = SpatialHash(cell_size=64)
+    rects = {}
+    for item in range(200):
+        rects[item] = random_rect(rng)
+        grid.insert(item, *rects[item])
+
+    for _ in range(5):
+        for item in rng.sample(sorted(rects), 60):
+            # Pasos cortos (misma celda casi siempre) y saltos a otra parte
+            x, y, w, h = rects[item] if rng.random() < 0.5 else random_rect(rng)
+            rects[item] = (x + rng.uniform(-5, 5), y + rng.uniform(-5, 5), w, h)
+            grid.update(item, *rects[item])
+        for item in rng.sample(sorted(rects), 20):
+            del rects[item]
+            grid.remove(item)
+
+        assert len(grid) == len(rects)
+        for _ in range(50):
+            query = random_rect(rng)
+            found = grid.query(*query)
+            assert len(found) == len(set(found))
+            assert set(found) == brute_query(rects, query)
+        pairs = grid.pairs()
+        assert len(pairs) == len({frozenset(p) for p in pairs})
+        assert {frozenset(p) for p in pairs} == brute_pairs(rects)
+
+
+def test_insert_existing_item_updates_it():
+    grid = SpatialHash(cell_size=10)
+    grid.insert("a", 0, 0, 5, 5)
+    grid.insert("a", 100, 100, 5, 5)
+    assert len(grid) == 1
+    assert grid.query(0, 0, 5, 5) == []
+    assert grid.query(100, 100, 5, 5) == ["a"]
+
+
+def test_clear_empties_the_grid():
+    grid = SpatialHash()
+    grid.insert("a", 0, 0, 5, 5)
+    grid.clear()
+    assert len(grid) == 0 and "a" not in grid
+    assert grid.query(0, 0, 5, 5) == []
+
+
+class Entity:
+    slot = -1
+
+
+def test_swap_remove_keeps_slots_consistent():
+    rng = random.Random(0)
+    items = []
+    for _ in range(50):
+        append_slotted(items, Entity())
+    while items:
+        item = rng.choice(items)
+        swap_remove(items, item)
+        assert item.slot == -1 and item not in items
+        assert all(e.slot == i for i, e in enumerate(items))
@@ -0,0 +1,103 @@
+"""
+Registro de telemetría: lo grabado se lee igual bloque por bloque, y un bloque
+final cortado (juego cerrado a la fuerza) se ignora sin perder los anteriores.
+"""
+import os
+from types import SimpleNamespace
+
+import pytest
+
+import telemetry
+from telemetry import TelemetryRecorder, read_chunks, read_events, read_ticks
+
+
+class FakeGame:
+    """Lo mínimo que TelemetryRecorder.tick() lee de un Game."""
+    def __init__(self):
+        self.level = 1
+        self.player = SimpleNamespace(pos=[0, 0], lives=3)
+        self.obstacles = []
+
+    def obstacle_positions(self):
+        return [x for x, _ in self.obstacles], [y for _, y in self.obstacles]
+
+
+def record(path, ticks, chunk_ticks):
+    """Graba `ticks` ticks con un número de obstáculos variable y un evento cada 7 ticks."""
+    game = FakeGame()
+    recorder = TelemetryRecorder(path, 60, chunk_ticks=chunk_ticks)
+    recorder.begin_game()
+    expected = []
+    for t in range(ticks):
+        game.level = 1 + t // 50
+        game.player.pos = [t, -t]
+        game.obstacles = [(t + i, 600 - i) for i in range(t % 5)]
+        if t % 7 == 0:
+            recorder.event(telemetry.EV_STAR, t, 2 * t, amount=t % 3, value=0.5)
+        recorder.tick(game)
+        expected.append((t, game.level, t, -t, 3, list(game.obstacles)))
+    recorder.close()
+    return expected
+
+
+def test_round_trip(tmp_path):
+    path = str(tmp_path / "partida.rmt")
+    expected = record(path, 130, chunk_ticks=40)
+
+    tags = [tag for tag, _ in read_chunks(path)]
+    assert tags.count(telemetry.TAG_TICKS) == 4  # 40 + 40 + 40 + 10
+    assert [tuple(t) for t in read_ticks(path)] == [tuple(row) for row in expected]
+
+    events = list(read_events(path))
+    assert events[0].kind == telemetry.EV_GAME_START and events[0].amount == 1
+    stars = list(read_events(path, {telemetry.EV_STAR}))
+    assert [e.tick for e in stars] == list(range(0, 130, 7))
+    assert all(e.value == pytest.approx(0.5) for e in stars)
+
+    summary = telemetry.summarize(path)
+    assert summary["ticks"] == 130
+    assert summary["events"]["star"] == len(stars)
+
+
+def chunk_ends(path):
+    """Posición en el archivo donde termina cada bloque."""
+    ends = []
+    with open(path, "rb") as f:
+        telemetry.read_header(f)
+        while True:
+            head = f.read(telemetry.CHUNK.size)
+            if not head:
+                return ends
+            nbytes = telemetry.CHUNK.unpack(head)[3]
+            f.seek(nbytes, os.SEEK_CUR)
+            ends.append(f.tell())
+
+
+@pytest.mark.parametrize("cut", ["header", "payload"])
+def test_truncated_tail_is_ignored(tmp_path, cut):
+    path = str(tmp_path / "partida.rmt")
+    record(path, 130, chunk_ticks=40)
+    ends = chunk_ends(path)
+    complete = list(read_chunks(path))
+
+    # Se corta el último bloque: a mitad de su encabezado o a mitad de sus datos
+    keep = ends[-2] + (telemetry.CHUNK.size // 2 if cut == "header" else telemetry.CHUNK.size + 3)
+    with open(path, "r+b") as f:
+        f.truncate(keep)
+
+    chunks = list(read_chunks(path))
+    assert len(chunks) == len(complete) - 1
+    assert [tag for tag, _ in chunks] == [tag for tag, _ in complete[:-1]]
+    # Lo que quedó antes del corte se sigue leyendo completo
+    assert sum(1 for _ in read_ticks(path)) == sum(
+        len(cols["tick"]) for tag, cols in chunks if tag == telemetry.TAG_TICKS)
+
+
+def test_rejects_foreign_file(tmp_path):
+    path = tmp_path / "otro.rmt"
+    path.write_bytes(b"PNG\x00" + bytes(20))
+    with pytest.raises(ValueError):
+        list(read_chunks(str(path)))
+    path.write_bytes(b"RM")
+    with pytest.raises(ValueError):
+        list(read_chunks(str(path)))
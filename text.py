@@ -0,0 +1,231 @@
+"""
+Texto compuesto desde atlas de caracteres.
+
+Cada fuente se rasteriza una sola vez por (tamaño, color): todos sus
+caracteres quedan en un atlas (una superficie) y las cadenas se componen
+copiando trozos del atlas con blit, sin volver a pasar por FreeType. Los
+caracteres salen del paquete precocinado si existe (ver asset_bundle.py).
+
+Encima del atlas hay una caché LRU de cadenas completas con memoria acotada:
+las etiquetas fijas ("Nivel: ", "Puntos: ") se componen una vez y después solo
+se copian; lo único que cuesta algo es el número que cambió.
+"""
+from collections import OrderedDict
+
+import pygame
+
+from asset_bundle import GLYPH_CHARS
+from asset_cache import assets
+
+# Memoria máxima de las cadenas en caché (4 bytes por píxel)
+DEFAULT_CACHE_BYTES = 4 * 1024 * 1024
+# Ancho máximo de cada fila del atlas
+ATLAS_WIDTH = 1024
+
+
+class GlyphAtlas:
+    """
+    Todos los caracteres de una fuente en un tamaño y color, empaquetados por
+    filas en una sola superficie con transparencia.
+    """
+    def __init__(self, path, size, color, chars=GLYPH_CHARS):
+        """
+        Parámetros:
+        - path (str): Ruta del archivo de fuente.
+        - size (int): Tamaño en puntos.
+        - color (tuple): Color RGB del texto.
+        - chars (str): Caracteres que se rasterizan de entrada; los demás se agregan al pedirlos.
+        """
+        self.path = path
+        self.size = size
+        self.color = tuple(color[:3])
+        self.font = assets.font(path, size)
+        self.height = self.font.get_height()
+        self.surface = None
+        # Carácter → (zona en el atlas, desplazamiento horizontal, avance)
+        self._glyphs = {}
+        self._build(chars)
+
+    def _build(self, chars):
+        """Rasteriza los caracteres pedidos (y los que ya tenía) en un atlas nuevo."""
+        chars = "".join(dict.fromkeys("".join(self._glyphs) + chars))
+        surfaces = [assets.glyph(self.path, self.size, char, self.color) for char in chars]
+        x = y = 0
+        places = []
+        for glyph in surfaces:
+            if x + glyph.get_width() > ATLAS_WIDTH:
+                x, y = 0, y + self.height
+            places.append((x, y))
+            x += glyph.get_width()
+        atlas = pygame.Surface((ATLAS_WIDTH, y + self.height), pygame.SRCALPHA)
+        atlas.fill((*self.color, 0))
+        for char, glyph, (gx, gy), metrics in zip(chars, surfaces, places, self.font.metrics(chars)):
+            atlas.blit(glyph, (gx, gy), special_flags=pygame.BLEND_RGBA_MAX)
+            # Los caracteres con parte a la izquierda del origen (como la "j") se renderizan corridos
+            offset = min(0, metrics[0]) if metrics is not None else 0
+            advance = metrics[4] if metrics is not None else glyph.get_width()
+            self._glyphs[char] = (pygame.Rect(gx, gy, glyph.get_width(), self.height), offset, advance)
+        if pygame.display.get_init() and pygame.display.get_surface() is not None:
+            atlas = atlas.convert_alpha()
+        self.surface = atlas
+
+    def layout(self, text):
+        """
+        Ubica cada carácter de la cadena (sin ajuste de pares; difiere de
+        Font.render en uno o dos píxeles en algunas combinaciones).
+
+        Parámetros:
+        - text (str): Cadena a componer.
+
+        Retorna:
+        - tuple: (lista de (x, zona del atlas), ancho total).
+        """
+        missing = [char for char in text if char not in self._glyphs]
+        if missing:
+            self._build("".join(missing))
+        glyphs = self._glyphs
+        placed = []
+        cursor = left = right = 0
+        for char in text:
+            area, offset, advance = glyphs[char]
+            x = cursor + offset
+            placed.append((x, area))
+            left = min(left, x)
+            right = max(right, x + area.w)
+            cursor += advance
+        right = max(right, cursor)
+        return [(x - left, area) for x, area in placed], right - left
+
+    def compose(self, text):
+        """
+        Parámetros:
+        - text (str): Cadena a componer.
+
+        Retorna:
+        - pygame.Surface: La cadena con transparencia, compuesta desde el atlas.
+        """
+        placed, width = self.layout(text)
+        surface = pygame.Surface((max(1, width), self.height), pygame.SRCALPHA)
+        # El fondo transparente lleva el color del texto para que los bordes suavizados no se oscurezcan
+        surface.fill((*self.color, 0))
+        atlas = self.surface
+        blit = surface.blit
+        for x, area in placed:
+            blit(atlas, (x, 0), area, special_flags=pygame.BLEND_RGBA_MAX)
+        return surface
+
+
+class TextCache:
+    """
+    Atlas por (fuente, tamaño, color) y caché LRU de cadenas ya compuestas,
+    con un límite de memoria en bytes.
+    """
+    def __init__(self, max_bytes=DEFAULT_CACHE_BYTES):
+        """
+        Parámetros:
+        - max_bytes (int): Memoria máxima de las cadenas en caché.
+        """
+        self.max_bytes = max_bytes
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._atlases = {}
+        self._strings = OrderedDict()
+
+    def atlas(self, path, size, color):
+        """
+        Retorna:
+        - GlyphAtlas: Atlas compartido de la fuente en ese tamaño y color.
+        """
+        key = (path, size, tuple(color[:3]))
+        atlas = self._atlases.get(key)
+        if atlas is None:
+            atlas = self._atlases[key] = GlyphAtlas(path, size, color)
+        return atlas
+
+    def render(self, path, size, color, text):
+        """
+        Devuelve la cadena compuesta, desde la caché si ya se usó hace poco.
+
+        Parámetros:
+        - path (str): Ruta del archivo de fuente.
+        - size (int): Tamaño en puntos.
+        - color (tuple): Color RGB del texto.
+        - text (str): Cadena a mostrar.
+
+        Retorna:
+        - pygame.Surface: Superficie compartida (no se debe dibujar sobre ella).
+        """
+        key = (path, size, color, text)
+        strings = self._strings
+        surface = strings.get(key)
+        if surface is not None:
+            strings.move_to_end(key)
+            self.hits += 1
+            return surface
+        self.misses += 1
+        surface = self.atlas(path, size, color).compose(text)
+        strings[key] = surface
+        self.bytes += surface.get_width() * surface.get_height() * 4
+        while self.bytes > self.max_bytes and len(strings) > 1:
+            _, old = strings.popitem(last=False)
+            self.bytes -= old.get_width() * old.get_height() * 4
+        return surface
+
+    def clear(self):
+        """Descarta los atlas y las cadenas (por ejemplo, si cambia el modo de video)."""
+        self._atlases.clear()
+        self._strings.clear()
+        self.bytes = 0
+
+
+class Text:
+    """
+    Fuente con color fijo que dibuja a través de la caché de texto.
+    Sustituye a Font.render() en el HUD y los menús.
+    """
+    def __init__(self, path, size, color, cache=None):
+        """
+        Parámetros:
+        - path (str): Ruta del archivo de fuente.
+        - size (int): Tamaño en puntos.
+        - color (tuple): Color RGB del texto.
+        - cache (TextCache): Caché a usar (por defecto: la compartida del juego).
+        """
+        self.path = path
+        self.size = size
+        self.color = tuple(color[:3])
+        self.cache = cache if cache is not None else text_cache
+
+    def render(self, text):
+        """
+        Retorna:
+        - pygame.Surface: La cadena compuesta (compartida desde la caché).
+        """
+        return self.cache.render(self.path, self.size, self.color, text)
+
+    def draw(self, surface, pos, *parts):
+        """
+        Dibuja varias partes seguidas en la misma línea. Cada parte se guarda
+        aparte en la caché, así una etiqueta fija y un valor que cambia no
+        obligan a componer de nuevo la etiqueta.
+
+        Parámetros:
+        - surface (pygame.Surface): Superficie destino.
+        - pos (tuple): Esquina superior izquierda.
+        - *parts (str): Partes del texto, de izquierda a derecha.
+
+        Retorna:
+        - pygame.Rect: Zona dibujada.
+        """
+        x, y = pos
+        rect = pygame.Rect(x, y, 0, 0)
+        for part in parts:
+            rendered = self.render(part)
+            rect.union_ip(surface.blit(rendered, (x, y)))
+            x += rendered.get_width()
+        return rect
+
+
+# Instancia compartida por todo el juego
+text_cache = TextCache()
@@ -0,0 +1,410 @@
+"""
+Entorno vectorizado estilo gym para bots de prueba.
+
+VecEnv simula N partidas independientes a la vez. El estado de todas vive en
+arreglos de NumPy de forma (N, ...) y step() las avanza un tick en una sola
+llamada, sin objetos Game por partida. Las reglas son exactamente las de
+Game.step, Game.check_collisions y el flujo de niveles de run_level: con la
+misma semilla y las mismas acciones, la partida i de VecEnv es idéntica a un
+Game(seed=...) jugado con headless.run_game_headless (con el modo de colisión
+por defecto de Game, "aabb").
+
+Lo único que se hace partida por partida es generar un nivel nuevo, porque debe
+consumir el generador aleatorio de esa partida en el mismo orden que Game.
+
+Uso:
+    env = VecEnv(1024, seed=0)
+    obs = env.reset()
+    obs, rewards, dones = env.step(actions)   # actions: máscaras KEY_* de forma (N,)
+
+    python vec_env.py --envs 1024 --steps 2000   # mide pasos por segundo
+"""
+try:
+    import numpy as np
+    HAVE_NUMPY = True
+except ImportError:
+    np = None
+    HAVE_NUMPY = False
+
+import argparse
+import random
+import time
+
+import recolector_mutante_v2 as rm
+
+PLAYER_SIZE = 50
+STAR_SIZE = 30
+POWER_UP_SIZE = 30
+OBSTACLE_SIZE = 40
+
+POWER_UP_NONE = -1
+POWER_UP_SHIELD = 0
+POWER_UP_SLOW = 1
+
+# Mismo orden que las claves de Game.rules, para que mutate_rules consuma igual el generador
+RULE_KEYS = ["player_speed", "obstacle_speed", "invert_controls", "num_obstacles"]
+
+if HAVE_NUMPY:
+    # Dirección (dx, dy) de cada máscara de teclas y límites de la posición del jugador
+    DIRECTIONS = np.array([(bool(m & rm.KEY_RIGHT) - bool(m & rm.KEY_LEFT),
+                            bool(m & rm.KEY_DOWN) - bool(m & rm.KEY_UP)) for m in range(16)])
+    PLAYER_MIN = np.array([0, rm.UI_HEIGHT])
+    PLAYER_MAX = np.array([rm.WIDTH - PLAYER_SIZE, rm.HEIGHT - PLAYER_SIZE])
+
+# Coordenada de los huecos vacíos: lejos de la pantalla, nunca choca con nada
+FAR = 30000
+
+# Las posiciones de los obstáculos siempre son múltiplos de 0.5 (velocidades enteras,
+# ralentizador de 0.5), así que internamente se guardan en medios píxeles como
+# enteros de 16 bits: mismos valores exactos que Game con un cuarto de la memoria
+POS_DTYPE = np.int16 if HAVE_NUMPY else None
+
+
+class VecEnv:
+    """
+    N partidas del Recolector Mutante en arreglos por lotes.
+
+    Las observaciones son vistas de solo lectura del estado interno: cambian con
+    cada step(), así que hay que copiarlas si se quieren conservar.
+    Cuando una partida termina se reinicia sola con la siguiente semilla; su
+    puntaje final queda en final_score y la observación ya es la de la nueva partida.
+    """
+    def __init__(self, num_envs, seed=0, tick_rate=rm.TICK_RATE):
+        """
+        Parámetros:
+        - num_envs (int): Número de partidas simultáneas.
+        - seed (int): Semilla base; la partida i empieza con seed + i.
+        - tick_rate (int): Ticks por segundo del reloj simulado.
+        """
+        if not HAVE_NUMPY:
+            raise RuntimeError("VecEnv requiere NumPy (pip install numpy)")
+        template = rm.Game(seed=0)
+        self.num_envs = n = num_envs
+        self.seed = seed
+        self.dt = 1.0 / tick_rate
+        self.base_rules = dict(template.rules)
+        self.score_to_advance = template.score_to_advance
+        self.max_levels = template.max_levels
+        self.level_time_limit = template.level_time_limit
+        self.immunity_duration = template.immunity_duration
+        # Solo se muta una regla por nivel completado
+        self.max_obstacles = self.base_rules["num_obstacles"] + self.max_levels - 1
+        self.max_stars = self.max_levels * self.score_to_advance
+
+        self.rngs = [None] * n
+        self.seeds = np.zeros(n, dtype=np.int64)
+        self._next_seed = seed + n
+
+        self.ticks = np.zeros(n, dtype=np.int64)
+        self.level = np.zeros(n, dtype=np.int64)
+        self.score = np.zeros(n, dtype=np.int64)
+        self.lives = np.zeros(n, dtype=np.int64)
+        self.shield = np.zeros(n, dtype=bool)
+        self.slow = np.zeros(n, dtype=bool)
+        self.slow_timer = np.zeros(n)
+        self.start_time = np.zeros(n)
+        self.immunity_start = np.zeros(n)
+        self.player_speed = np.zeros(n, dtype=np.int64)
+        self.obstacle_speed = np.zeros(n, dtype=np.int64)
+        self.invert = np.zeros(n, dtype=bool)
+        self.num_obstacles = np.zeros(n, dtype=np.int64)
+
+        self.player = np.zeros((n, 2), dtype=np.int64)
+        self.obstacle_x = np.zeros((n, self.max_obstacles))
+        self.obstacle_y = np.zeros((n, self.max_obstacles))
+        self.obstacle_mask = np.zeros((n, self.max_obstacles), dtype=bool)
+        self.star_x = np.zeros((n, self.max_stars), dtype=np.int64)
+        self.star_y = np.zeros((n, self.max_stars), dtype=np.int64)
+        self.star_mask = np.zeros((n, self.max_stars), dtype=bool)
+        # Esquina de cada estrella desplazada para probar el solapamiento con una sola
+        # comparación sin signo; las recogidas (o vacías) se mandan lejos
+        self._star_kx = np.full((n, self.max_stars), FAR, dtype=POS_DTYPE)
+        self._star_ky = np.full((n, self.max_stars), FAR, dtype=POS_DTYPE)
+        # Obstáculos en medios píxeles y su desplazamiento por tick, ya multiplicado
+        # por el ralentizador (se reescala solo cuando este cambia)
+        self._obs_x2 = np.full((n, self.max_obstacles), FAR, dtype=POS_DTYPE)
+        self._obs_y2 = np.full((n, self.max_obstacles), FAR, dtype=POS_DTYPE)
+        self._obs_vx2 = np.zeros((n, self.max_obstacles), dtype=POS_DTYPE)
+        self._obs_vy2 = np.zeros((n, self.max_obstacles), dtype=POS_DTYPE)
+        self._star_buffers = self._buffers((n, self.max_stars))
+        self._obstacle_buffers = self._buffers((n, self.max_obstacles))
+        self.power_up = np.zeros((n, 2), dtype=np.int64)
+        self.power_up_kind = np.full(n, POWER_UP_NONE, dtype=np.int8)
+        self.time_left = np.zeros(n, dtype=np.int64)
+        self.final_score = np.zeros(n, dtype=np.int64)
+        self.dones = np.zeros(n, dtype=bool)
+        self._dones_view = self._read_only(self.dones)
+
+        self._obs = {name: self._read_only(arr) for name, arr in (
+            ("player", self.player), ("obstacle_x", self.obstacle_x),
+            ("obstacle_y", self.obstacle_y), ("obstacle_mask", self.obstacle_mask),
+            ("star_x", self.star_x), ("star_y", self.star_y), ("star_mask", self.star_mask),
+            ("power_up", self.power_up), ("power_up_kind", self.power_up_kind),
+            ("lives", self.lives), ("score", self.score), ("level", self.level),
+            ("time_left", self.time_left), ("shield", self.shield), ("slow", self.slow),
+            ("invert_controls", self.invert),
+        )}
+
+    @staticmethod
+    def _buffers(shape):
+        """Arreglos temporales de _overlap, creados una sola vez."""
+        return (np.empty(shape, dtype=POS_DTYPE), np.empty(shape, dtype=POS_DTYPE),
+                np.empty(shape, dtype=bool), np.empty(shape, dtype=bool))
+
+    @staticmethod
+    def _overlap(cx, cy, kx, ky, span, buffers):
+        """
+        Prueba de solapamiento por lotes: cx - kx y cy - ky deben caer en [0, span).
+        Los negativos se ven como enteros sin signo enormes, así que basta una comparación por eje.
+
+        Retorna:
+        - numpy.ndarray: Máscara booleana (uno de los buffers, válida hasta la próxima llamada).
+        """
+        dx, dy, hx, hy = buffers
+        np.subtract(cx, kx, out=dx)
+        np.subtract(cy, ky, out=dy)
+        np.less(dx.view(np.uint16), span, out=hx)
+        np.less(dy.view(np.uint16), span, out=hy)
+        return np.logical_and(hx, hy, out=hx)
+
+    @staticmethod
+    def _read_only(arr):
+        view = arr.view()
+        view.flags.writeable = False
+        return view
+
+    def reset(self, seeds=None):
+        """
+        Empieza una partida nueva en todos los entornos.
+
+        Parámetros:
+        - seeds (list): Semilla de cada partida (por defecto: seed + i).
+
+        Retorna:
+        - dict: Observación de todas las partidas.
+        """
+        if seeds is None:
+            seeds = range(self.seed, self.seed + self.num_envs)
+        for i, s in enumerate(seeds):
+            self._new_game(i, s)
+        self._update_time_left()
+        return self._obs
+
+    def _new_game(self, i, seed):
+        """Reinicia la partida i como Game(seed=seed) y prepara su primer nivel."""
+        self.rngs[i] = random.Random(seed)
+        self.seeds[i] = seed
+        self.ticks[i] = 0
+        self.level[i] = 1
+        self.score[i] = 0
+        self.lives[i] = 3
+        self.shield[i] = False
+        self.slow[i] = False
+        self.slow_timer[i] = 0
+        rules = self.base_rules
+        self.player_speed[i] = rules["player_speed"]
+        self.obstacle_speed[i] = rules["obstacle_speed"]
+        self.invert[i] = rules["invert_controls"]
+        self.num_obstacles[i] = rules["num_obstacles"]
+        self._start_level(i)
+
+    def _start_level(self, i):
+        """Igual que Game.start_level para la partida i (mismo orden de números aleatorios)."""
+        rng = self.rngs[i]
+        now = int(self.ticks[i]) * self.dt
+        self.player[i] = (rm.WIDTH // 2, (rm.HEIGHT + rm.UI_HEIGHT) // 2)
+
+        speed = int(self.obstacle_speed[i])
+        count = int(self.num_obstacles[i])
+        empty = self.max_obstacles - count
+        xs, ys, dxs, dys = [], [], [], []
+        for _ in range(count):
+            xs.append(rng.randint(0, rm.WIDTH - OBSTACLE_SIZE))
+            ys.append(rng.randint(rm.UI_HEIGHT, rm.HEIGHT - OBSTACLE_SIZE))
+            dxs.append(rng.choice([-1, 1]) * speed)
+            dys.append(rng.choice([-1, 1]) * speed)
+        step = 1 if self.slow[i] else 2
+        self._obs_x2[i] = [2 * x for x in xs] + [FAR] * empty
+        self._obs_y2[i] = [2 * y for y in ys] + [FAR] * empty
+        self._obs_vx2[i] = [step * dx for dx in dxs] + [0] * empty
+        self._obs_vy2[i] = [step * dy for dy in dys] + [0] * empty
+        self.obstacle_x[i] = xs + [0] * empty
+        self.obstacle_y[i] = ys + [0] * empty
+        self.obstacle_mask[i] = [True] * count + [False] * empty
+
+        stars = int(self.level[i]) * self.score_to_advance
+        empty = self.max_stars - stars
+        xs, ys = [], []
+        for _ in range(stars):
+            xs.append(rng.randint(0, rm.WIDTH - STAR_SIZE))
+            ys.append(rng.randint(rm.UI_HEIGHT, rm.HEIGHT - STAR_SIZE))
+        self.star_x[i] = xs + [0] * empty
+        self.star_y[i] = ys + [0] * empty
+        self.star_mask[i] = [True] * stars + [False] * empty
+        self._star_kx[i] = [x - PLAYER_SIZE + 1 for x in xs] + [FAR] * empty
+        self._star_ky[i] = [y - PLAYER_SIZE + 1 for y in ys] + [FAR] * empty
+
+        self.power_up_kind[i] = POWER_UP_NONE
+        if rng.random() < 0.3:
+            self.power_up[i] = (rng.randint(0, rm.WIDTH - POWER_UP_SIZE),
+                                rng.randint(rm.UI_HEIGHT, rm.HEIGHT - POWER_UP_SIZE))
+            kind = rng.choice(["shield", "slow"])
+            self.power_up_kind[i] = POWER_UP_SHIELD if kind == "shield" else POWER_UP_SLOW
+
+        # Todas las estrellas del nivel aparecen a la vez, así que su tiempo de aparición es start_time
+        self.start_time[i] = now
+        self.immunity_start[i] = now
+
+    def _mutate_rules(self, i):
+        """Igual que Game.mutate_rules para la partida i."""
+        mutation = self.rngs[i].choice(RULE_KEYS)
+        if mutation == "invert_controls":
+            self.invert[i] = not self.invert[i]
+        elif mutation == "player_speed":
+            self.player_speed[i] += 1
+        elif mutation == "obstacle_speed":
+            self.obstacle_speed[i] += 1
+        else:
+            self.num_obstacles[i] += 1
+
+    def _set_slow(self, rows, active):
+        """
+        Reescala el desplazamiento por tick de los obstáculos de las partidas
+        marcadas cuando el ralentizador se activa (mitad de velocidad) o se apaga.
+        """
+        if rows.any():
+            if active:
+                self._obs_vx2[rows] //= 2
+                self._obs_vy2[rows] //= 2
+            else:
+                self._obs_vx2[rows] *= 2
+                self._obs_vy2[rows] *= 2
+
+    def _update_time_left(self):
+        remaining = self.level_time_limit - (self.ticks * self.dt - self.start_time)
+        np.maximum(remaining.astype(np.int64), 0, out=self.time_left)
+
+    def step(self, actions):
+        """
+        Avanza un tick todas las partidas.
+
+        Parámetros:
+        - actions (array): Máscara de teclas (KEY_LEFT, KEY_RIGHT, KEY_UP, KEY_DOWN) por partida.
+
+        Retorna:
+        - tuple: (observación (dict), recompensas (puntos ganados en el tick), partidas terminadas (bool)).
+        """
+        actions = np.asarray(actions)
+        rewards = np.zeros(self.num_envs, dtype=np.int64)
+
+        # Movimiento del jugador
+        speed = np.where(self.invert, -self.player_speed, self.player_speed)
+        player = self.player
+        player += DIRECTIONS[actions] * speed[:, None]
+        np.minimum(player, PLAYER_MAX, out=player)
+        np.maximum(player, PLAYER_MIN, out=player)
+        px, py = player[:, 0], player[:, 1]
+
+        # Movimiento de obstáculos con rebote (los huecos tienen velocidad 0)
+        ox, oy, vx, vy = self._obs_x2, self._obs_y2, self._obs_vx2, self._obs_vy2
+        ox += vx
+        oy += vy
+        np.negative(vx, out=vx, where=(ox <= 0) | (ox >= 2 * (rm.WIDTH - OBSTACLE_SIZE)))
+        np.negative(vy, out=vy, where=(oy <= 2 * rm.UI_HEIGHT) | (oy >= 2 * (rm.HEIGHT - OBSTACLE_SIZE)))
+
+        # Colisiones (mismo orden que Game.check_collisions). Se solapan si
+        # -PLAYER_SIZE < px - x < size, es decir, 0 <= px - x + PLAYER_SIZE - 1 < size + PLAYER_SIZE - 1
+        now = self.ticks * self.dt
+        hit = self._overlap(px.astype(POS_DTYPE)[:, None], py.astype(POS_DTYPE)[:, None],
+                            self._star_kx, self._star_ky, STAR_SIZE + PLAYER_SIZE - 1, self._star_buffers)
+        if hit.any():
+            gained = hit.sum(axis=1) * np.where(now - self.start_time <= 5, 3, 1)
+            self.score += gained
+            rewards += gained
+            self.star_mask &= ~hit
+            self._star_kx[hit] = FAR
+            self._star_ky[hit] = FAR
+
+        immune = now - self.immunity_start < self.immunity_duration
+        # Lo mismo en medios píxeles: 0 <= 2px - x2 + 2 * PLAYER_SIZE - 1 < 2 * (size + PLAYER_SIZE) - 1
+        touching = self._overlap((2 * px + 2 * PLAYER_SIZE - 1).astype(POS_DTYPE)[:, None],
+                                 (2 * py + 2 * PLAYER_SIZE - 1).astype(POS_DTYPE)[:, None],
+                                 ox, oy, 2 * (OBSTACLE_SIZE + PLAYER_SIZE) - 1, self._obstacle_buffers)
+        if touching.any():
+            hits = touching.sum(axis=1)
+            hits[immune] = 0
+            # El escudo absorbe el primer choque; cada choque restante quita una vida
+            absorbed = np.minimum(hits, self.shield)
+            lost = hits - absorbed
+            self.shield &= absorbed == 0
+            self.lives -= lost
+            self.immunity_start = np.where(lost > 0, now, self.immunity_start)
+
+        kind = self.power_up_kind
+        pu = self.power_up
+        got = ((kind != POWER_UP_NONE) & (px < pu[:, 0] + POWER_UP_SIZE) & (px + PLAYER_SIZE > pu[:, 0])
+               & (py < pu[:, 1] + POWER_UP_SIZE) & (py + PLAYER_SIZE > pu[:, 1]))
+        if got.any():
+            self.shield |= got & (kind == POWER_UP_SHIELD)
+            slow = got & (kind == POWER_UP_SLOW)
+            self._set_slow(slow & ~self.slow, True)
+            self.slow |= slow
+            self.slow_timer = np.where(slow, now, self.slow_timer)
+            kind[got] = POWER_UP_NONE
+
+        # Fin de nivel (mismo orden que Game.update)
+        timeout = now - self.start_time > self.level_time_limit
+        self.lives -= timeout
+        expired = self.slow & ~timeout & (now - self.slow_timer > 5)
+        if expired.any():
+            self._set_slow(expired, False)
+            self.slow &= ~expired
+        cleared = ~timeout & ~self.star_mask.any(axis=1)
+        dead = ~timeout & ~cleared & (self.lives <= 0)
+        self.ticks += 1
+
+        dones = self.dones
+        dones[:] = False
+        ended = timeout | cleared | dead
+        if ended.any():
+            for i in np.flatnonzero(ended).tolist():
+                completed = self.lives[i] > 0 if timeout[i] else bool(cleared[i])
+                if completed:
+                    self._mutate_rules(i)
+                    self.level[i] += 1
+                if self.level[i] > self.max_levels or self.lives[i] <= 0:
+                    dones[i] = True
+                    self.final_score[i] = self.score[i]
+                    self._new_game(i, self._next_seed)
+                    self._next_seed += 1
+                else:
+                    self._start_level(i)
+        self._update_time_left()
+        np.multiply(ox, 0.5, out=self.obstacle_x)
+        np.multiply(oy, 0.5, out=self.obstacle_y)
+        return self._obs, rewards, self._dones_view
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Mide el rendimiento de VecEnv")
+    parser.add_argument("--envs", type=int, default=1024, help="Partidas simultáneas")
+    parser.add_argument("--steps", type=int, default=2000, help="Ticks a simular")
+    parser.add_argument("--seed", type=int, default=0, help="Semilla base")
+    args = parser.parse_args()
+
+    env = VecEnv(args.envs, seed=args.seed)
+    env.reset()
+    rng = np.random.default_rng(args.seed)
+    actions = rng.integers(0, 16, size=(64, args.envs), dtype=np.int64)
+    episodes = 0
+    start = time.perf_counter()
+    for t in range(args.steps):
+        _, _, dones = env.step(actions[t % 64])
+        episodes += int(dones.sum())
+    elapsed = time.perf_counter() - start
+    total = args.steps * args.envs
+    print(f"{total} pasos en {elapsed:.2f}s ({total / elapsed:,.0f} pasos/s), {episodes} partidas terminadas")
+
+
+if __name__ == "__main__":
+    main()